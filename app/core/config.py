@@ -26,6 +26,28 @@ class Settings(BaseSettings):
     postgres_user: str
     postgres_password: str
 
+    metrics_enabled: bool = True
+    metrics_outbox_refresh_seconds: float = 15.0
+
+    tracing_enabled: bool = False
+    tracing_exporter: Literal["jsonl", "none"] = "jsonl"
+    tracing_file: str = "traces.jsonl"
+    tracing_sample_rate: float = 1.0
+
+    # API connection pool per engine (primary and replica each get one per process)
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10.0
+    db_pool_recycle_seconds: int = 60 * 30
+    db_slow_query_ms: float = 200.0
+
+    # Optional streaming replica for read-only endpoints; unset means every read uses the primary.
+    postgres_replica_host: str | None = None
+    postgres_replica_port: int | None = None
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_interval_seconds: float = 1.0
+    replica_read_your_writes_seconds: int = 5
+
     redis_host: str
     redis_port: int = 6379
     redis_db: int = 0
@@ -37,6 +59,53 @@ class Settings(BaseSettings):
     invite_token_ttl_seconds: int = 60 * 60 * 24
     email_verification_token_ttl_seconds: int = 60 * 60 * 24
     password_reset_token_ttl_seconds: int = 60 * 60
+    task_definitions_cache_ttl_seconds: int = 60 * 5
+    task_watchers_cache_ttl_seconds: int = 60 * 5
+
+    notification_unread_cache_ttl_seconds: int = 60 * 60 * 24
+    notification_unread_reconcile_interval_seconds: int = 60 * 5
+    notification_partitions_ahead_months: int = 3
+    notification_retention_months: int = 6
+    notification_unread_retention_months: int = 12
+    notification_partition_interval_seconds: int = 60 * 60 * 6
+    notification_stream_channel: str = "notifications:events"
+    notification_stream_buffer_size: int = 200
+    notification_stream_ttl_seconds: int = 60 * 60
+    notification_stream_keepalive_seconds: float = 15.0
+    notification_stream_queue_size: int = 100
+
+    smtp_host: str = "localhost"
+    smtp_port: int = 1025
+    smtp_username: str | None = None
+    smtp_password: str | None = None
+    smtp_starttls: bool = False
+    smtp_timeout_seconds: float = 10.0
+    smtp_from: str = "TaskFlow <no-reply@taskflow.local>"
+    smtp_pool_size: int = 4
+    email_rate_limit_per_second: float = 20.0
+    email_link_base_url: str = "http://localhost:3000"
+
+    worker_db_pool_size: int = 5
+    worker_db_max_overflow: int = 5
+
+    outbox_notify_channel: str = "notification_outbox"
+    outbox_dispatch_batch_size: int = 100
+    outbox_safety_poll_seconds: float = 60.0
+    outbox_beat_interval_seconds: int = 15
+    outbox_celery_trigger_enabled: bool = True
+    outbox_max_attempts: int = 10
+    notification_coalesce_window_seconds: int = 10
+    notification_preferences_cache_ttl_seconds: int = 60 * 5
+    notification_digest_interval_seconds: int = 60 * 60
+    outbox_shard_count: int = 16
+    outbox_dispatcher_heartbeat_seconds: float = 5.0
+    outbox_dispatcher_ttl_seconds: float = 15.0
+    outbox_rate_window_seconds: int = 300
+    outbox_sent_retention_hours: int = 24
+    outbox_log_retention_days: int = 30
+    outbox_retention_batch_size: int = 1000
+    outbox_retention_max_batches: int = 50
+    outbox_retention_interval_seconds: int = 60 * 10
 
     @property
     def database_url(self) -> str:
@@ -46,6 +115,23 @@ class Settings(BaseSettings):
             f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
         )
 
+    @property
+    def database_dsn(self) -> str:
+        # Plain libpq DSN for direct asyncpg connections (LISTEN/NOTIFY, COPY)
+        return (
+            f"postgresql://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
+        )
+
+    @property
+    def replica_database_url(self) -> str | None:
+        if not self.postgres_replica_host:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.postgres_user}:{self.postgres_password}"
+            f"@{self.postgres_replica_host}:{self.postgres_replica_port or self.postgres_port}/{self.postgres_db}"
+        )
+
     @property
     def redis_url(self) -> str:
         # Redis URL
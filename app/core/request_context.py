@@ -0,0 +1,50 @@
+"""
+Per-request context available to code that has no access to the request object (SQLAlchemy
+event hooks, logging, instrumentation).
+"""
+from contextvars import ContextVar
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+_current_scope: ContextVar[Scope | None] = ContextVar("current_scope", default=None)
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware that exposes the current HTTP scope through a context variable.
+
+    The scope is stored rather than copied: routing adds the matched route to it in place later
+    on, so `current_route` can report the route template instead of the raw path.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
+
+
+def current_scope() -> Scope | None:
+    return _current_scope.get()
+
+
+def route_template(scope: Scope) -> str:
+    route: Any = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+def current_route() -> str | None:
+    """`METHOD /route/{template}` of the request being handled, or None outside a request."""
+    scope = _current_scope.get()
+    if scope is None:
+        return None
+    return f"{scope.get('method', '')} {route_template(scope)}"
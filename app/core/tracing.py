@@ -0,0 +1,264 @@
+"""
+Lightweight request tracing.
+
+A span records a name, start time, duration, attributes and its parent; the current span lives
+in a context variable, so spans nest across awaits without being passed around. Finished spans
+go to the configured exporter (`JsonlFileExporter` writes one JSON object per line for offline
+analysis). Trace context crosses process boundaries as a W3C `traceparent` string: incoming HTTP
+requests may carry one, and Celery publishes carry it in their message headers.
+
+Sampling is decided once per trace at its root; spans of an unsampled trace are not recorded.
+With `TRACING_ENABLED` off nothing is wrapped at import time and `start_span` is a no-op.
+"""
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Iterator, Protocol, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class Span:
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    start_time: float
+    sampled: bool = True
+    duration_ms: float | None = None
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class SpanExporter(Protocol):
+    def export(self, span: Span) -> None: ...
+
+    def flush(self) -> None: ...
+
+
+class NoopExporter:
+    def export(self, span: Span) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+class InMemoryExporter:
+    """Keeps finished spans in a list; meant for tests and ad-hoc inspection."""
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def flush(self) -> None:
+        pass
+
+
+class JsonlFileExporter:
+    """Appends spans to a file, one JSON object per line, buffered and flushed in batches."""
+
+    def __init__(self, path: str, *, batch_size: int = 100) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps({**asdict(span), "pid": os.getpid()}, default=str)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) < self.batch_size:
+                return
+            lines, self._buffer = self._buffer, []
+        self._write(lines)
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        if lines:
+            self._write(lines)
+
+    def _write(self, lines: list[str]) -> None:
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write("\n".join(lines) + "\n")
+        except OSError:
+            logger.exception("Failed to write trace spans", extra={"path": self.path, "spans": len(lines)})
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_exporter: SpanExporter = NoopExporter()
+
+
+def set_exporter(exporter: SpanExporter) -> SpanExporter:
+    """Installs `exporter` and returns the previous one (flushed first)."""
+    global _exporter
+    previous = _exporter
+    previous.flush()
+    _exporter = exporter
+    return previous
+
+
+def get_exporter() -> SpanExporter:
+    return _exporter
+
+
+def configure_tracing() -> None:
+    """Sets up the exporter named by `TRACING_EXPORTER`; called once per process at startup."""
+    if not settings.tracing_enabled:
+        return
+    if settings.tracing_exporter == "jsonl":
+        set_exporter(JsonlFileExporter(settings.tracing_file))
+    else:
+        set_exporter(NoopExporter())
+
+
+def flush_tracing() -> None:
+    _exporter.flush()
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """(trace_id, parent span_id, sampled) from a `traceparent` value, or None if malformed."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+@contextmanager
+def start_span(name: str, *, traceparent: str | None = None, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Opens a span as a child of the current one (or of `traceparent`, or as a new root) and makes
+    it current until the block exits. Yields None when tracing is off or the trace is unsampled.
+    """
+    if not settings.tracing_enabled:
+        yield None
+        return
+
+    parent = _current_span.get()
+    remote = parse_traceparent(traceparent) if parent is None else None
+    if parent is not None:
+        trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+    elif remote is not None:
+        trace_id, parent_id, sampled = remote
+    else:
+        trace_id, parent_id = os.urandom(16).hex(), None
+        sampled = random.random() < settings.tracing_sample_rate
+
+    span = Span(
+        trace_id=trace_id,
+        span_id=os.urandom(8).hex(),
+        parent_id=parent_id,
+        name=name,
+        start_time=time.time(),
+        sampled=sampled,
+        attributes=attributes,
+    )
+    token = _current_span.set(span)
+    started = time.perf_counter()
+    try:
+        yield span if sampled else None
+    except BaseException as exc:
+        span.status = "error"
+        span.attributes["error"] = f"{type(exc).__name__}: {exc}"[:500]
+        raise
+    finally:
+        _current_span.reset(token)
+        span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        if sampled:
+            _exporter.export(span)
+
+
+def traced(fn: Callable[..., Awaitable[T]], name: str) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        with start_span(name):
+            return await fn(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_service(cls: type[T]) -> type[T]:
+    """Class decorator opening a span around every public coroutine method of a service."""
+    if not settings.tracing_enabled:
+        return cls
+    for attr, fn in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.iscoroutinefunction(fn):
+            continue
+        setattr(cls, attr, traced(fn, f"service.{cls.__name__}.{attr}"))
+    return cls
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening the root span of each HTTP request. An incoming `traceparent`
+    header continues the caller's trace, and the trace id is returned as `X-Trace-Id`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.tracing_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope.get("headers", ()):
+            if name == b"traceparent":
+                incoming = value.decode("latin-1")
+                break
+
+        with start_span(f"HTTP {scope['method']}", traceparent=incoming) as span:
+
+            async def send_wrapper(message: Message) -> None:
+                if span is not None and message["type"] == "http.response.start":
+                    span.set(status_code=message["status"])
+                    message["headers"] = [*message.get("headers", []), (b"x-trace-id", span.trace_id.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if span is not None:
+                    route = getattr(scope.get("route"), "path", None) or scope.get("path", "")
+                    span.name = f"HTTP {scope['method']} {route}"
+                    span.set(route=route, path=scope.get("path", ""))
@@ -0,0 +1,291 @@
+"""
+Engine construction with pool instrumentation and a slow-query log.
+
+`InstrumentedPool` records how long checkouts wait for a connection and how many time out;
+`pool_snapshot` combines that with the pool's own counters. Statement timing is done in
+`before_cursor_execute` / `after_cursor_execute` hooks, and statements slower than
+`DB_SLOW_QUERY_MS` are logged with a parameter-free fingerprint and the originating route.
+
+The same hook feeds `QueryLog`s opened with `record_queries`: in debug mode every HTTP request
+gets one (`QueryCountMiddleware` reports it as `X-Query-Count`), and tests use them to hold
+endpoints to a query budget and to catch N+1 patterns.
+"""
+import hashlib
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_context import current_route
+
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """The statement with literals and bind parameters replaced by `?` and lists collapsed."""
+    normalized = _STRING_RE.sub("?", statement)
+    normalized = _PARAM_RE.sub("?", normalized)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("(?, ...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def statement_fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize_statement(statement).encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True, slots=True)
+class QueryRecord:
+    fingerprint: str
+    statement: str
+    parameters: str
+
+
+@dataclass(slots=True)
+class QueryLog:
+    """Statements executed while the log was open, in order."""
+
+    queries: list[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def record(self, statement: str, parameters: Any) -> None:
+        normalized = normalize_statement(statement)
+        self.queries.append(
+            QueryRecord(
+                fingerprint=hashlib.sha1(normalized.encode()).hexdigest()[:16],
+                statement=normalized,
+                parameters=repr(parameters),
+            )
+        )
+
+    def repeated_shapes(self) -> dict[str, list[QueryRecord]]:
+        """
+        Fingerprint -> executions, for statement shapes run more than once with different
+        parameters: the signature of a per-row lookup inside a loop. Repeating the exact same
+        statement and parameters is wasteful too, but is left to the budget to catch.
+        """
+        by_shape: dict[str, list[QueryRecord]] = {}
+        for query in self.queries:
+            by_shape.setdefault(query.fingerprint, []).append(query)
+        return {
+            fingerprint: queries
+            for fingerprint, queries in by_shape.items()
+            if len({query.parameters for query in queries}) > 1
+        }
+
+
+# Logs are kept as a tuple so nested `record_queries` blocks (a test around a debug-mode
+# request) each see every statement.
+_query_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("query_logs", default=())
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryLog]:
+    """Collects the statements executed in the current context until the block exits."""
+    log = QueryLog()
+    token = _query_logs.set((*_query_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _query_logs.reset(token)
+
+
+class QueryCountMiddleware:
+    """
+    Pure ASGI middleware, installed in debug mode only, that counts the statements a request
+    executes and returns the number as `X-Query-Count`. Statement shapes repeated with different
+    parameters are logged. The header is set when the response starts, so statements issued
+    while a streaming body is produced are not included.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries() as log:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [*message.get("headers", []), (b"x-query-count", str(log.count).encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                for queries in log.repeated_shapes().values():
+                    logger.warning(
+                        "Repeated query shape",
+                        extra={
+                            "route": current_route(),
+                            "executions": len(queries),
+                            "fingerprint": queries[0].fingerprint,
+                            "statement": queries[0].statement[:2000],
+                        },
+                    )
+
+
+@dataclass(slots=True)
+class PoolStats:
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that measures checkout wait time and counts checkout timeouts."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            logger.warning(
+                "Database pool checkout timed out",
+                extra={"pool": pool_snapshot(self), "route": current_route()},
+            )
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return conn
+
+    def recreate(self) -> "InstrumentedPool":
+        # Counters survive pool recreation (e.g. after a disconnect) so they stay monotonic.
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_snapshot(pool: Any) -> dict[str, Any]:
+    snapshot: dict[str, Any] = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    stats: PoolStats | None = getattr(pool, "stats", None)
+    if stats is not None:
+        snapshot.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            wait_ms_avg=round(stats.wait_seconds_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+            wait_ms_max=round(stats.wait_seconds_max * 1000, 3),
+        )
+    return snapshot
+
+
+class PoolCollector:
+    """Prometheus collector reading pool state at scrape time; `pools` maps engine name to pool."""
+
+    def __init__(self, pools: Callable[[], dict[str, Any]]) -> None:
+        self._pools = pools
+
+    def collect(self) -> Iterator[Metric]:
+        connections = GaugeMetricFamily(
+            "taskflow_db_pool_connections",
+            "Pooled connections by state.",
+            labels=["engine", "state"],
+        )
+        checkouts = CounterMetricFamily("taskflow_db_pool_checkouts", "Pool checkouts.", labels=["engine"])
+        timeouts = CounterMetricFamily("taskflow_db_pool_timeouts", "Pool checkouts that timed out.", labels=["engine"])
+        wait = CounterMetricFamily(
+            "taskflow_db_pool_checkout_wait_seconds",
+            "Time spent waiting for a pooled connection.",
+            labels=["engine"],
+        )
+        for name, pool in self._pools().items():
+            snapshot = pool_snapshot(pool)
+            for state in ("checked_out", "idle", "overflow"):
+                connections.add_metric([name, state], snapshot[state])
+            stats: PoolStats | None = getattr(pool, "stats", None)
+            if stats is not None:
+                checkouts.add_metric([name], stats.checkouts)
+                timeouts.add_metric([name], stats.timeouts)
+                wait.add_metric([name], stats.wait_seconds_total)
+        yield from (connections, checkouts, timeouts, wait)
+
+
+def install_query_hooks(engine: AsyncEngine, *, name: str) -> None:
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._query_started_at = time.perf_counter()
+        # SQLAlchemy runs the hook in a greenlet sharing the caller's context, so the logs of
+        # the request or test issuing the statement are visible here.
+        for log in _query_logs.get():
+            log.record(statement, parameters)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_query_started_at", None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= settings.db_slow_query_ms:
+            logger.warning(
+                "Slow query",
+                extra={
+                    "engine": name,
+                    "duration_ms": round(duration_ms, 2),
+                    "fingerprint": statement_fingerprint(statement),
+                    "statement": normalize_statement(statement)[:2000],
+                    "route": current_route(),
+                },
+            )
+
+
+def create_instrumented_engine(
+    url: str,
+    *,
+    name: str,
+    pool_size: int | None = None,
+    max_overflow: int | None = None,
+) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedPool,
+        pool_pre_ping=True,
+        pool_size=pool_size if pool_size is not None else settings.db_pool_size,
+        max_overflow=max_overflow if max_overflow is not None else settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+    )
+    install_query_hooks(engine, name=name)
+    return engine
@@ -0,0 +1,47 @@
+"""add task watchers
+
+Revision ID: 3c6e9a1f4b8d
+Revises: a9d3f5b1c7e2
+Create Date: 2026-10-19 17:41:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c6e9a1f4b8d"
+down_revision: Union[str, Sequence[str], None] = "a9d3f5b1c7e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_watchers",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "user_id"),
+    )
+    op.create_index("ix_task_watchers_user_id", "task_watchers", ["user_id"], unique=False)
+
+    # Existing creators and assignees watch their tasks, as new ones do.
+    op.execute(
+        """
+        INSERT INTO task_watchers (task_id, user_id)
+        SELECT id, created_by FROM tasks WHERE created_by IS NOT NULL
+        UNION
+        SELECT id, assigned_to FROM tasks WHERE assigned_to IS NOT NULL
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_watchers_user_id", table_name="task_watchers")
+    op.drop_table("task_watchers")
@@ -0,0 +1,41 @@
+"""nullable notification preference digest_only
+
+Revision ID: 4d9c2a7e5b18
+Revises: 8e4a1c7f2d93
+Create Date: 2026-10-19 21:12:03.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d9c2a7e5b18"
+down_revision: Union[str, Sequence[str], None] = "8e4a1c7f2d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "notification_preferences",
+        "digest_only",
+        existing_type=sa.Boolean(),
+        nullable=True,
+        server_default=None,
+    )
+    # Org rows could not express "inherit" so far; false there was the request default.
+    op.execute("UPDATE notification_preferences SET digest_only = NULL WHERE org_id IS NOT NULL AND NOT digest_only")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE notification_preferences SET digest_only = false WHERE digest_only IS NULL")
+    op.alter_column(
+        "notification_preferences",
+        "digest_only",
+        existing_type=sa.Boolean(),
+        nullable=False,
+        server_default=sa.text("false"),
+    )
@@ -0,0 +1,56 @@
+"""add notification preferences
+
+Revision ID: 5b7d2e9c3a1f
+Revises: 3c6e9a1f4b8d
+Create Date: 2026-10-19 18:26:47.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7d2e9c3a1f"
+down_revision: Union[str, Sequence[str], None] = "3c6e9a1f4b8d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_preferences",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("org_id", sa.UUID(), nullable=True),
+        sa.Column(
+            "muted_project_ids",
+            postgresql.ARRAY(sa.UUID()),
+            server_default=sa.text("'{}'::uuid[]"),
+            nullable=False,
+        ),
+        sa.Column(
+            "disabled_types",
+            postgresql.ARRAY(sa.String(length=100)),
+            server_default=sa.text("'{}'::varchar[]"),
+            nullable=False,
+        ),
+        sa.Column("digest_only", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        # One global row (org_id NULL) per user, hence NULLS NOT DISTINCT (Postgres 15+).
+        sa.UniqueConstraint(
+            "user_id",
+            "org_id",
+            name="uq_notification_preferences_user_org",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_preferences")
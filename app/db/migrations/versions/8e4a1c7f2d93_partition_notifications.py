@@ -0,0 +1,109 @@
+"""partition notifications by month
+
+Revision ID: 8e4a1c7f2d93
+Revises: 5b7d2e9c3a1f
+Create Date: 2026-10-19 19:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e4a1c7f2d93"
+down_revision: Union[str, Sequence[str], None] = "5b7d2e9c3a1f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Number of months after the current one to create up front; beat keeps extending it afterwards.
+AHEAD_MONTHS = 3
+
+_CREATE_MONTHLY_PARTITIONS = """
+DO $$
+DECLARE
+    month date := date_trunc('month', coalesce(
+        (SELECT min(created_at) FROM notifications_unpartitioned), now()
+    ) AT TIME ZONE 'UTC')::date;
+    last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{ahead} months')::date;
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF notifications FOR VALUES FROM (%L) TO (%L)',
+            'notifications_p' || to_char(month, 'YYYYMM'),
+            month::timestamp AT TIME ZONE 'UTC',
+            (month + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        month := (month + interval '1 month')::date;
+    END LOOP;
+END $$;
+"""
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_notifications_user_created", "notifications", ["user_id", "created_at", "id"])
+    op.create_index(
+        "ix_notifications_user_unread",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        postgresql_where=sa.text("is_read = false"),
+    )
+
+
+def _notifications_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+    ]
+
+
+def upgrade() -> None:
+    # Rewrites the table once: it is locked for the duration of the copy, so run it in a
+    # maintenance window on large installations.
+    op.rename_table("notifications", "notifications_unpartitioned")
+    op.execute("ALTER INDEX ix_notifications_user_created RENAME TO ix_notifications_unpartitioned_user_created")
+    op.execute("ALTER INDEX ix_notifications_user_unread RENAME TO ix_notifications_unpartitioned_user_unread")
+    op.execute("ALTER TABLE notifications_unpartitioned RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey")
+
+    op.create_table(
+        "notifications",
+        *_notifications_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    _create_indexes()
+    op.execute(_CREATE_MONTHLY_PARTITIONS.format(ahead=AHEAD_MONTHS))
+
+    op.execute(
+        """
+        INSERT INTO notifications (id, user_id, type, payload, is_read, created_at)
+        SELECT id, user_id, type, payload, is_read, created_at FROM notifications_unpartitioned
+        """
+    )
+    op.drop_table("notifications_unpartitioned")
+
+
+def downgrade() -> None:
+    op.rename_table("notifications", "notifications_partitioned")
+    op.execute("ALTER INDEX ix_notifications_user_created RENAME TO ix_notifications_partitioned_user_created")
+    op.execute("ALTER INDEX ix_notifications_user_unread RENAME TO ix_notifications_partitioned_user_unread")
+    op.execute("ALTER TABLE notifications_partitioned RENAME CONSTRAINT notifications_pkey TO notifications_partitioned_pkey")
+
+    op.create_table("notifications", *_notifications_columns(), sa.PrimaryKeyConstraint("id"))
+    _create_indexes()
+    op.execute(
+        """
+        INSERT INTO notifications (id, user_id, type, payload, is_read, created_at)
+        SELECT id, user_id, type, payload, is_read, created_at FROM notifications_partitioned
+        """
+    )
+    # Drops the monthly partitions along with their parent.
+    op.drop_table("notifications_partitioned")
@@ -0,0 +1,45 @@
+"""outbox shards
+
+Revision ID: a9d3f5b1c7e2
+Revises: f2b8d4c6a1e9
+Create Date: 2026-10-19 16:30:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9d3f5b1c7e2"
+down_revision: Union[str, Sequence[str], None] = "f2b8d4c6a1e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows already in the outbox land on shard 0 and are drained by whichever dispatcher owns it.
+    op.add_column(
+        "notification_outbox",
+        sa.Column("shard", sa.SmallInteger(), server_default=sa.text("0"), nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notification_outbox_shard_pending",
+            "notification_outbox",
+            ["shard", "created_at"],
+            unique=False,
+            postgresql_where=sa.text("status IN ('PENDING', 'FAILED')"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_notification_outbox_shard_pending",
+            table_name="notification_outbox",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("notification_outbox", "shard")
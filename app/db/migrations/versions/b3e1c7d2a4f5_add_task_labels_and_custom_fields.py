@@ -0,0 +1,87 @@
+"""add task labels and custom fields
+
+Revision ID: b3e1c7d2a4f5
+Revises: 9e5f3cd4a1ab
+Create Date: 2026-10-19 09:12:40.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e1c7d2a4f5"
+down_revision: Union[str, Sequence[str], None] = "9e5f3cd4a1ab"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "labels",
+            postgresql.ARRAY(sa.String(length=50)),
+            server_default=sa.text("'{}'::varchar[]"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "custom_fields",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_tasks_labels", "tasks", ["labels"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_tasks_custom_fields",
+        "tasks",
+        ["custom_fields"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"custom_fields": "jsonb_path_ops"},
+    )
+
+    op.create_table(
+        "task_labels",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("org_id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("color", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("org_id", "name", name="uq_task_labels_org_name"),
+    )
+    op.create_table(
+        "task_field_definitions",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("org_id", sa.UUID(), nullable=False),
+        sa.Column("key", sa.String(length=50), nullable=False),
+        sa.Column("field_type", sa.String(length=20), nullable=False),
+        sa.Column(
+            "options",
+            postgresql.ARRAY(sa.String(length=100)),
+            server_default=sa.text("'{}'::varchar[]"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["org_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("org_id", "key", name="uq_task_field_definitions_org_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_field_definitions")
+    op.drop_table("task_labels")
+    op.drop_index("ix_tasks_custom_fields", table_name="tasks")
+    op.drop_index("ix_tasks_labels", table_name="tasks")
+    op.drop_column("tasks", "custom_fields")
+    op.drop_column("tasks", "labels")
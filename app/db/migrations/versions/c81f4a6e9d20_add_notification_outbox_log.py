@@ -0,0 +1,49 @@
+"""add notification outbox log
+
+Revision ID: c81f4a6e9d20
+Revises: b3e1c7d2a4f5
+Create Date: 2026-10-19 11:05:12.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f4a6e9d20"
+down_revision: Union[str, Sequence[str], None] = "b3e1c7d2a4f5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox_log",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_outbox_log_sent_at",
+        "notification_outbox_log",
+        ["sent_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notification_outbox_sent_at",
+        "notification_outbox",
+        ["sent_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'SENT'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_sent_at", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_log_sent_at", table_name="notification_outbox_log")
+    op.drop_table("notification_outbox_log")
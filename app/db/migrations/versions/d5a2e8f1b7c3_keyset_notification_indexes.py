@@ -0,0 +1,60 @@
+"""keyset notification indexes
+
+Revision ID: d5a2e8f1b7c3
+Revises: c81f4a6e9d20
+Create Date: 2026-10-19 13:40:27.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a2e8f1b7c3"
+down_revision: Union[str, Sequence[str], None] = "c81f4a6e9d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so a large notifications table stays writable during the upgrade.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_user_created",
+            "notifications",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notifications_user_unread",
+            "notifications",
+            ["user_id", "created_at", "id"],
+            unique=False,
+            postgresql_where=sa.text("is_read = false"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_notifications_is_read", table_name="notifications", postgresql_concurrently=True)
+        op.drop_index("ix_notifications_user_id", table_name="notifications", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_notifications_user_id",
+            "notifications",
+            ["user_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_notifications_is_read",
+            "notifications",
+            ["is_read"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_notifications_user_unread", table_name="notifications", postgresql_concurrently=True)
+        op.drop_index("ix_notifications_user_created", table_name="notifications", postgresql_concurrently=True)
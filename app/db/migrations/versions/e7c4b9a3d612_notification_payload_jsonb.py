@@ -0,0 +1,49 @@
+"""notification payload jsonb
+
+Revision ID: e7c4b9a3d612
+Revises: d5a2e8f1b7c3
+Create Date: 2026-10-19 15:02:51.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7c4b9a3d612"
+down_revision: Union[str, Sequence[str], None] = "d5a2e8f1b7c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Same fallbacks the API used to apply when decoding: non-object JSON is wrapped in
+    # {"value": ...} and text that is not JSON at all in {"raw": ...}.
+    op.alter_column(
+        "notifications",
+        "payload",
+        existing_type=sa.String(length=2000),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using=(
+            "CASE"
+            " WHEN payload IS JSON OBJECT THEN payload::jsonb"
+            " WHEN payload IS JSON THEN jsonb_build_object('value', payload::jsonb)"
+            " ELSE jsonb_build_object('raw', payload)"
+            " END"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "notifications",
+        "payload",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.String(length=2000),
+        existing_nullable=False,
+        postgresql_using="payload::text",
+    )
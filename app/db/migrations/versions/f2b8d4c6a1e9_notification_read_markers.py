@@ -0,0 +1,33 @@
+"""notification read markers
+
+Revision ID: f2b8d4c6a1e9
+Revises: e7c4b9a3d612
+Create Date: 2026-10-19 15:48:20.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d4c6a1e9"
+down_revision: Union[str, Sequence[str], None] = "e7c4b9a3d612"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_read_markers",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("read_watermark", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("notification_read_markers")
@@ -1,8 +1,14 @@
 from app.modules.users import User
 from app.modules.organizations import Organization, OrgMember
 from app.modules.projects import Project
-from app.modules.tasks import Task
-from app.modules.notifications import Notification, NotificationOutbox
+from app.modules.tasks import Task, TaskFieldDefinition, TaskLabel, TaskWatcher
+from app.modules.notifications import (
+    Notification,
+    NotificationOutbox,
+    NotificationOutboxLog,
+    NotificationPreference,
+    NotificationReadMarker,
+)
 
 __all__ = [
     "User",
@@ -10,6 +16,12 @@ __all__ = [
     "OrgMember",
     "Project",
     "Task",
+    "TaskLabel",
+    "TaskFieldDefinition",
+    "TaskWatcher",
     "Notification",
     "NotificationOutbox",
+    "NotificationOutboxLog",
+    "NotificationPreference",
+    "NotificationReadMarker",
 ]
@@ -0,0 +1,119 @@
+"""
+Routing of read-only requests between the primary and an optional streaming replica.
+
+A read goes to the replica unless
+- the requesting user wrote something within `replica_read_your_writes_seconds` (every unsafe
+  request by an authenticated user leaves a short-lived marker in Redis), or
+- the replica is behind by more than `replica_max_lag_seconds`, checked at most once per
+  `replica_lag_check_interval_seconds` per process.
+"""
+import asyncio
+import logging
+import time
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.security import decode_token
+from app.infra.redis import redis_get_int, redis_set_int
+
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# Zero while the replica streams from the primary and has replayed everything it received (an
+# idle primary is not "lag"), and when pointed at a server that is not in recovery. Without a
+# streaming WAL receiver the receive position is stale, so the lag is the age of the last
+# replayed transaction, or infinite if nothing was replayed yet.
+_REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN
+            coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 'Infinity')
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def recent_write_key(user_id: str) -> str:
+    return f"db_recent_write:{user_id}"
+
+
+def request_user_id(request: Request) -> str | None:
+    """Subject of the request's bearer token, without touching the database."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        subject = decode_token(token).get("sub")
+    except Exception:
+        return None
+    return str(subject) if subject else None
+
+
+async def mark_recent_write(user_id: str) -> None:
+    try:
+        await redis_set_int(recent_write_key(user_id), 1, ttl_seconds=settings.replica_read_your_writes_seconds)
+    except Exception:
+        logger.exception("Failed to record recent write", extra={"user_id": user_id})
+
+
+async def has_recent_write(user_id: str) -> bool:
+    try:
+        return await redis_get_int(recent_write_key(user_id)) is not None
+    except Exception:
+        # Without the marker we cannot rule out a fresh write, so read from the primary.
+        logger.exception("Recent write lookup failed", extra={"user_id": user_id})
+        return True
+
+
+class ReplicaLagMonitor:
+    """Caches the replica's replay lag so routing costs at most one query per check interval."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        max_lag_seconds: float | None = None,
+        check_interval_seconds: float | None = None,
+    ) -> None:
+        self.engine = engine
+        self.max_lag_seconds = (
+            max_lag_seconds if max_lag_seconds is not None else settings.replica_max_lag_seconds
+        )
+        self.check_interval_seconds = (
+            check_interval_seconds
+            if check_interval_seconds is not None
+            else settings.replica_lag_check_interval_seconds
+        )
+        self.lag_seconds: float | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def _measure(self) -> float | None:
+        try:
+            async with self.engine.connect() as conn:
+                return float((await conn.execute(_REPLICA_LAG_SQL)).scalar_one())
+        except Exception:
+            logger.exception("Replica lag check failed")
+            return None
+
+    async def usable(self) -> bool:
+        if time.monotonic() - self._checked_at >= self.check_interval_seconds:
+            async with self._lock:
+                # Another request may have refreshed it while we waited for the lock.
+                if time.monotonic() - self._checked_at >= self.check_interval_seconds:
+                    self.lag_seconds = await self._measure()
+                    self._checked_at = time.monotonic()
+                    if self.lag_seconds is None or self.lag_seconds > self.max_lag_seconds:
+                        logger.warning(
+                            "Replica unavailable or lagging; reading from primary",
+                            extra={"lag_seconds": self.lag_seconds},
+                        )
+        return self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
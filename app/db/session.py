@@ -1,13 +1,68 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.config import settings
+from app.db.instrumentation import create_instrumented_engine
+from app.db.replica import (
+    SAFE_METHODS,
+    ReplicaLagMonitor,
+    has_recent_write,
+    mark_recent_write,
+    request_user_id,
+)
 
 
-engine = create_async_engine(settings.database_url, echo=False, pool_pre_ping=True)
+engine = create_instrumented_engine(settings.database_url, name="primary")
 AsyncSessionLocal = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+replica_engine = (
+    create_instrumented_engine(settings.replica_database_url, name="replica")
+    if settings.replica_database_url
+    else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False, info={"replica": True})
+    if replica_engine is not None
+    else None
+)
+replica_monitor = ReplicaLagMonitor(replica_engine) if replica_engine is not None else None
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """True for sessions reading from the replica; such reads must not populate shared caches."""
+    return bool(db.info.get("replica"))
+
+
+async def mark_user_write(user_id: str) -> None:
+    """
+    Read-your-writes marker for a write made before the request was authenticated as the user,
+    e.g. registration, whose follow-up reads would otherwise be routed by the token it returns.
+    """
+    if replica_engine is not None:
+        await mark_recent_write(user_id)
+
+
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if replica_engine is not None and request.method not in SAFE_METHODS:
+        user_id = request_user_id(request)
+        if user_id:
+            # Recorded up front so it is in place before the client can follow up with a read.
+            await mark_recent_write(user_id)
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only handlers: the replica when configured, caught up and the user has not
+    written recently, otherwise the primary.
+    """
+    factory = AsyncSessionLocal
+    if ReplicaSessionLocal is not None and replica_monitor is not None:
+        user_id = request_user_id(request)
+        if not (user_id and await has_recent_write(user_id)) and await replica_monitor.usable():
+            factory = ReplicaSessionLocal
+    async with factory() as session:
+        yield session
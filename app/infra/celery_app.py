@@ -1,7 +1,21 @@
+from contextlib import AbstractContextManager
+from typing import Any
+
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from datetime import timedelta
 
 from app.core.config import settings
+from app.core.tracing import configure_tracing, current_span, flush_tracing, start_span
+from app.infra.email import smtp_pool
+from app.infra.worker_runtime import worker_runtime
 
 
 celery_app = Celery(
@@ -22,12 +36,76 @@ celery_app.conf.update(
     beat_schedule={
         "dispatch-notification-outbox": {
             "task": "taskflow.dispatch_notifications_outbox",
-            "schedule": timedelta(seconds=15),
-            "kwargs": {"limit": 100},
-        }
+            "schedule": timedelta(seconds=settings.outbox_beat_interval_seconds),
+            "kwargs": {"limit": settings.outbox_dispatch_batch_size},
+        },
+        "compact-notification-outbox": {
+            "task": "taskflow.compact_notifications_outbox",
+            "schedule": timedelta(seconds=settings.outbox_retention_interval_seconds),
+        },
+        "maintain-notification-partitions": {
+            "task": "taskflow.maintain_notification_partitions",
+            "schedule": timedelta(seconds=settings.notification_partition_interval_seconds),
+        },
+        "reconcile-unread-counters": {
+            "task": "taskflow.reconcile_unread_counters",
+            "schedule": timedelta(seconds=settings.notification_unread_reconcile_interval_seconds),
+        },
     },
 )
 
 @celery_app.task(name="taskflow.ping")
 def ping() -> str:
     return "pong"
+
+
+@worker_process_init.connect
+def _start_worker_runtime(**_: object) -> None:
+    configure_tracing()
+    worker_runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_runtime(**_: object) -> None:
+    if worker_runtime.started:
+        worker_runtime.run(smtp_pool.close())
+    worker_runtime.stop()
+    flush_tracing()
+
+
+@before_task_publish.connect
+def _inject_trace_context(headers: dict | None = None, **_: object) -> None:
+    span = current_span()
+    if span is not None and headers is not None:
+        headers["traceparent"] = span.traceparent
+
+
+# Open task spans by task id; prerun and postrun run on the same worker thread.
+_task_spans: dict[str, AbstractContextManager[Any]] = {}
+
+
+@task_prerun.connect
+def _start_task_span(task_id: str | None = None, task: Any = None, **_: object) -> None:
+    if not settings.tracing_enabled or task_id is None or task is None:
+        return
+    # Custom message headers show up as request attributes (or under `headers` on older Celery).
+    traceparent = getattr(task.request, "traceparent", None) or (getattr(task.request, "headers", None) or {}).get(
+        "traceparent"
+    )
+    span_cm = start_span(f"celery.task {task.name}", traceparent=traceparent)
+    span_cm.__enter__()
+    _task_spans[task_id] = span_cm
+
+
+@task_postrun.connect
+def _finish_task_span(task_id: str | None = None, state: str | None = None, **_: object) -> None:
+    span_cm = _task_spans.pop(task_id, None) if task_id is not None else None
+    if span_cm is None:
+        return
+    span = current_span()
+    if span is not None:
+        span.set(state=state)
+        if state == "FAILURE":
+            span.status = "error"
+    span_cm.__exit__(None, None, None)
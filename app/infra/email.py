@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import smtplib
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Callable, Protocol
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnection(Protocol):
+    def send_message(self, msg: EmailMessage) -> object: ...
+
+    def quit(self) -> object: ...
+
+
+SMTPFactory = Callable[[], SMTPConnection]
+
+# Errors after which the connection is dropped and the message retried once on a fresh one.
+_RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+@dataclass(frozen=True, slots=True)
+class OutgoingEmail:
+    to: str
+    subject: str
+    text: str
+    html: str | None = None
+
+
+def build_message(email: OutgoingEmail, *, sender: str | None = None) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = sender or settings.smtp_from
+    msg["To"] = email.to
+    msg["Subject"] = email.subject
+    msg.set_content(email.text)
+    if email.html:
+        msg.add_alternative(email.html, subtype="html")
+    return msg
+
+
+def _default_factory() -> SMTPConnection:
+    conn = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=settings.smtp_timeout_seconds)
+    if settings.smtp_starttls:
+        conn.starttls()
+    if settings.smtp_username:
+        conn.login(settings.smtp_username, settings.smtp_password or "")
+    return conn
+
+
+class _RateLimiter:
+    """Token bucket shared by all senders of one pool."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self.rate = rate_per_second
+        self._tokens = rate_per_second
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class SMTPPool:
+    """
+    Reusable SMTP connections for a worker process.
+
+    `send_many` spreads a batch over at most `size` connections, each sending its share back to
+    back without re-handshaking. Idle connections are kept for the next batch. Blocking smtplib
+    calls run in threads so the event loop stays free.
+    """
+
+    def __init__(
+        self,
+        *,
+        factory: SMTPFactory | None = None,
+        size: int | None = None,
+        rate_per_second: float | None = None,
+        sender: str | None = None,
+    ) -> None:
+        self._factory = factory or _default_factory
+        self.size = size or settings.smtp_pool_size
+        self._limiter = _RateLimiter(
+            rate_per_second if rate_per_second is not None else settings.email_rate_limit_per_second
+        )
+        self._sender = sender
+        self._idle: list[SMTPConnection] = []
+
+    async def _acquire(self) -> SMTPConnection:
+        if self._idle:
+            return self._idle.pop()
+        return await asyncio.to_thread(self._factory)
+
+    async def _discard(self, conn: SMTPConnection) -> None:
+        try:
+            await asyncio.to_thread(conn.quit)
+        except Exception:
+            logger.warning("Failed to close SMTP connection", exc_info=True)
+
+    async def _send_share(self, share: list[tuple[int, OutgoingEmail]], errors: dict[int, str]) -> None:
+        conn: SMTPConnection | None = None
+        try:
+            for index, email in share:
+                await self._limiter.acquire()
+                msg = build_message(email, sender=self._sender)
+                for attempt in range(2):
+                    try:
+                        if conn is None:
+                            conn = await self._acquire()
+                        await asyncio.to_thread(conn.send_message, msg)
+                        break
+                    except _RECONNECT_ERRORS as exc:
+                        if conn is not None:
+                            await self._discard(conn)
+                            conn = None
+                        if attempt == 1:
+                            errors[index] = f"{type(exc).__name__}: {exc}"
+                    except Exception as exc:
+                        errors[index] = f"{type(exc).__name__}: {exc}"
+                        break
+        finally:
+            if conn is not None:
+                self._idle.append(conn)
+
+    async def send_many(self, emails: list[OutgoingEmail]) -> dict[int, str]:
+        """Sends the batch and returns an error message for every index that failed."""
+        errors: dict[int, str] = {}
+        if not emails:
+            return errors
+        indexed = list(enumerate(emails))
+        workers = min(self.size, len(indexed))
+        shares = [indexed[i::workers] for i in range(workers)]
+        await asyncio.gather(*(self._send_share(share, errors) for share in shares))
+        return errors
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._discard(conn)
+
+
+smtp_pool = SMTPPool()
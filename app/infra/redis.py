@@ -1,12 +1,16 @@
 import json
+import time
+from typing import AsyncIterator
 
 from redis.asyncio import Redis
 
 from app.core.config import settings
+from app.core.metrics import instrument_redis
 
 
 redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
 
+@instrument_redis
 async def redis_set_json(key: str, value: dict, ttl_seconds: int) -> None:
     """
     Asynchronously sets a JSON-serializable dictionary value in Redis with a specified TTL.
@@ -21,6 +25,7 @@ async def redis_set_json(key: str, value: dict, ttl_seconds: int) -> None:
     """
     await redis_client.set(name=key, value=json.dumps(value), ex=ttl_seconds)
 
+@instrument_redis
 async def redis_get_json(key: str) -> dict | None:
     """
     Asynchronously retrieves a JSON-encoded value from Redis by key and returns it as a dictionary.
@@ -34,6 +39,25 @@ async def redis_get_json(key: str) -> dict | None:
     raw = await redis_client.get(key)
     return json.loads(raw) if raw else None
 
+@instrument_redis
+async def redis_get_json_many(keys: list[str]) -> list[dict | None]:
+    """Fetches several JSON values in one round trip (MGET); missing keys come back as None."""
+    if not keys:
+        return []
+    raws = await redis_client.mget(keys)
+    return [json.loads(raw) if raw else None for raw in raws]
+
+@instrument_redis
+async def redis_set_json_many(values: dict[str, dict], ttl_seconds: int) -> None:
+    """Stores several JSON values with the same TTL in one pipeline."""
+    if not values:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, value in values.items():
+            pipe.set(name=key, value=json.dumps(value), ex=ttl_seconds)
+        await pipe.execute()
+
+@instrument_redis
 async def redis_del(key: str) -> int:
     """
     Asynchronously deletes a key from the Redis database.
@@ -51,6 +75,7 @@ async def redis_del(key: str) -> int:
     return int(delete_resp)
 
 
+@instrument_redis
 async def redis_set_add(key: str, *values: str) -> int:
     if not values:
         return 0
@@ -58,6 +83,7 @@ async def redis_set_add(key: str, *values: str) -> int:
     return int(added)
 
 
+@instrument_redis
 async def redis_set_remove(key: str, *values: str) -> int:
     if not values:
         return 0
@@ -65,11 +91,185 @@ async def redis_set_remove(key: str, *values: str) -> int:
     return int(removed)
 
 
+@instrument_redis
 async def redis_set_members(key: str) -> set[str]:
     members = await redis_client.smembers(key)
     return set(members)
 
 
+@instrument_redis
 async def redis_ttl_seconds(key: str) -> int:
     ttl = await redis_client.ttl(key)
     return int(ttl)
+
+
+_INCR_IF_EXISTS = redis_client.register_script(
+    """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('INCRBY', KEYS[1], ARGV[1])
+    end
+    return nil
+    """
+)
+
+_DECR_IF_EXISTS_FLOORED = redis_client.register_script(
+    """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return nil
+    end
+    local value = redis.call('DECRBY', KEYS[1], ARGV[1])
+    if value < 0 then
+        redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+        return 0
+    end
+    return value
+    """
+)
+
+
+@instrument_redis
+async def redis_get_int(key: str) -> int | None:
+    raw = await redis_client.get(key)
+    return int(raw) if raw is not None else None
+
+
+@instrument_redis
+async def redis_set_int(key: str, value: int, ttl_seconds: int, *, only_if_missing: bool = False) -> bool:
+    """
+    Sets an integer value with a TTL.
+
+    Args:
+        key (str): The Redis key.
+        value (int): The value to store.
+        ttl_seconds (int): Time-to-live for the key in seconds.
+        only_if_missing (bool): When True, the key is only written if it does not exist yet (SET NX).
+
+    Returns:
+        bool: True if the value was written.
+    """
+    written = await redis_client.set(name=key, value=value, ex=ttl_seconds, nx=only_if_missing)
+    return bool(written)
+
+
+@instrument_redis
+async def redis_incr_existing(amounts: dict[str, int]) -> None:
+    """
+    Increments each key by its amount, skipping keys that are not present.
+
+    Missing keys are left alone so that a counter is only ever seeded from the source of truth,
+    never from a partial delta. All increments are sent in one pipeline.
+    """
+    if not amounts:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, amount in amounts.items():
+            await _INCR_IF_EXISTS(keys=[key], args=[amount], client=pipe)
+        await pipe.execute()
+
+
+@instrument_redis
+async def redis_decr_existing(key: str, amount: int = 1) -> int | None:
+    value = await _DECR_IF_EXISTS_FLOORED(keys=[key], args=[amount])
+    return int(value) if value is not None else None
+
+
+@instrument_redis
+async def redis_set_existing_ints(values: dict[str, int], ttl_seconds: int) -> None:
+    """Overwrites each key that still exists (SET XX), in one pipeline."""
+    if not values:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for key, value in values.items():
+            pipe.set(name=key, value=value, ex=ttl_seconds, xx=True)
+        await pipe.execute()
+
+
+async def redis_scan_keys(pattern: str, count: int = 500) -> AsyncIterator[list[str]]:
+    """Yields matching keys in chunks using SCAN, so large keyspaces never block Redis."""
+    cursor = 0
+    while True:
+        cursor, keys = await redis_client.scan(cursor=cursor, match=pattern, count=count)
+        if keys:
+            yield list(keys)
+        if cursor == 0:
+            break
+
+
+@instrument_redis
+async def redis_heartbeat(key: str, member: str, ttl_seconds: float) -> list[str]:
+    """
+    Records a heartbeat for `member` in a sorted set scored by time, drops members that have not
+    beaten within `ttl_seconds`, and returns the live members in sorted order.
+    """
+    now = time.time()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.zadd(key, {member: now})
+        pipe.zremrangebyscore(key, "-inf", now - ttl_seconds)
+        pipe.zrange(key, 0, -1)
+        *_, members = await pipe.execute()
+    return sorted(members)
+
+
+@instrument_redis
+async def redis_live_members(key: str, ttl_seconds: float) -> list[str]:
+    """Members of a heartbeat set (see `redis_heartbeat`) that beat within `ttl_seconds`."""
+    members = await redis_client.zrangebyscore(key, time.time() - ttl_seconds, "+inf")
+    return sorted(members)
+
+
+@instrument_redis
+async def redis_heartbeat_leave(key: str, member: str) -> int:
+    removed = await redis_client.zrem(key, member)
+    return int(removed)
+
+
+_STREAM_APPEND_AND_PUBLISH = redis_client.register_script(
+    """
+    local last = redis.call('XREVRANGE', KEYS[1], '+', '-', 'COUNT', 1)
+    local prev = ''
+    if last[1] then prev = last[1][1] end
+    local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'data', ARGV[3], 'prev', prev)
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    redis.call('PUBLISH', ARGV[4], cjson.encode({key = ARGV[5], id = id, data = ARGV[3]}))
+    return id
+    """
+)
+
+
+@instrument_redis
+async def redis_stream_publish(
+    entries: list[tuple[str, str, str]],
+    *,
+    channel: str,
+    maxlen: int,
+    ttl_seconds: int,
+) -> None:
+    """
+    Appends each `(stream_key, routing_key, data)` entry to its capped stream and publishes it on
+    `channel` together with the stream entry id, so live subscribers and later replays see the
+    same id. Each entry also stores the id of the entry before it (`prev`), which lets a replay
+    tell whether trimming dropped anything. All entries are sent in one pipeline.
+    """
+    if not entries:
+        return
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for stream_key, routing_key, data in entries:
+            await _STREAM_APPEND_AND_PUBLISH(
+                keys=[stream_key],
+                args=[maxlen, ttl_seconds, data, channel, routing_key],
+                client=pipe,
+            )
+        await pipe.execute()
+
+
+@instrument_redis
+async def redis_stream_after(key: str, after_id: str, count: int) -> list[tuple[str, str, str]]:
+    """Entries strictly after `after_id` as `(id, data, prev id)`, oldest first."""
+    entries = await redis_client.xrange(key, min=f"({after_id}", max="+", count=count)
+    return [(entry_id, fields.get("data", ""), fields.get("prev", "")) for entry_id, fields in entries]
+
+
+@instrument_redis
+async def redis_stream_first_id(key: str) -> str | None:
+    entries = await redis_client.xrange(key, min="-", max="+", count=1)
+    return entries[0][0] if entries else None
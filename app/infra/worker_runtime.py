@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Coroutine, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db.instrumentation import create_instrumented_engine
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    """
+    Long-lived event loop and database pool for a Celery worker process.
+
+    Celery tasks are synchronous, so every coroutine they need is submitted to a single loop
+    running in a background thread. The engine is created for that loop and kept for the life
+    of the process, which lets pooled connections be reused across tasks instead of being tied
+    to a throwaway loop created by `asyncio.run`.
+    """
+
+    def __init__(self, *, pool_size: int | None = None, max_overflow: int | None = None) -> None:
+        self._pool_size = pool_size if pool_size is not None else settings.worker_db_pool_size
+        self._max_overflow = max_overflow if max_overflow is not None else settings.worker_db_max_overflow
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self.engine: AsyncEngine | None = None
+        self.session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None and self._pid == os.getpid()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started:
+                return
+
+            # A loop or pool inherited across fork() belongs to the parent; start from scratch.
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="worker-runtime-loop", daemon=True)
+            thread.start()
+
+            self.engine = create_instrumented_engine(
+                settings.database_url,
+                name="worker",
+                pool_size=self._pool_size,
+                max_overflow=self._max_overflow,
+            )
+            self.session_factory = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info("Worker runtime started", extra={"pid": self._pid, "pool_size": self._pool_size})
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Runs `coro` on the runtime loop and blocks until it finishes."""
+        self.start()
+        assert self._loop is not None
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return future.result()
+
+    def stop(self) -> None:
+        with self._lock:
+            if not self.started:
+                return
+            assert self._loop is not None and self._thread is not None
+
+            if self.engine is not None:
+                asyncio.run_coroutine_threadsafe(self.engine.dispose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+
+            self._loop = None
+            self._thread = None
+            self._pid = None
+            self.engine = None
+            self.session_factory = None
+
+
+worker_runtime = WorkerRuntime()
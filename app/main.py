@@ -1,6 +1,9 @@
 import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Awaitable, cast
+from typing import AsyncIterator, Awaitable, cast
 
 from fastapi import FastAPI, Response, status
 from kombu import Connection
@@ -8,18 +11,35 @@ from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.logging import setup_logging
-from app.db.session import AsyncSessionLocal
+from app.core.metrics import MetricsMiddleware, metrics_payload, register_collector
+from app.core.request_context import RequestContextMiddleware
+from app.core.tracing import TracingMiddleware, configure_tracing, flush_tracing
+from app.db.instrumentation import PoolCollector, QueryCountMiddleware, pool_snapshot
+from app.db.session import AsyncSessionLocal, engine, replica_engine
 from app.infra.redis import redis_client
 from app.modules.auth.router import router as auth_router
+from app.modules.notifications.router import admin_router as notifications_admin_router
 from app.modules.notifications.router import router as notifications_router
+from app.modules.notifications.service import NotificationService
+from app.modules.notifications.stream import notification_stream_hub
 from app.modules.organizations.router import router as organizations_router
 from app.modules.projects.router import router as projects_router
 from app.modules.tasks.router import router as tasks_router
 from fastapi.middleware.cors import CORSMiddleware
 
 setup_logging()
+configure_tracing()
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title=settings.app_name)
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await notification_stream_hub.close()
+    flush_tracing()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -32,11 +52,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    register_collector(
+        PoolCollector(
+            lambda: {
+                "primary": engine.pool,
+                **({"replica": replica_engine.pool} if replica_engine is not None else {}),
+            }
+        )
+    )
+
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
+if settings.debug:
+    app.add_middleware(QueryCountMiddleware)
+
+# Added last so it wraps everything else and the request scope is visible to all inner code.
+app.add_middleware(RequestContextMiddleware)
+
 app.include_router(auth_router)
 app.include_router(organizations_router)
 app.include_router(projects_router)
 app.include_router(tasks_router)
 app.include_router(notifications_router)
+app.include_router(notifications_admin_router)
+
 
 
 async def _check_db() -> tuple[bool, str | None]:
@@ -93,4 +135,30 @@ async def health(response: Response) -> dict:
         "service": settings.app_name,
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "checks": checks,
+        "db_pools": {
+            "primary": pool_snapshot(engine.pool),
+            **({"replica": pool_snapshot(replica_engine.pool)} if replica_engine is not None else {}),
+        },
     }
+
+
+_notification_service = NotificationService()
+_outbox_metrics_refreshed_at = float("-inf")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    global _outbox_metrics_refreshed_at
+    if not settings.metrics_enabled:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+    # Backlog gauges cost a query, so scrapes closer together than the interval reuse them.
+    now = time.monotonic()
+    if now - _outbox_metrics_refreshed_at >= settings.metrics_outbox_refresh_seconds:
+        _outbox_metrics_refreshed_at = now
+        try:
+            async with AsyncSessionLocal() as session:
+                await _notification_service.refresh_outbox_metrics(session)
+        except Exception:
+            logger.exception("Failed to refresh outbox metrics")
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
@@ -6,7 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_token
-from app.db.session import get_db_session
+from app.db.session import get_db_session, get_read_db_session
 from app.modules.users.models import User
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -29,6 +29,21 @@ async def get_current_user(
     Raises:
         HTTPException: If authentication fails due to missing credentials, invalid token, or user not found.
     """
+    return await _authenticate(creds, db)
+
+
+async def get_current_reader(
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_read_db_session),
+) -> User:
+    """
+    Same as `get_current_user`, but loads the user through `get_read_db_session`, so read-only
+    handlers that also depend on that session run entirely on one (possibly replica) connection.
+    """
+    return await _authenticate(creds, db)
+
+
+async def _authenticate(creds: HTTPAuthorizationCredentials | None, db: AsyncSession) -> User:
     if creds is None or not creds.credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
@@ -48,3 +63,15 @@ async def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
     return user
+
+
+async def get_current_superuser(user: User = Depends(get_current_user)) -> User:
+    """
+    Ensure the authenticated user has superuser privileges.
+
+    Raises:
+        HTTPException: If the user is not a superuser (403 Forbidden).
+    """
+    if not user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Superuser privileges required")
+    return user
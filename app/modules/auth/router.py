@@ -94,8 +94,8 @@ async def request_email_verification(
     db: AsyncSession = Depends(get_db_session),
     current_user: User = Depends(get_current_user),
 ) -> AuthActionResponse:
-    token = await service.request_email_verification(db, current_user.id)
-    return AuthActionResponse(status="ok", token=token if settings.debug else None)
+    await service.request_email_verification(db, current_user.id)
+    return AuthActionResponse(status="ok")
 
 
 @router.post("/verify-email/confirm", response_model=AuthActionResponse)
@@ -112,8 +112,8 @@ async def request_password_reset(
     payload: PasswordResetRequest,
     db: AsyncSession = Depends(get_db_session),
 ) -> AuthActionResponse:
-    token = await service.request_password_reset(db, payload.email)
-    return AuthActionResponse(status="ok", token=token if settings.debug else None)
+    await service.request_password_reset(db, payload.email)
+    return AuthActionResponse(status="ok")
 
 
 @router.post("/password-reset/confirm", response_model=AuthActionResponse)
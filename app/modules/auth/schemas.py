@@ -41,7 +41,6 @@ class TokenResponse(BaseModel):
 
 class AuthActionResponse(BaseModel):
     status: str = "ok"
-    token: str | None = None
 
 
 class MeResponse(BaseModel):
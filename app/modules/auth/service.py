@@ -6,8 +6,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token, hash_password, verify_password
 from app.core.config import settings
+from app.core.tracing import trace_service
+from app.db.session import mark_user_write
 from app.infra.redis import redis_del, redis_get_json, redis_set_json
-from app.modules.auth.tokens import generate_refresh_token, hash_refresh_token
+from app.modules.auth.tokens import (
+    email_verify_key,
+    generate_refresh_token,
+    hash_refresh_token,
+    password_reset_key,
+)
+from app.modules.notifications.service import NotificationService
 from app.modules.users.models import User
 from app.modules.users.repository import UserRepository
 
@@ -20,14 +28,7 @@ def _rt_key(token_hash: str) -> str:
     return f"rt:{token_hash}"
 
 
-def _email_verify_key(token_hash: str) -> str:
-    return f"email_verify:{token_hash}"
-
-
-def _pwd_reset_key(token_hash: str) -> str:
-    return f"pwd_reset:{token_hash}"
-
-
+@trace_service
 class AuthService:
     """
     AuthService provides authentication-related operations such as user registration, login, and token/session management.
@@ -61,18 +62,25 @@ class AuthService:
         async issue_access_token(user_id: str) -> str
             Issues a new access token for the specified user.
     """
-    def __init__(self, user_repo: UserRepository | None = None) -> None:
+    def __init__(
+        self,
+        user_repo: UserRepository | None = None,
+        notification_service: NotificationService | None = None,
+    ) -> None:
         """
         Initializes the service with a user repository.
 
         Args:
             user_repo (UserRepository, optional): An instance of UserRepository to be used by the service.
                 If not provided, a new UserRepository instance will be created.
+            notification_service (NotificationService, optional): Used to queue verification and
+                password reset emails through the notification outbox.
 
         Returns:
             None
         """
         self.user_repo = user_repo or UserRepository()
+        self.notification_service = notification_service or NotificationService()
 
     async def register(self, db: AsyncSession, email: str, username: str, password: str) -> str:
         """
@@ -99,6 +107,8 @@ class AuthService:
         user = User(email=email, username=username, hashed_password=hash_password(password))
         await self.user_repo.create(db, user)
         await db.commit()
+        # The new account is not on a lagging replica yet; keep its first reads on the primary.
+        await mark_user_write(str(user.id))
 
         return create_access_token(subject=str(user.id))
 
@@ -221,29 +231,22 @@ class AuthService:
         """
         return create_access_token(subject=user_id)
 
-    async def request_email_verification(self, db: AsyncSession, user_id: uuid.UUID) -> str | None:
+    async def request_email_verification(self, db: AsyncSession, user_id: uuid.UUID) -> None:
         user = await self.user_repo.get_by_id(db, user_id)
         if not user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         if user.is_verified:
-            return None
+            return
 
-        raw = generate_refresh_token()
-        h = hash_refresh_token(raw)
-        payload = {
-            "uid": str(user.id),
-            "created_at": int(datetime.now(timezone.utc).timestamp()),
-        }
-        await redis_set_json(
-            _email_verify_key(h),
-            payload,
-            ttl_seconds=settings.email_verification_token_ttl_seconds,
-        )
-        return raw
+        # The token is minted by the outbox handler when the email goes out, so the raw value
+        # is never stored in the outbox.
+        await self.notification_service.enqueue_auth_email(db, purpose="email_verification", user_id=user.id)
+        await db.commit()
+        await self.notification_service.trigger_outbox_dispatch(user_id=str(user.id), template="email_verification")
 
     async def verify_email(self, db: AsyncSession, raw_token: str) -> None:
         token_hash = hash_refresh_token(raw_token)
-        key = _email_verify_key(token_hash)
+        key = email_verify_key(token_hash)
         data = await redis_get_json(key)
         if not data:
             raise HTTPException(
@@ -263,27 +266,18 @@ class AuthService:
 
         await redis_del(key)
 
-    async def request_password_reset(self, db: AsyncSession, email: str) -> str | None:
-        user = await self.user_repo.get_by_email(db, email)
-        if not user:
-            return None
-
-        raw = generate_refresh_token()
-        h = hash_refresh_token(raw)
-        payload = {
-            "uid": str(user.id),
-            "created_at": int(datetime.now(timezone.utc).timestamp()),
-        }
-        await redis_set_json(
-            _pwd_reset_key(h),
-            payload,
-            ttl_seconds=settings.password_reset_token_ttl_seconds,
-        )
-        return raw
+    async def request_password_reset(self, db: AsyncSession, email: str) -> None:
+        """
+        Queues a reset email for `email` without looking the account up: the outbox handler
+        skips unknown addresses, so known and unknown emails cost the caller the same work.
+        """
+        await self.notification_service.enqueue_auth_email(db, purpose="password_reset", email=email)
+        await db.commit()
+        await self.notification_service.trigger_outbox_dispatch(template="password_reset")
 
     async def reset_password(self, db: AsyncSession, raw_token: str, new_password: str) -> None:
         token_hash = hash_refresh_token(raw_token)
-        key = _pwd_reset_key(token_hash)
+        key = password_reset_key(token_hash)
         data = await redis_get_json(key)
         if not data:
             raise HTTPException(
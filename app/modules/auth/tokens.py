@@ -20,4 +20,12 @@ def hash_refresh_token(token: str) -> str:
     Returns:
         str: The SHA-256 hexadecimal digest of the token.
     """
-    return hashlib.sha256(token.encode("utf-8")).hexdigest()
\ No newline at end of file
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def email_verify_key(token_hash: str) -> str:
+    return f"email_verify:{token_hash}"
+
+
+def password_reset_key(token_hash: str) -> str:
+    return f"pwd_reset:{token_hash}"
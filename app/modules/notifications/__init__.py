@@ -1,7 +1,16 @@
-from app.modules.notifications.models import Notification, NotificationOutbox
+from app.modules.notifications.models import (
+    Notification,
+    NotificationOutbox,
+    NotificationOutboxLog,
+    NotificationPreference,
+    NotificationReadMarker,
+)
 
 
 __all__ = [
    "Notification",
    "NotificationOutbox",
+   "NotificationOutboxLog",
+   "NotificationPreference",
+   "NotificationReadMarker",
 ]
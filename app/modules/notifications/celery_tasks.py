@@ -1,8 +1,12 @@
+import logging
+
 from celery import shared_task
 
 from app.modules.notifications.service import NotificationService
 
 
+logger = logging.getLogger(__name__)
+
 notification_service = NotificationService()
 
 
@@ -27,3 +31,22 @@ def task_assigned(event: dict) -> None:
 @shared_task(name="taskflow.dispatch_notifications_outbox")
 def dispatch_notifications_outbox(limit: int = 100) -> int:
     return notification_service.dispatch_outbox(limit=limit)
+
+
+@shared_task(name="taskflow.compact_notifications_outbox")
+def compact_notifications_outbox() -> dict:
+    result = notification_service.compact_outbox()
+    logger.info("Compacted notification outbox", extra=result)
+    return result
+
+
+@shared_task(name="taskflow.maintain_notification_partitions")
+def maintain_notification_partitions() -> dict:
+    result = notification_service.maintain_partitions()
+    logger.info("Maintained notification partitions", extra=result)
+    return result
+
+
+@shared_task(name="taskflow.reconcile_unread_counters")
+def reconcile_unread_counters() -> int:
+    return notification_service.reconcile_unread_counters()
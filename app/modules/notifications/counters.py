@@ -0,0 +1,9 @@
+UNREAD_COUNT_KEY_PATTERN = "notif_unread:*"
+
+
+def unread_count_key(user_id: str) -> str:
+    return f"notif_unread:{user_id}"
+
+
+def user_id_from_unread_key(key: str) -> str:
+    return key.split(":", 1)[1]
@@ -0,0 +1,217 @@
+"""
+Long-running outbox dispatcher.
+
+Wakes on Postgres NOTIFY sent by `NotificationRepository.enqueue_outbox`, drains the outbox
+while full batches keep coming back, and falls back to a low-frequency poll so rows are still
+picked up if a notification is missed (listener reconnects, retries coming due, etc.).
+
+Several dispatchers can run side by side: each one only claims the outbox shards it owns (see
+`app.modules.notifications.sharding`) and ignores notifications for other shards.
+
+Run it next to the Celery worker:
+
+    python -m app.modules.notifications.dispatcher
+"""
+import asyncio
+import logging
+import signal
+import time
+from datetime import datetime, timezone
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.tracing import configure_tracing, flush_tracing, start_span
+from app.db.session import AsyncSessionLocal, engine
+from app.infra.email import smtp_pool
+from app.modules.notifications.service import NotificationService
+from app.modules.notifications.sharding import ShardCoordinator
+
+
+logger = logging.getLogger(__name__)
+
+_ERROR_BACKOFF_SECONDS = 5.0
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        service: NotificationService | None = None,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+        channel: str | None = None,
+        coordinator: ShardCoordinator | None = None,
+    ) -> None:
+        self.service = service or NotificationService()
+        self.session_factory = session_factory or AsyncSessionLocal
+        self.batch_size = batch_size or settings.outbox_dispatch_batch_size
+        self.poll_interval = poll_interval or settings.outbox_safety_poll_seconds
+        self.channel = channel or settings.outbox_notify_channel
+        self.coordinator = coordinator or ShardCoordinator()
+        self.heartbeat_interval = settings.outbox_dispatcher_heartbeat_seconds
+
+        # None until the first heartbeat succeeds, and while Redis is unreachable: claim every shard.
+        self.shards: list[int] | None = None
+        self._next_heartbeat = 0.0
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._listener: asyncpg.Connection | None = None
+
+    def _on_notify(self, _conn: object, _pid: int, _channel: str, payload: str) -> None:
+        if payload and self.shards is not None:
+            try:
+                if int(payload) not in self.shards:
+                    return
+            except ValueError:
+                pass
+        self._wakeup.set()
+
+    def _on_listener_closed(self, *_: object) -> None:
+        logger.warning("Outbox listener connection lost; falling back to polling until reconnected")
+        self._listener = None
+        self._wakeup.set()
+
+    async def _ensure_listener(self) -> None:
+        if self._listener is not None and not self._listener.is_closed():
+            return
+        try:
+            conn = await asyncpg.connect(settings.database_dsn)
+            conn.add_termination_listener(self._on_listener_closed)
+            await conn.add_listener(self.channel, self._on_notify)
+            self._listener = conn
+            logger.info("Listening for outbox notifications", extra={"channel": self.channel})
+        except Exception:
+            logger.exception("Failed to start outbox listener")
+            self._listener = None
+
+    async def _close_listener(self) -> None:
+        if self._listener is not None and not self._listener.is_closed():
+            await self._listener.close()
+        self._listener = None
+
+    async def _heartbeat(self, *, force: bool = False) -> None:
+        """Refreshes shard ownership once per heartbeat interval."""
+        now = time.monotonic()
+        if not force and now < self._next_heartbeat:
+            return
+        self._next_heartbeat = now + self.heartbeat_interval
+        try:
+            self.shards = await self.coordinator.heartbeat()
+        except Exception:
+            if self.shards is not None:
+                logger.exception("Outbox heartbeat failed; claiming all shards until Redis recovers")
+            self.shards = None
+
+    async def _idle_timeout(self, processed: int) -> float:
+        """
+        Sleeps until the next scheduled retry, capped at the safety poll interval and the
+        heartbeat interval so ownership stays fresh while idle.
+
+        A retry that is already due after a pass that claimed nothing is locked by another
+        dispatcher, which will send it; waiting the full cap keeps the loop from spinning on it.
+        """
+        cap = min(self.poll_interval, self.heartbeat_interval)
+        if self.shards == []:
+            return cap
+        async with self.session_factory() as db:
+            due_at = await self.service.next_outbox_retry_at(db, shards=self.shards)
+        if due_at is None:
+            return cap
+        delay = (due_at - datetime.now(timezone.utc)).total_seconds()
+        if delay <= 0 and not processed:
+            return cap
+        return min(cap, max(delay, 0.0))
+
+    async def _wait(self, timeout: float) -> None:
+        waiters = [asyncio.ensure_future(self._wakeup.wait()), asyncio.ensure_future(self._stopping.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def drain(self) -> int:
+        """Dispatches batches until one comes back short. Returns the number of rows processed."""
+        total = 0
+        while not self._stopping.is_set():
+            await self._heartbeat()
+            if self.shards == []:
+                # More dispatchers than shards; this one stays on standby.
+                break
+            with start_span("outbox.dispatch_batch", batch_size=self.batch_size) as span:
+                processed = await self.service._dispatch_outbox_async(
+                    limit=self.batch_size,
+                    session_factory=self.session_factory,
+                    shards=self.shards,
+                )
+                if span is not None:
+                    span.set(processed=processed)
+            total += processed
+            if processed < self.batch_size:
+                break
+        return total
+
+    async def run(self) -> None:
+        logger.info(
+            "Outbox dispatcher started",
+            extra={
+                "batch_size": self.batch_size,
+                "poll_interval": self.poll_interval,
+                "member": self.coordinator.member_id,
+            },
+        )
+        await self._heartbeat(force=True)
+        try:
+            while not self._stopping.is_set():
+                await self._ensure_listener()
+                # Clear before draining so a NOTIFY that lands mid-drain triggers another pass.
+                self._wakeup.clear()
+                try:
+                    processed = await self.drain()
+                    if processed:
+                        logger.info("Dispatched outbox rows", extra={"processed": processed, "shards": self.shards})
+                    timeout = await self._idle_timeout(processed)
+                except Exception:
+                    logger.exception("Outbox dispatch failed")
+                    timeout = _ERROR_BACKOFF_SECONDS
+
+                if not self._wakeup.is_set():
+                    await self._wait(timeout)
+        finally:
+            await self._close_listener()
+            try:
+                # Let the remaining dispatchers pick up this one's shards without waiting for the TTL.
+                await self.coordinator.leave()
+            except Exception:
+                logger.exception("Failed to leave outbox dispatcher group")
+            logger.info("Outbox dispatcher stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+
+async def _serve() -> None:
+    dispatcher = OutboxDispatcher()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, dispatcher.stop)
+    try:
+        await dispatcher.run()
+    finally:
+        await smtp_pool.close()
+        await engine.dispose()
+        flush_tracing()
+
+
+def main() -> None:
+    setup_logging()
+    configure_tracing()
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Transactional email delivered through the notification outbox.
+
+`NotificationService.enqueue_email` writes an `EMAIL` outbox event in the caller's transaction;
+the dispatcher hands every claimed `EMAIL` event to `handle_email`, which renders each template
+once per batch and sends through the worker's pooled SMTP connections. Failed sends are retried
+by the outbox with the usual backoff and dead-lettering.
+
+Verification and password reset emails are queued as `AUTH_EMAIL` events that name only the
+purpose and the user (or the address typed into the reset form). `handle_auth_email` mints the
+token when the email is sent, so raw tokens never reach the outbox table, and settles events for
+unknown addresses or already verified users without sending anything.
+"""
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from string import Template
+from typing import Callable
+from urllib.parse import urlencode
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.infra.email import OutgoingEmail, SMTPPool, smtp_pool
+from app.infra.redis import redis_set_json
+from app.modules.auth.tokens import email_verify_key, generate_refresh_token, hash_refresh_token, password_reset_key
+from app.modules.notifications.handlers import HandlerResult, OutboxEvent, outbox_handlers
+from app.modules.users.models import User
+
+
+logger = logging.getLogger(__name__)
+
+EMAIL_EVENT_TYPE = "EMAIL"
+AUTH_EMAIL_EVENT_TYPE = "AUTH_EMAIL"
+
+
+@dataclass(frozen=True, slots=True)
+class EmailTemplate:
+    subject: str
+    text: str
+
+
+TEMPLATES: dict[str, EmailTemplate] = {
+    "email_verification": EmailTemplate(
+        subject="Confirm your email address",
+        text=(
+            "Hi $username,\n\n"
+            "Confirm your email address by opening the link below:\n\n"
+            "$link\n\n"
+            "The link expires in $ttl_hours hours. If you did not sign up, ignore this email.\n"
+        ),
+    ),
+    "password_reset": EmailTemplate(
+        subject="Reset your password",
+        text=(
+            "Hi $username,\n\n"
+            "Someone asked to reset the password for your account. To choose a new one, open:\n\n"
+            "$link\n\n"
+            "The link expires in $ttl_hours hours. If this was not you, ignore this email.\n"
+        ),
+    ),
+}
+
+
+class _CompiledTemplate:
+    """A template parsed once and then filled for every recipient of the batch."""
+
+    def __init__(self, template: EmailTemplate) -> None:
+        self.subject = Template(template.subject)
+        self.text = Template(template.text)
+
+    def render(self, to: str, context: dict) -> OutgoingEmail:
+        return OutgoingEmail(
+            to=to,
+            subject=self.subject.substitute(context),
+            text=self.text.substitute(context),
+        )
+
+
+async def send_email_events(events: list[OutboxEvent], pool: SMTPPool) -> HandlerResult:
+    result = HandlerResult()
+    compiled: dict[str, _CompiledTemplate] = {}
+    outgoing: list[tuple[OutboxEvent, OutgoingEmail]] = []
+
+    for event in events:
+        name = event.payload.get("template")
+        template = TEMPLATES.get(name) if isinstance(name, str) else None
+        if template is None:
+            result.errors[event.id] = f"Unknown email template: {name}"
+            continue
+        if name not in compiled:
+            compiled[name] = _CompiledTemplate(template)
+        try:
+            outgoing.append((event, compiled[name].render(event.payload["to"], event.payload.get("context") or {})))
+        except (KeyError, ValueError) as exc:
+            result.errors[event.id] = f"Cannot render {name}: missing {exc}"
+
+    send_errors = await pool.send_many([email for _, email in outgoing])
+    for index, (event, _) in enumerate(outgoing):
+        if index in send_errors:
+            result.errors[event.id] = send_errors[index]
+        else:
+            result.notifications[event.id] = []
+
+    if send_errors:
+        logger.warning("Email batch had failures", extra={"sent": len(outgoing) - len(send_errors), "failed": len(send_errors)})
+    return result
+
+
+@outbox_handlers.register(EMAIL_EVENT_TYPE)
+async def handle_email(db: AsyncSession, events: list[OutboxEvent]) -> HandlerResult:
+    return await send_email_events(events, smtp_pool)
+
+
+@dataclass(frozen=True, slots=True)
+class TokenPurpose:
+    path: str
+    key: Callable[[str], str]
+    ttl_setting: str
+
+    @property
+    def ttl_seconds(self) -> int:
+        return getattr(settings, self.ttl_setting)
+
+
+# Purpose -> how its token is stored; the purpose doubles as the template name.
+TOKEN_PURPOSES: dict[str, TokenPurpose] = {
+    "email_verification": TokenPurpose("/verify-email", email_verify_key, "email_verification_token_ttl_seconds"),
+    "password_reset": TokenPurpose("/reset-password", password_reset_key, "password_reset_token_ttl_seconds"),
+}
+
+
+async def _mint_token(purpose: TokenPurpose, user: User) -> str:
+    raw = generate_refresh_token()
+    await redis_set_json(
+        purpose.key(hash_refresh_token(raw)),
+        {"uid": str(user.id), "created_at": int(datetime.now(timezone.utc).timestamp())},
+        ttl_seconds=purpose.ttl_seconds,
+    )
+    return raw
+
+
+async def send_auth_email_events(db: AsyncSession, events: list[OutboxEvent], pool: SMTPPool) -> HandlerResult:
+    result = HandlerResult()
+    targets: dict[uuid.UUID, tuple[str, uuid.UUID | None, str | None]] = {}
+    for event in events:
+        purpose = event.payload.get("purpose")
+        try:
+            if purpose not in TOKEN_PURPOSES:
+                raise ValueError(f"unknown purpose {purpose}")
+            user_id = uuid.UUID(event.payload["user_id"]) if event.payload.get("user_id") else None
+            email = event.payload.get("email") if user_id is None else None
+            if user_id is None and not isinstance(email, str):
+                raise ValueError("needs user_id or email")
+        except (TypeError, ValueError) as exc:
+            result.errors[event.id] = f"Invalid AUTH_EMAIL event: {exc}"
+            continue
+        targets[event.id] = (purpose, user_id, email)
+    if not targets:
+        return result
+
+    # One lookup for the batch, by id for verification and by address for resets.
+    user_ids = {user_id for _, user_id, _ in targets.values() if user_id is not None}
+    emails = {email for _, _, email in targets.values() if email is not None}
+    rows = await db.execute(select(User).where(or_(User.id.in_(user_ids), User.email.in_(emails))))
+    users = list(rows.scalars().all())
+    by_id = {user.id: user for user in users}
+    by_email = {user.email: user for user in users}
+
+    outgoing: list[OutboxEvent] = []
+    for event_id, (name, user_id, email) in targets.items():
+        user = by_id.get(user_id) if user_id is not None else by_email.get(email)
+        if user is None or (name == "email_verification" and user.is_verified):
+            # Unknown addresses and finished verifications are settled without an email.
+            result.notifications[event_id] = []
+            continue
+        purpose = TOKEN_PURPOSES[name]
+        raw = await _mint_token(purpose, user)
+        link = f"{settings.email_link_base_url.rstrip('/')}{purpose.path}?{urlencode({'token': raw})}"
+        context = {"username": user.username, "link": link, "ttl_hours": max(purpose.ttl_seconds // 3600, 1)}
+        outgoing.append(
+            OutboxEvent(
+                id=event_id,
+                event_type=EMAIL_EVENT_TYPE,
+                payload={"to": user.email, "template": name, "context": context},
+            )
+        )
+
+    sent = await send_email_events(outgoing, pool)
+    result.notifications.update(sent.notifications)
+    result.errors.update(sent.errors)
+    return result
+
+
+@outbox_handlers.register(AUTH_EMAIL_EVENT_TYPE)
+async def handle_auth_email(db: AsyncSession, events: list[OutboxEvent]) -> HandlerResult:
+    return await send_auth_email_events(db, events, smtp_pool)
@@ -0,0 +1,232 @@
+"""
+Outbox event handlers.
+
+A handler is registered for one or more event types and is called with every event of those
+types from a claimed outbox batch at once, so it can do set-based work (one lookup for all
+recipients, one render per template, ...) instead of per-event round trips. It reports, per
+outbox row, either the notification rows to insert or an error; the dispatcher takes care of
+inserting, marking rows sent/failed and retries.
+"""
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.organizations.models import OrgMember
+from app.modules.tasks.models import Task
+from app.modules.users.models import User
+
+
+@dataclass(frozen=True, slots=True)
+class OutboxEvent:
+    id: uuid.UUID
+    event_type: str
+    payload: dict[str, Any]
+
+
+@dataclass(slots=True)
+class HandlerResult:
+    # Outbox row id -> notification rows to insert (an empty list marks the event handled).
+    notifications: dict[uuid.UUID, list[dict]] = field(default_factory=dict)
+    # Outbox row id -> error message; the row is retried with backoff.
+    errors: dict[uuid.UUID, str] = field(default_factory=dict)
+
+
+OutboxHandler = Callable[[AsyncSession, list[OutboxEvent]], Awaitable[HandlerResult]]
+
+
+class OutboxHandlerRegistry:
+    def __init__(self) -> None:
+        self._handlers: dict[str, OutboxHandler] = {}
+
+    def register(self, *event_types: str) -> Callable[[OutboxHandler], OutboxHandler]:
+        def decorator(handler: OutboxHandler) -> OutboxHandler:
+            for event_type in event_types:
+                if event_type in self._handlers:
+                    raise ValueError(f"Outbox handler already registered for {event_type}")
+                self._handlers[event_type] = handler
+            return handler
+
+        return decorator
+
+    def get(self, event_type: str) -> OutboxHandler | None:
+        return self._handlers.get(event_type)
+
+    @property
+    def event_types(self) -> list[str]:
+        return sorted(self._handlers)
+
+
+outbox_handlers = OutboxHandlerRegistry()
+
+
+DIGEST_MAX_ITEMS = 50
+
+
+def _assignment_digest(user_id: uuid.UUID, events: list[OutboxEvent]) -> dict:
+    org_ids = sorted({str(event.payload.get("org_id")) for event in events})
+    tasks = [
+        {key: event.payload.get(key) for key in ("task_id", "project_id", "title", "assigned_by", "ts")}
+        for event in events
+    ]
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "type": "TASK_ASSIGNED_DIGEST",
+        "payload": {
+            **({"org_id": org_ids[0]} if len(org_ids) == 1 else {}),
+            "org_ids": org_ids,
+            "count": len(events),
+            "tasks": tasks[:DIGEST_MAX_ITEMS],
+        },
+        "is_read": False,
+    }
+
+
+@outbox_handlers.register("TASK_ASSIGNED")
+async def handle_task_assigned(db: AsyncSession, events: list[OutboxEvent]) -> HandlerResult:
+    """
+    Coalesces the batch per recipient before writing notifications.
+
+    Enqueueing delays assignment events to the end of the coalescing window (see
+    `NotificationService.enqueue_task_assigned`), so rapid reassignments and bulk moves arrive
+    here together. Events whose task is no longer assigned to the recipient are dropped, repeats
+    for the same task collapse to the latest, and a recipient with several remaining tasks gets
+    one TASK_ASSIGNED_DIGEST instead of one notification each.
+    """
+    result = HandlerResult()
+    targets: dict[uuid.UUID, tuple[uuid.UUID, uuid.UUID]] = {}
+    for event in events:
+        try:
+            targets[event.id] = (uuid.UUID(event.payload["task_id"]), uuid.UUID(event.payload["assigned_to"]))
+        except (KeyError, TypeError, ValueError):
+            result.errors[event.id] = "TASK_ASSIGNED event needs valid task_id and assigned_to"
+    if not targets:
+        return result
+
+    # One lookup for the whole batch. The assignee is a foreign key to users, so a match also
+    # proves the recipient still exists.
+    rows = await db.execute(
+        select(Task.id, Task.assigned_to).where(Task.id.in_({task_id for task_id, _ in targets.values()}))
+    )
+    current = dict(rows.all())
+
+    # Latest surviving event per (recipient, task); the batch is claimed oldest first.
+    latest: dict[tuple[uuid.UUID, uuid.UUID], OutboxEvent] = {}
+    for event in events:
+        if event.id not in targets:
+            continue
+        task_id, user_id = targets[event.id]
+        # Superseded or stale events are settled without writing anything.
+        result.notifications[event.id] = []
+        if current.get(task_id) == user_id:
+            latest[(user_id, task_id)] = event
+
+    per_user: dict[uuid.UUID, list[OutboxEvent]] = {}
+    for (user_id, _), event in latest.items():
+        per_user.setdefault(user_id, []).append(event)
+
+    for user_id, user_events in per_user.items():
+        if len(user_events) == 1:
+            event = user_events[0]
+            notification = {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "type": event.event_type,
+                "payload": event.payload,
+                "is_read": False,
+            }
+        else:
+            event = user_events[-1]
+            notification = _assignment_digest(user_id, user_events)
+        result.notifications[event.id] = [notification]
+    return result
+
+
+TASK_WATCH_EVENT_TYPES = ("TASK_STATUS_CHANGED", "TASK_TITLE_CHANGED", "TASK_DELETED")
+
+
+@outbox_handlers.register(*TASK_WATCH_EVENT_TYPES)
+async def handle_task_watch_event(db: AsyncSession, events: list[OutboxEvent]) -> HandlerResult:
+    """
+    Expands each event into one notification per listed recipient (the task's watchers at the
+    time of the change). All rows of the batch are inserted by the dispatcher in one statement.
+    """
+    result = HandlerResult()
+    recipients: dict[uuid.UUID, list[uuid.UUID]] = {}
+    org_ids: dict[uuid.UUID, uuid.UUID] = {}
+    for event in events:
+        try:
+            org_ids[event.id] = uuid.UUID(event.payload["org_id"])
+            recipients[event.id] = [uuid.UUID(user_id) for user_id in event.payload["recipients"]]
+        except (KeyError, TypeError, ValueError):
+            result.errors[event.id] = f"{event.event_type} event needs an org_id and a recipients list"
+    if not recipients:
+        return result
+
+    # Only watchers who are still members of the task's org (and so still have an account) are
+    # notified; anyone removed since the event was written is skipped.
+    all_ids = {user_id for user_ids in recipients.values() for user_id in user_ids}
+    rows = await db.execute(
+        select(OrgMember.org_id, OrgMember.user_id)
+        .join(User, User.id == OrgMember.user_id)
+        .where(OrgMember.org_id.in_(set(org_ids.values())), OrgMember.user_id.in_(all_ids))
+    )
+    members = {(org_id, user_id) for org_id, user_id in rows.all()}
+
+    for event in events:
+        if event.id not in recipients:
+            continue
+        payload = {key: value for key, value in event.payload.items() if key != "recipients"}
+        result.notifications[event.id] = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "type": event.event_type,
+                "payload": payload,
+                "is_read": False,
+            }
+            for user_id in recipients[event.id]
+            if (org_ids[event.id], user_id) in members
+        ]
+    return result
+
+
+@outbox_handlers.register("NOTIFICATION_DIGEST")
+async def handle_notification_digest(db: AsyncSession, events: list[OutboxEvent]) -> HandlerResult:
+    """
+    Flushes notifications deferred for digest-only users (see `NotificationService._apply_preferences`):
+    all pending digest events of a user in the batch become a single NOTIFICATION_DIGEST.
+    """
+    result = HandlerResult()
+    per_user: dict[uuid.UUID, list[OutboxEvent]] = {}
+    for event in events:
+        try:
+            user_id = uuid.UUID(event.payload["user_id"])
+        except (KeyError, TypeError, ValueError):
+            result.errors[event.id] = "NOTIFICATION_DIGEST event has no valid user_id"
+            continue
+        per_user.setdefault(user_id, []).append(event)
+        result.notifications[event.id] = []
+
+    for user_id, user_events in per_user.items():
+        items = [item for event in user_events for item in event.payload.get("items", [])]
+        if not items:
+            continue
+        result.notifications[user_events[-1].id] = [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "type": "NOTIFICATION_DIGEST",
+                "payload": {
+                    "count": len(items),
+                    "types": dict(Counter(item["type"] for item in items)),
+                    "items": items[:DIGEST_MAX_ITEMS],
+                },
+                "is_read": False,
+            }
+        ]
+    return result
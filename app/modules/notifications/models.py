@@ -1,18 +1,44 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.modules.notifications.enums import OutboxStatus
 
 
 class Notification(Base):
+    """
+    Range-partitioned by month of `created_at` (see `app.modules.notifications.partitions`), so the
+    partition key is part of the primary key.
+    """
+
     __tablename__ = "notifications"
     __table_args__ = (
-        Index("ix_notifications_user_id", "user_id"),
-        Index("ix_notifications_is_read", "is_read"),
+        # Keyset listing walks these backwards for ORDER BY created_at DESC, id DESC.
+        Index("ix_notifications_user_created", "user_id", "created_at", "id"),
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_read = false"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -24,10 +50,83 @@ class Notification(Base):
     )
 
     type: Mapped[str] = mapped_column(String(50), nullable=False)
-    payload: Mapped[str] = mapped_column(String(2000), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
     is_read: Mapped[bool] = mapped_column(default=False, nullable=False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class NotificationReadMarker(Base):
+    """
+    Per-user read watermark: notifications created at or before `read_watermark` count as read
+    regardless of their own `is_read` flag, which makes "mark all read" a single-row upsert.
+    """
+
+    __tablename__ = "notification_read_markers"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    read_watermark: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class NotificationPreference(Base):
+    """Per-user settings, either global (`org_id` NULL) or for one organization."""
+
+    __tablename__ = "notification_preferences"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "org_id",
+            name="uq_notification_preferences_user_org",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    org_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    muted_project_ids: Mapped[list[uuid.UUID]] = mapped_column(
+        ARRAY(UUID(as_uuid=True)),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'::uuid[]"),
+    )
+    disabled_types: Mapped[list[str]] = mapped_column(
+        ARRAY(String(100)),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'::varchar[]"),
+    )
+    # NULL on an org row inherits the global setting; NULL on the global row means off.
+    digest_only: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
 
 
 class NotificationOutbox(Base):
@@ -35,14 +134,42 @@ class NotificationOutbox(Base):
     __table_args__ = (
         Index("ix_notification_outbox_status_next_retry", "status", "next_retry_at"),
         Index("ix_notification_outbox_created_at", "created_at"),
+        Index(
+            "ix_notification_outbox_sent_at",
+            "sent_at",
+            postgresql_where=text("status = 'SENT'"),
+        ),
+        # Per-shard claim order and backlog; only rows still waiting for delivery are indexed.
+        Index(
+            "ix_notification_outbox_shard_pending",
+            "shard",
+            "created_at",
+            postgresql_where=text("status IN ('PENDING', 'FAILED')"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_type: Mapped[str] = mapped_column(String(100), nullable=False)
     payload: Mapped[str] = mapped_column(Text, nullable=False)
-    status: Mapped[str] = mapped_column(String(20), nullable=False, default="PENDING")
+    shard: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=0, server_default=text("0"))
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default=OutboxStatus.PENDING.value)
     attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
     next_retry_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class NotificationOutboxLog(Base):
+    """Compact record of a delivered outbox row, kept after the row leaves the hot table."""
+
+    __tablename__ = "notification_outbox_log"
+    __table_args__ = (
+        Index("ix_notification_outbox_log_sent_at", "sent_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
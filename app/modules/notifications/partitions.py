@@ -0,0 +1,62 @@
+"""
+Monthly range partitions of `notifications`.
+
+Partitions are named `notifications_pYYYYMM` and cover one UTC calendar month of `created_at`.
+There is deliberately no DEFAULT partition: with non-overlapping ranges only, Postgres can walk
+the partitions in order for `ORDER BY created_at DESC ... LIMIT` and stop at the first page, so
+partitions must be created ahead of time (see `NotificationService.maintain_partitions_async`).
+"""
+import re
+from datetime import date, datetime, timezone
+
+
+PARENT_TABLE = "notifications"
+
+_NAME_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(value: datetime | date) -> date:
+    if isinstance(value, datetime):
+        value = value.astimezone(timezone.utc).date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + (month.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """The month a partition covers, or None for tables not following the naming scheme."""
+    match = _NAME_RE.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_bounds(month: date) -> tuple[datetime, datetime]:
+    """[start, end) of the month in UTC, as used in FOR VALUES FROM ... TO ..."""
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end_month = add_months(month, 1)
+    return start, datetime(end_month.year, end_month.month, 1, tzinfo=timezone.utc)
+
+
+def months_ahead(now: datetime, ahead: int) -> list[date]:
+    """The current month and the `ahead` months after it."""
+    current = month_start(now)
+    return [add_months(current, offset) for offset in range(ahead + 1)]
+
+
+def partitions_older_than(names: list[str], now: datetime, months: int) -> list[str]:
+    """Partitions whose whole range ends at or before the start of the month `months` back."""
+    cutoff = add_months(month_start(now), -months)
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
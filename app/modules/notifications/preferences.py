@@ -0,0 +1,84 @@
+"""
+Per-user notification preferences.
+
+A user has at most one global row (`org_id` NULL) and one row per organization. The org row
+adds to the global one: disabled types and muted projects are combined, and `digest_only` on
+the org row, unless it is None, overrides the global setting for notifications from that org.
+"""
+import uuid
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+
+# Notifications that are themselves digests are never deferred again.
+DIGEST_NOTIFICATION_TYPES = {"NOTIFICATION_DIGEST"}
+
+
+def preferences_key(user_id: str) -> str:
+    return f"notif_prefs:{user_id}"
+
+
+class Delivery(StrEnum):
+    DELIVER = "deliver"
+    DIGEST = "digest"
+    DROP = "drop"
+
+
+@dataclass(slots=True)
+class _Scope:
+    disabled_types: set[str] = field(default_factory=set)
+    muted_project_ids: set[str] = field(default_factory=set)
+    digest_only: bool | None = None
+
+
+class UserPreferences:
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self._global = _Scope()
+        self._orgs: dict[str, _Scope] = {}
+        for row in rows:
+            scope = _Scope(
+                disabled_types=set(row.get("disabled_types") or []),
+                muted_project_ids={str(p) for p in row.get("muted_project_ids") or []},
+                digest_only=row.get("digest_only"),
+            )
+            if row.get("org_id"):
+                self._orgs[str(row["org_id"])] = scope
+            else:
+                self._global = scope
+
+    def decide(self, notification_type: str, payload: dict[str, Any]) -> Delivery:
+        org_id = payload.get("org_id")
+        project_id = payload.get("project_id")
+        org = self._orgs.get(str(org_id)) if org_id else None
+
+        disabled = self._global.disabled_types | (org.disabled_types if org else set())
+        if notification_type in disabled:
+            return Delivery.DROP
+
+        muted = self._global.muted_project_ids | (org.muted_project_ids if org else set())
+        if project_id and str(project_id) in muted:
+            return Delivery.DROP
+
+        if notification_type in DIGEST_NOTIFICATION_TYPES:
+            return Delivery.DELIVER
+        digest_only = self._global.digest_only
+        if org is not None and org.digest_only is not None:
+            digest_only = org.digest_only
+        return Delivery.DIGEST if digest_only else Delivery.DELIVER
+
+
+def preference_row(
+    *,
+    org_id: uuid.UUID | None,
+    muted_project_ids: list[uuid.UUID],
+    disabled_types: list[str],
+    digest_only: bool | None,
+) -> dict[str, Any]:
+    """JSON-safe form of a preference row, as cached in Redis."""
+    return {
+        "org_id": str(org_id) if org_id else None,
+        "muted_project_ids": [str(p) for p in muted_project_ids],
+        "disabled_types": list(disabled_types),
+        "digest_only": digest_only,
+    }
@@ -1,14 +1,151 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Any, cast
 
-from sqlalchemy import func, or_, select, update
-from sqlalchemy.engine import CursorResult
+from sqlalchemy import (
+    ColumnElement,
+    Text,
+    and_,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    not_,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import CursorResult, Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.modules.notifications.models import Notification, NotificationOutbox
+from app.core.config import settings
+from app.core.metrics import instrument_repository
+from app.modules.notifications.enums import OutboxStatus
+from app.modules.notifications.models import (
+    Notification,
+    NotificationOutbox,
+    NotificationPreference,
+    NotificationReadMarker,
+)
+from app.modules.notifications.partitions import PARENT_TABLE, partition_bounds, partition_month, partition_name
 
 
+_MARK_OUTBOX_FAILED_SQL = text(
+    """
+    UPDATE notification_outbox AS o
+    SET attempts = o.attempts + 1,
+        status = CASE WHEN o.attempts + 1 >= :max_attempts THEN :dead ELSE :failed END,
+        last_error = f.error,
+        next_retry_at = CASE
+            WHEN o.attempts + 1 >= :max_attempts THEN NULL
+            ELSE CAST(:now AS timestamptz) + make_interval(secs => least(300, power(2, least(o.attempts + 1, 8))))
+        END
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:errors AS text[])) AS f(id, error)
+    WHERE o.id = f.id
+    RETURNING o.id, o.event_type, o.status
+    """
+).bindparams(
+    bindparam("ids", type_=ARRAY(UUID(as_uuid=True))),
+    bindparam("errors", type_=ARRAY(Text())),
+)
+
+_MOVE_SENT_TO_LOG_SQL = text(
+    """
+    WITH moved AS (
+        DELETE FROM notification_outbox
+        WHERE id IN (
+            SELECT id FROM notification_outbox
+            WHERE status = :sent AND sent_at < :cutoff
+            ORDER BY sent_at
+            LIMIT :limit
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, event_type, attempts, created_at, sent_at
+    )
+    INSERT INTO notification_outbox_log (id, event_type, attempts, created_at, sent_at)
+    SELECT id, event_type, attempts, created_at, sent_at FROM moved
+    ON CONFLICT (id) DO NOTHING
+    """
+)
+
+_PURGE_OUTBOX_LOG_SQL = text(
+    """
+    DELETE FROM notification_outbox_log
+    WHERE id IN (
+        SELECT id FROM notification_outbox_log
+        WHERE sent_at < :cutoff
+        LIMIT :limit
+    )
+    """
+)
+
+_OUTBOX_TABLE_STATS_SQL = text(
+    """
+    SELECT relname,
+           pg_total_relation_size(relid) AS total_bytes,
+           pg_relation_size(relid) AS table_bytes,
+           n_live_tup,
+           n_dead_tup
+    FROM pg_stat_user_tables
+    WHERE relname IN ('notification_outbox', 'notification_outbox_log')
+    """
+)
+
+_LIST_PARTITIONS_SQL = text(
+    """
+    SELECT c.relname
+    FROM pg_inherits AS i
+    JOIN pg_class AS c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST(:parent AS regclass)
+    ORDER BY c.relname
+    """
+)
+
+_PARTITION_HAS_UNREAD_SQL = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM {partition} AS n
+        LEFT JOIN notification_read_markers AS m ON m.user_id = n.user_id
+        WHERE n.is_read = false
+          AND n.created_at > coalesce(m.read_watermark, '-infinity'::timestamptz)
+    )
+"""
+
+
+def _partition_ident(name: str) -> str:
+    # Partition names are interpolated into DDL, so only names of the monthly scheme are accepted.
+    if partition_month(name) is None:
+        raise ValueError(f"Not a notifications partition: {name}")
+    return name
+
+
+_PENDING_STATUSES = NotificationOutbox.status.in_((OutboxStatus.PENDING.value, OutboxStatus.FAILED.value))
+
+
+def _read_watermark(user_id: Any) -> ColumnElement[datetime]:
+    """The user's read watermark, or -infinity when they never marked all as read."""
+    marker = (
+        select(NotificationReadMarker.read_watermark)
+        .where(NotificationReadMarker.user_id == user_id)
+        .scalar_subquery()
+    )
+    return func.coalesce(marker, literal_column("'-infinity'::timestamptz"))
+
+
+def _effectively_unread(watermark: ColumnElement[datetime]) -> ColumnElement[bool]:
+    # Unread rows live in the partial (is_read = false) index; the watermark bounds the range scan.
+    return and_(Notification.is_read.is_(False), Notification.created_at > watermark)
+
+
+@instrument_repository
 class NotificationRepository:
     async def list_for_user(
         self,
@@ -17,19 +154,44 @@ class NotificationRepository:
         user_id: uuid.UUID,
         is_read: bool | None,
         limit: int,
-        offset: int,
-    ) -> tuple[list[Notification], int]:
-        stmt = select(Notification).where(Notification.user_id == user_id)
-        if is_read is not None:
-            stmt = stmt.where(Notification.is_read == is_read)
+        after: tuple[datetime, uuid.UUID] | None,
+    ) -> tuple[list[Row[Any]], bool]:
+        """
+        Returns one keyset page, newest first, plus whether more rows follow.
 
-        total_stmt = select(func.count()).select_from(stmt.subquery())
-        total = int((await db.execute(total_stmt)).scalar_one())
+        Each row carries `created_at`/`id` for the next cursor and `json`, the notification
+        already serialized by Postgres, so the JSONB payload is never decoded in Python.
+
+        `after` is the (created_at, id) of the last row of the previous page. The row-value
+        comparison lets Postgres seek straight into the (user_id, created_at, id) index, so page
+        cost does not grow with how deep the client has scrolled.
+        """
+        watermark = _read_watermark(user_id)
+        unread = _effectively_unread(watermark)
+        item_json = func.json_build_object(
+            "id", Notification.id,
+            "type", Notification.type,
+            "payload", Notification.payload,
+            "is_read", not_(unread),
+            "created_at", Notification.created_at,
+        )
+        stmt = select(
+            Notification.created_at,
+            Notification.id,
+            item_json.cast(Text).label("json"),
+        ).where(Notification.user_id == user_id)
+        if is_read is True:
+            stmt = stmt.where(or_(Notification.is_read.is_(True), Notification.created_at <= watermark))
+        elif is_read is False:
+            stmt = stmt.where(unread)
+        if after is not None:
+            stmt = stmt.where(tuple_(Notification.created_at, Notification.id) < tuple_(*after))
 
         rows = await db.execute(
-            stmt.order_by(Notification.created_at.desc()).limit(limit).offset(offset)
+            stmt.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
         )
-        return list(rows.scalars().all()), total
+        items = list(rows.all())
+        return items[:limit], len(items) > limit
 
     async def get_for_user(
         self,
@@ -38,6 +200,8 @@ class NotificationRepository:
         notification_id: uuid.UUID,
         user_id: uuid.UUID,
     ) -> Notification | None:
+        # Lookup by id alone cannot prune; it probes the (id, created_at) primary key of every
+        # partition, whose number retention keeps bounded.
         rows = await db.execute(
             select(Notification).where(
                 Notification.id == notification_id,
@@ -46,56 +210,400 @@ class NotificationRepository:
         )
         return rows.scalar_one_or_none()
 
-    async def mark_read(self, db: AsyncSession, notification: Notification) -> Notification:
-        notification.is_read = True
-        db.add(notification)
-        await db.flush()
-        return notification
-
-    async def mark_all_read(self, db: AsyncSession, *, user_id: uuid.UUID) -> int:
+    async def mark_read(self, db: AsyncSession, notification: Notification) -> bool:
+        """
+        Marks the notification read. Returns False if it already counted as read, either because a
+        concurrent request flipped the flag or because it sits below the user's read watermark.
+        """
         res = cast(
             CursorResult[Any],
             await db.execute(
                 update(Notification)
-                .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+                .where(
+                    Notification.id == notification.id,
+                    # Pins the update to the notification's own partition.
+                    Notification.created_at == notification.created_at,
+                    _effectively_unread(_read_watermark(notification.user_id)),
+                )
                 .values(is_read=True)
+                .execution_options(synchronize_session=False)
             ),
         )
-        return res.rowcount or 0
+        set_committed_value(notification, "is_read", True)
+        return bool(res.rowcount)
+
+    async def mark_all_read(self, db: AsyncSession, *, user_id: uuid.UUID) -> int:
+        """
+        Advances the user's read watermark to their newest unread notification with a single-row
+        upsert, and returns how many notifications that marked read.
+
+        The watermark and the count come from the same statement snapshot. Notifications are
+        stamped with their inserting transaction's start time, so one committed after this
+        statement by a transaction that started earlier can fall at or below the watermark: it
+        is then treated as read without having been counted. Later inserts stay unread.
+        """
+        unread = (
+            select(
+                func.max(Notification.created_at).label("newest"),
+                func.count().label("count"),
+            )
+            .where(Notification.user_id == user_id, _effectively_unread(_read_watermark(user_id)))
+            .cte("unread")
+        )
+        stmt = pg_insert(NotificationReadMarker).from_select(
+            ["user_id", "read_watermark"],
+            select(literal(user_id, UUID(as_uuid=True)), unread.c.newest).where(unread.c.newest.is_not(None)),
+        )
+        upsert = stmt.on_conflict_do_update(
+            index_elements=[NotificationReadMarker.user_id],
+            set_={
+                "read_watermark": func.greatest(
+                    NotificationReadMarker.read_watermark,
+                    stmt.excluded.read_watermark,
+                ),
+                "updated_at": func.now(),
+            },
+        ).cte("marked")
+        res = await db.execute(select(unread.c.count).add_cte(upsert))
+        return int(res.scalar_one())
 
     async def count_unread(self, db: AsyncSession, *, user_id: uuid.UUID) -> int:
         res = await db.execute(
             select(func.count()).select_from(Notification).where(
                 Notification.user_id == user_id,
-                Notification.is_read.is_(False),
+                _effectively_unread(_read_watermark(user_id)),
             )
         )
         return int(res.scalar_one())
 
-    async def enqueue_outbox(self, db: AsyncSession, *, event_type: str, payload: str) -> NotificationOutbox:
-        row = NotificationOutbox(event_type=event_type, payload=payload, status="PENDING", attempts=0)
+    async def count_unread_for_users(self, db: AsyncSession, user_ids: list[uuid.UUID]) -> dict[uuid.UUID, int]:
+        if not user_ids:
+            return {}
+        rows = await db.execute(
+            select(Notification.user_id, func.count())
+            .where(
+                Notification.user_id.in_(user_ids),
+                _effectively_unread(_read_watermark(Notification.user_id)),
+            )
+            .group_by(Notification.user_id)
+        )
+        counts = {user_id: 0 for user_id in user_ids}
+        counts.update({user_id: int(count) for user_id, count in rows.all()})
+        return counts
+
+    async def list_notification_partitions(self, db: AsyncSession) -> list[str]:
+        rows = await db.execute(_LIST_PARTITIONS_SQL, {"parent": PARENT_TABLE})
+        return list(rows.scalars().all())
+
+    async def create_notification_partition(self, db: AsyncSession, month: date) -> None:
+        start, end = partition_bounds(month)
+        # Bounds come from `partition_bounds`, never from input; DDL cannot take bind parameters.
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+
+    async def partition_has_unread(self, db: AsyncSession, name: str) -> bool:
+        """Whether any row of the partition still counts as unread for its recipient."""
+        res = await db.execute(text(_PARTITION_HAS_UNREAD_SQL.format(partition=_partition_ident(name))))
+        return bool(res.scalar_one())
+
+    async def drop_notification_partition(self, db: AsyncSession, name: str) -> None:
+        partition = _partition_ident(name)
+        # Detach first so the parent is locked only for the catalog change, not the file removal.
+        await db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition}"))
+        await db.execute(text(f"DROP TABLE {partition}"))
+
+    async def list_preferences(self, db: AsyncSession, user_ids: list[uuid.UUID]) -> list[NotificationPreference]:
+        if not user_ids:
+            return []
+        rows = await db.execute(
+            select(NotificationPreference).where(
+                NotificationPreference.user_id == any_(bindparam("user_ids", user_ids, type_=ARRAY(UUID(as_uuid=True))))
+            )
+        )
+        return list(rows.scalars().all())
+
+    async def upsert_preference(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        org_id: uuid.UUID | None,
+        muted_project_ids: list[uuid.UUID],
+        disabled_types: list[str],
+        digest_only: bool | None,
+    ) -> None:
+        values = {
+            "muted_project_ids": muted_project_ids,
+            "disabled_types": disabled_types,
+            "digest_only": digest_only,
+        }
+        stmt = pg_insert(NotificationPreference).values(id=uuid.uuid4(), user_id=user_id, org_id=org_id, **values)
+        await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_notification_preferences_user_org",
+                set_={**values, "updated_at": func.now()},
+            )
+        )
+
+    async def delete_preference(self, db: AsyncSession, *, user_id: uuid.UUID, org_id: uuid.UUID | None) -> int:
+        org_filter = (
+            NotificationPreference.org_id.is_(None) if org_id is None else NotificationPreference.org_id == org_id
+        )
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                delete(NotificationPreference).where(NotificationPreference.user_id == user_id, org_filter)
+            ),
+        )
+        return res.rowcount or 0
+
+    async def enqueue_outbox(
+        self,
+        db: AsyncSession,
+        *,
+        event_type: str,
+        payload: str,
+        shard: int = 0,
+        available_at: datetime | None = None,
+    ) -> NotificationOutbox:
+        """`available_at` holds the row back from claims until then (stored as `next_retry_at`)."""
+        row = NotificationOutbox(
+            event_type=event_type,
+            payload=payload,
+            shard=shard,
+            status=OutboxStatus.PENDING.value,
+            attempts=0,
+            next_retry_at=available_at,
+        )
         db.add(row)
         await db.flush()
+        # Delivered on commit; wakes the dispatcher that owns the shard (an empty payload wakes all).
+        await db.execute(select(func.pg_notify(settings.outbox_notify_channel, str(shard))))
         return row
 
-    async def claim_outbox_batch(self, db: AsyncSession, *, limit: int) -> list[NotificationOutbox]:
+    async def claim_outbox_batch(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int,
+        shards: list[int] | None = None,
+    ) -> list[NotificationOutbox]:
         now = datetime.now(timezone.utc)
+        stmt = select(NotificationOutbox).where(
+            _PENDING_STATUSES,
+            or_(
+                NotificationOutbox.next_retry_at.is_(None),
+                NotificationOutbox.next_retry_at <= now,
+            ),
+        )
+        if shards is not None:
+            stmt = stmt.where(NotificationOutbox.shard.in_(shards))
         rows = await db.execute(
-            select(NotificationOutbox)
-            .where(
-                NotificationOutbox.status.in_(("PENDING", "FAILED")),
-                or_(
-                    NotificationOutbox.next_retry_at.is_(None),
-                    NotificationOutbox.next_retry_at <= now,
-                ),
-            )
-            .order_by(NotificationOutbox.created_at.asc())
+            stmt.order_by(NotificationOutbox.created_at.asc())
             .limit(limit)
             .with_for_update(skip_locked=True)
         )
         return list(rows.scalars().all())
 
-    async def save_outbox_row(self, db: AsyncSession, row: NotificationOutbox) -> NotificationOutbox:
-        db.add(row)
-        await db.flush()
-        return row
+    async def next_outbox_retry_at(self, db: AsyncSession, *, shards: list[int] | None = None) -> datetime | None:
+        stmt = select(func.min(NotificationOutbox.next_retry_at)).where(
+            _PENDING_STATUSES,
+            NotificationOutbox.next_retry_at.is_not(None),
+        )
+        if shards is not None:
+            stmt = stmt.where(NotificationOutbox.shard.in_(shards))
+        res = await db.execute(stmt)
+        return res.scalar_one_or_none()
+
+    async def bulk_insert_notifications(self, db: AsyncSession, rows: list[dict]) -> int:
+        """Inserts `rows` and fills in each row's stored `created_at`."""
+        if not rows:
+            return 0
+        res = await db.execute(
+            insert(Notification).values(rows).returning(Notification.id, Notification.created_at)
+        )
+        created_at = dict(res.tuples().all())
+        for row in rows:
+            row["created_at"] = created_at[row["id"]]
+        return len(rows)
+
+    async def mark_outbox_sent(self, db: AsyncSession, *, ids: list[uuid.UUID], sent_at: datetime) -> int:
+        if not ids:
+            return 0
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == any_(bindparam("ids", ids, type_=ARRAY(UUID(as_uuid=True)))))
+                .values(status=OutboxStatus.SENT.value, sent_at=sent_at, last_error=None, next_retry_at=None)
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        return res.rowcount or 0
+
+    async def mark_outbox_failed(
+        self,
+        db: AsyncSession,
+        *,
+        errors: dict[uuid.UUID, str],
+        now: datetime,
+        max_attempts: int,
+    ) -> list[tuple[uuid.UUID, str]]:
+        """
+        Records a failed attempt for every row in `errors` and schedules its retry with capped backoff.
+
+        Rows that reach `max_attempts` are moved to DEAD instead; their (id, event_type) pairs are returned.
+        """
+        if not errors:
+            return []
+        rows = await db.execute(
+            _MARK_OUTBOX_FAILED_SQL,
+            {
+                "ids": list(errors.keys()),
+                "errors": [err[:1000] for err in errors.values()],
+                "failed": OutboxStatus.FAILED.value,
+                "dead": OutboxStatus.DEAD.value,
+                "max_attempts": max_attempts,
+                "now": now,
+            },
+        )
+        return [(row.id, row.event_type) for row in rows if row.status == OutboxStatus.DEAD.value]
+
+    async def move_sent_outbox_to_log(self, db: AsyncSession, *, cutoff: datetime, limit: int) -> int:
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                _MOVE_SENT_TO_LOG_SQL,
+                {"sent": OutboxStatus.SENT.value, "cutoff": cutoff, "limit": limit},
+            ),
+        )
+        return res.rowcount or 0
+
+    async def purge_outbox_log(self, db: AsyncSession, *, cutoff: datetime, limit: int) -> int:
+        res = cast(
+            CursorResult[Any],
+            await db.execute(_PURGE_OUTBOX_LOG_SQL, {"cutoff": cutoff, "limit": limit}),
+        )
+        return res.rowcount or 0
+
+    async def outbox_table_stats(self, db: AsyncSession) -> dict[str, dict[str, int]]:
+        rows = await db.execute(_OUTBOX_TABLE_STATS_SQL)
+        return {
+            row.relname: {
+                "total_bytes": int(row.total_bytes),
+                "table_bytes": int(row.table_bytes),
+                "live_tuples": int(row.n_live_tup),
+                "dead_tuples": int(row.n_dead_tup),
+            }
+            for row in rows
+        }
+
+    async def outbox_status_counts(self, db: AsyncSession) -> dict[str, int]:
+        rows = await db.execute(
+            select(NotificationOutbox.status, func.count()).group_by(NotificationOutbox.status)
+        )
+        return {status: int(count) for status, count in rows.all()}
+
+    async def oldest_pending_outbox_at(self, db: AsyncSession) -> datetime | None:
+        res = await db.execute(select(func.min(NotificationOutbox.created_at)).where(_PENDING_STATUSES))
+        return res.scalar_one_or_none()
+
+    async def outbox_shard_stats(self, db: AsyncSession, *, window_start: datetime) -> list[Row]:
+        """Per shard: rows awaiting delivery, the oldest of them, and rows delivered since `window_start`."""
+        sent_recently = and_(
+            NotificationOutbox.status == OutboxStatus.SENT.value,
+            NotificationOutbox.sent_at >= window_start,
+        )
+        rows = await db.execute(
+            select(
+                NotificationOutbox.shard,
+                func.count().filter(_PENDING_STATUSES).label("backlog"),
+                func.min(NotificationOutbox.created_at).filter(_PENDING_STATUSES).label("oldest_pending_at"),
+                func.count().filter(sent_recently).label("sent"),
+            )
+            .where(or_(_PENDING_STATUSES, sent_recently))
+            .group_by(NotificationOutbox.shard)
+            .order_by(NotificationOutbox.shard)
+        )
+        return list(rows.all())
+
+    def _dead_rows_filter(self, *, ids: list[uuid.UUID] | None, event_type: str | None) -> list:
+        conditions: list = [NotificationOutbox.status == OutboxStatus.DEAD.value]
+        if ids:
+            conditions.append(NotificationOutbox.id.in_(ids))
+        if event_type:
+            conditions.append(NotificationOutbox.event_type == event_type)
+        return conditions
+
+    async def list_dead(
+        self,
+        db: AsyncSession,
+        *,
+        event_type: str | None,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[NotificationOutbox], int]:
+        stmt = select(NotificationOutbox).where(*self._dead_rows_filter(ids=None, event_type=event_type))
+
+        total_stmt = select(func.count()).select_from(stmt.subquery())
+        total = int((await db.execute(total_stmt)).scalar_one())
+
+        rows = await db.execute(
+            stmt.order_by(NotificationOutbox.created_at.asc()).limit(limit).offset(offset)
+        )
+        return list(rows.scalars().all()), total
+
+    async def replay_dead(
+        self,
+        db: AsyncSession,
+        *,
+        ids: list[uuid.UUID] | None,
+        event_type: str | None,
+    ) -> int:
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                update(NotificationOutbox)
+                .where(*self._dead_rows_filter(ids=ids, event_type=event_type))
+                .values(
+                    status=OutboxStatus.PENDING.value,
+                    attempts=0,
+                    next_retry_at=None,
+                    last_error=None,
+                )
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        replayed = res.rowcount or 0
+        if replayed:
+            await db.execute(select(func.pg_notify(settings.outbox_notify_channel, "")))
+        return replayed
+
+    async def purge_dead(
+        self,
+        db: AsyncSession,
+        *,
+        ids: list[uuid.UUID] | None,
+        event_type: str | None,
+    ) -> int:
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                delete(NotificationOutbox)
+                .where(*self._dead_rows_filter(ids=ids, event_type=event_type))
+                .execution_options(synchronize_session=False)
+            ),
+        )
+        return res.rowcount or 0
+
+    async def dead_counts_by_event_type(self, db: AsyncSession) -> dict[str, int]:
+        rows = await db.execute(
+            select(NotificationOutbox.event_type, func.count())
+            .where(NotificationOutbox.status == OutboxStatus.DEAD.value)
+            .group_by(NotificationOutbox.event_type)
+        )
+        return {event_type: int(count) for event_type, count in rows.all()}
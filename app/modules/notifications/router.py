@@ -1,63 +1,71 @@
 import json
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db_session
-from app.modules.auth.deps import get_current_user
-from app.modules.notifications.models import Notification
+from app.db.session import get_db_session, get_read_db_session
+from app.modules.auth.deps import get_current_reader, get_current_superuser, get_current_user
+from app.modules.notifications.models import Notification, NotificationPreference
 from app.modules.notifications.schemas import (
     NotificationListResponse,
     NotificationMarkAllReadResponse,
+    NotificationPreferenceListResponse,
+    NotificationPreferenceRequest,
+    NotificationPreferenceResponse,
     NotificationResponse,
     NotificationUnreadCountResponse,
+    OutboxDeadActionResponse,
+    OutboxDeadListResponse,
+    OutboxDeadRowResponse,
+    OutboxDeadSelectRequest,
+    OutboxStatsResponse,
 )
-from app.modules.notifications.service import NotificationService
+from app.modules.notifications.service import NotificationService, redact_outbox_payload
+from app.modules.notifications.stream import event_stream
 from app.modules.users.models import User
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
+admin_router = APIRouter(prefix="/admin/notifications", tags=["notifications-admin"])
 service = NotificationService()
 
 
 def _to_response(notification: Notification) -> NotificationResponse:
-    try:
-        payload = json.loads(notification.payload)
-    except json.JSONDecodeError:
-        payload = {"raw": notification.payload}
-    if not isinstance(payload, dict):
-        payload = {"value": payload}
-
     return NotificationResponse(
         id=notification.id,
         type=notification.type,
-        payload=payload,
+        payload=notification.payload,
         is_read=notification.is_read,
         created_at=notification.created_at,
     )
 
 
+def _list_response(items: list[str], *, limit: int, next_cursor: str | None) -> Response:
+    # Items arrive as JSON text built by Postgres; splice them in instead of decoding and re-encoding.
+    body = (
+        '{"items":[' + ",".join(items) + "]"
+        + f',"limit":{limit},"next_cursor":{json.dumps(next_cursor)}}}'
+    )
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("", response_model=NotificationListResponse)
 async def list_notifications(
     is_read: bool | None = Query(default=None),
     limit: int = Query(default=20, ge=1, le=100),
-    offset: int = Query(default=0, ge=0),
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
-) -> NotificationListResponse:
-    items, total = await service.list_notifications(
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
+) -> Response:
+    items, next_cursor = await service.list_notifications(
         db,
         user_id=user.id,
         is_read=is_read,
         limit=limit,
-        offset=offset,
-    )
-    return NotificationListResponse(
-        items=[_to_response(item) for item in items],
-        limit=limit,
-        offset=offset,
-        total=total,
+        cursor=cursor,
     )
+    return _list_response(items, limit=limit, next_cursor=next_cursor)
 
 
 @router.patch("/{notification_id}/read", response_model=NotificationResponse)
@@ -81,8 +89,140 @@ async def mark_all_notifications_read(
 
 @router.get("/unread-count", response_model=NotificationUnreadCountResponse)
 async def unread_notifications_count(
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> NotificationUnreadCountResponse:
     unread = await service.unread_count(db, user_id=user.id)
     return NotificationUnreadCountResponse(unread=unread)
+
+
+def _preferences_response(prefs: list[NotificationPreference]) -> NotificationPreferenceListResponse:
+    return NotificationPreferenceListResponse(
+        items=[
+            NotificationPreferenceResponse(
+                org_id=pref.org_id,
+                muted_project_ids=list(pref.muted_project_ids),
+                disabled_types=list(pref.disabled_types),
+                digest_only=pref.digest_only,
+            )
+            for pref in prefs
+        ]
+    )
+
+
+@router.get("/preferences", response_model=NotificationPreferenceListResponse)
+async def list_notification_preferences(
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
+) -> NotificationPreferenceListResponse:
+    prefs = await service.list_preferences(db, user_id=user.id)
+    return _preferences_response(prefs)
+
+
+@router.put("/preferences", response_model=NotificationPreferenceListResponse)
+async def set_notification_preferences(
+    payload: NotificationPreferenceRequest,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> NotificationPreferenceListResponse:
+    prefs = await service.set_preferences(
+        db,
+        user_id=user.id,
+        org_id=payload.org_id,
+        muted_project_ids=payload.muted_project_ids,
+        disabled_types=payload.disabled_types,
+        digest_only=payload.digest_only,
+    )
+    return _preferences_response(prefs)
+
+
+@router.delete("/preferences")
+async def reset_notification_preferences(
+    org_id: UUID | None = Query(default=None),
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> dict:
+    await service.reset_preferences(db, user_id=user.id, org_id=org_id)
+    return {"status": "ok"}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
+) -> StreamingResponse:
+    """Server-sent events: `notification` for each new notification, `reset` when the client must refetch."""
+    # Authentication is done; don't hold a pooled connection for the lifetime of the stream.
+    await db.close()
+    return StreamingResponse(
+        event_stream(str(user.id), last_event_id=last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@admin_router.get("/outbox/stats", response_model=OutboxStatsResponse)
+async def outbox_stats(
+    db: AsyncSession = Depends(get_db_session),
+    _: User = Depends(get_current_superuser),
+) -> OutboxStatsResponse:
+    stats = await service.outbox_stats(db)
+    return OutboxStatsResponse(**stats)
+
+
+@admin_router.get("/outbox/dead", response_model=OutboxDeadListResponse)
+async def list_dead_outbox(
+    event_type: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_db_session),
+    _: User = Depends(get_current_superuser),
+) -> OutboxDeadListResponse:
+    rows, total = await service.list_dead_outbox(db, event_type=event_type, limit=limit, offset=offset)
+    return OutboxDeadListResponse(
+        items=[
+            OutboxDeadRowResponse(
+                id=row.id,
+                event_type=row.event_type,
+                payload=redact_outbox_payload(row.payload),
+                attempts=row.attempts,
+                last_error=row.last_error,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        limit=limit,
+        offset=offset,
+        total=total,
+    )
+
+
+@admin_router.post("/outbox/dead/replay", response_model=OutboxDeadActionResponse)
+async def replay_dead_outbox(
+    payload: OutboxDeadSelectRequest,
+    db: AsyncSession = Depends(get_db_session),
+    _: User = Depends(get_current_superuser),
+) -> OutboxDeadActionResponse:
+    replayed = await service.replay_dead_outbox(
+        db,
+        ids=payload.ids,
+        event_type=payload.event_type,
+        all_rows=payload.all,
+    )
+    return OutboxDeadActionResponse(affected=replayed)
+
+
+@admin_router.post("/outbox/dead/purge", response_model=OutboxDeadActionResponse)
+async def purge_dead_outbox(
+    payload: OutboxDeadSelectRequest,
+    db: AsyncSession = Depends(get_db_session),
+    _: User = Depends(get_current_superuser),
+) -> OutboxDeadActionResponse:
+    purged = await service.purge_dead_outbox(
+        db,
+        ids=payload.ids,
+        event_type=payload.event_type,
+        all_rows=payload.all,
+    )
+    return OutboxDeadActionResponse(affected=purged)
@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class NotificationResponse(BaseModel):
@@ -15,8 +16,7 @@ class NotificationResponse(BaseModel):
 class NotificationListResponse(BaseModel):
     items: list[NotificationResponse]
     limit: int
-    offset: int
-    total: int
+    next_cursor: str | None = None
 
 
 class NotificationMarkAllReadResponse(BaseModel):
@@ -25,3 +25,70 @@ class NotificationMarkAllReadResponse(BaseModel):
 
 class NotificationUnreadCountResponse(BaseModel):
     unread: int
+
+
+class NotificationPreferenceRequest(BaseModel):
+    org_id: UUID | None = Field(default=None, description="Omit for the global preferences")
+    muted_project_ids: list[UUID] = Field(default_factory=list, max_length=500)
+    disabled_types: list[Annotated[str, Field(max_length=100)]] = Field(default_factory=list, max_length=50)
+    digest_only: bool | None = Field(default=None, description="Omit to inherit the global setting")
+
+
+class NotificationPreferenceResponse(BaseModel):
+    org_id: UUID | None
+    muted_project_ids: list[UUID]
+    disabled_types: list[str]
+    digest_only: bool | None
+
+
+class NotificationPreferenceListResponse(BaseModel):
+    items: list[NotificationPreferenceResponse]
+
+
+class OutboxTableStats(BaseModel):
+    total_bytes: int
+    table_bytes: int
+    live_tuples: int
+    dead_tuples: int
+
+
+class OutboxShardStats(BaseModel):
+    shard: int
+    backlog: int
+    oldest_pending_age_seconds: float | None
+    sent_in_window: int
+    dispatch_rate_per_second: float
+    owner: str | None
+
+
+class OutboxStatsResponse(BaseModel):
+    tables: dict[str, OutboxTableStats]
+    status_counts: dict[str, int]
+    dead_by_event_type: dict[str, int]
+    shards: list[OutboxShardStats]
+
+
+class OutboxDeadRowResponse(BaseModel):
+    id: UUID
+    event_type: str
+    payload: str
+    attempts: int
+    last_error: str | None
+    created_at: datetime
+
+
+class OutboxDeadListResponse(BaseModel):
+    items: list[OutboxDeadRowResponse]
+    limit: int
+    offset: int
+    total: int
+
+
+class OutboxDeadSelectRequest(BaseModel):
+    ids: list[UUID] | None = Field(default=None, max_length=1000)
+    event_type: str | None = None
+    all: bool = False
+
+
+class OutboxDeadActionResponse(BaseModel):
+    affected: int
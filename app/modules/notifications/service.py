@@ -1,19 +1,97 @@
 import asyncio
 import json
+import logging
 import uuid
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.db.session import AsyncSessionLocal
-from app.modules.notifications.models import Notification, NotificationOutbox
+from app.core.config import settings
+from app.core.metrics import OUTBOX_OLDEST_PENDING_AGE, OUTBOX_ROWS
+from app.core.tracing import start_span, trace_service
+from app.db.session import AsyncSessionLocal, is_replica_session
+from app.infra.celery_app import celery_app
+from app.infra.redis import (
+    redis_decr_existing,
+    redis_del,
+    redis_get_int,
+    redis_get_json_many,
+    redis_incr_existing,
+    redis_scan_keys,
+    redis_set_existing_ints,
+    redis_set_int,
+    redis_set_json_many,
+)
+from app.infra.worker_runtime import worker_runtime
+from app.modules.notifications.counters import (
+    UNREAD_COUNT_KEY_PATTERN,
+    unread_count_key,
+    user_id_from_unread_key,
+)
+from app.modules.notifications.cursor import decode_cursor, encode_cursor
+from app.modules.notifications.emails import AUTH_EMAIL_EVENT_TYPE, EMAIL_EVENT_TYPE, TEMPLATES, TOKEN_PURPOSES
+from app.modules.notifications.enums import OutboxStatus
+from app.modules.notifications.handlers import OutboxEvent, OutboxHandlerRegistry, outbox_handlers
+from app.modules.notifications.models import Notification, NotificationOutbox, NotificationPreference
+from app.modules.notifications.partitions import (
+    months_ahead,
+    partition_month,
+    partition_name,
+    partitions_older_than,
+)
+from app.modules.notifications.preferences import Delivery, UserPreferences, preference_row, preferences_key
 from app.modules.notifications.repository import NotificationRepository
+from app.modules.notifications.sharding import live_dispatchers, outbox_shard, shard_owners
+from app.modules.notifications.stream import publish_notifications
+from app.modules.organizations.repository import OrganizationRepository
 
 
+logger = logging.getLogger(__name__)
+
+
+def _window_end(now: datetime, window: int) -> datetime | None:
+    if window <= 0:
+        return None
+    return datetime.fromtimestamp((int(now.timestamp()) // window + 1) * window, tz=timezone.utc)
+
+
+def coalesce_window_end(now: datetime) -> datetime | None:
+    """
+    End of the coalescing window containing `now`. Windows are aligned to the epoch rather than
+    started per event, so every assignment in a burst becomes claimable at the same instant.
+    """
+    return _window_end(now, settings.notification_coalesce_window_seconds)
+
+
+# Payload keys whose values may grant access (sign-in links, tokens) or are free-form email
+# content; admin listings show them as REDACTED.
+_REDACTED_PAYLOAD_KEYS = {"context", "link", "token", "password"}
+REDACTED = "REDACTED"
+
+
+def redact_outbox_payload(payload: str) -> str:
+    """The payload with sensitive values replaced, for display outside the dispatcher."""
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        return REDACTED
+    if not isinstance(data, dict):
+        return REDACTED
+    return json.dumps({key: REDACTED if key in _REDACTED_PAYLOAD_KEYS else value for key, value in data.items()})
+
+
+@trace_service
 class NotificationService:
-    def __init__(self, repo: NotificationRepository | None = None) -> None:
+    def __init__(
+        self,
+        repo: NotificationRepository | None = None,
+        handlers: OutboxHandlerRegistry | None = None,
+    ) -> None:
         self.repo = repo or NotificationRepository()
+        self.handlers = handlers or outbox_handlers
+        self.org_repo = OrganizationRepository()
 
     async def list_notifications(
         self,
@@ -22,15 +100,25 @@ class NotificationService:
         user_id: uuid.UUID,
         is_read: bool | None,
         limit: int,
-        offset: int,
-    ) -> tuple[list[Notification], int]:
-        return await self.repo.list_for_user(
+        cursor: str | None,
+    ) -> tuple[list[str], str | None]:
+        """Returns the page as pre-serialized JSON objects (see `NotificationRepository.list_for_user`)."""
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        items, has_more = await self.repo.list_for_user(
             db,
             user_id=user_id,
             is_read=is_read,
             limit=limit,
-            offset=offset,
+            after=after,
         )
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if has_more else None
+        return [item.json for item in items], next_cursor
 
     async def mark_read(
         self,
@@ -48,92 +136,607 @@ class NotificationService:
             raise HTTPException(status_code=404, detail="Notification not found")
 
         if not notification.is_read:
-            await self.repo.mark_read(db, notification)
+            changed = await self.repo.mark_read(db, notification)
             await db.commit()
+            if changed:
+                await self._adjust_unread_counter(user_id, -1)
 
         return notification
 
     async def mark_all_read(self, db: AsyncSession, *, user_id: uuid.UUID) -> int:
         updated = await self.repo.mark_all_read(db, user_id=user_id)
         await db.commit()
+        try:
+            await redis_set_int(
+                unread_count_key(str(user_id)),
+                0,
+                ttl_seconds=settings.notification_unread_cache_ttl_seconds,
+            )
+        except Exception:
+            logger.exception("Failed to reset unread counter", extra={"user_id": str(user_id)})
         return updated
 
     async def unread_count(self, db: AsyncSession, *, user_id: uuid.UUID) -> int:
-        return await self.repo.count_unread(db, user_id=user_id)
+        key = unread_count_key(str(user_id))
+        try:
+            cached = await redis_get_int(key)
+            if cached is not None:
+                return max(cached, 0)
+        except Exception:
+            logger.exception("Unread counter lookup failed; falling back to database")
+            return await self.repo.count_unread(db, user_id=user_id)
+
+        count = await self.repo.count_unread(db, user_id=user_id)
+        if is_replica_session(db):
+            # A lagging count would stick until the next reconcile; only the primary seeds it.
+            return count
+        try:
+            await redis_set_int(
+                key,
+                count,
+                ttl_seconds=settings.notification_unread_cache_ttl_seconds,
+                only_if_missing=True,
+            )
+        except Exception:
+            logger.exception("Failed to seed unread counter", extra={"user_id": str(user_id)})
+        return count
+
+    async def list_preferences(self, db: AsyncSession, *, user_id: uuid.UUID) -> list[NotificationPreference]:
+        return await self.repo.list_preferences(db, [user_id])
+
+    async def set_preferences(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: uuid.UUID,
+        org_id: uuid.UUID | None,
+        muted_project_ids: list[uuid.UUID],
+        disabled_types: list[str],
+        digest_only: bool | None,
+    ) -> list[NotificationPreference]:
+        if org_id is not None and not await self.org_repo.get_member(db, org_id, user_id):
+            raise HTTPException(status_code=403, detail="Not a member of this organization")
+
+        await self.repo.upsert_preference(
+            db,
+            user_id=user_id,
+            org_id=org_id,
+            muted_project_ids=list(dict.fromkeys(muted_project_ids)),
+            disabled_types=sorted(set(disabled_types)),
+            digest_only=digest_only,
+        )
+        await db.commit()
+        await redis_del(preferences_key(str(user_id)))
+        return await self.repo.list_preferences(db, [user_id])
+
+    async def reset_preferences(self, db: AsyncSession, *, user_id: uuid.UUID, org_id: uuid.UUID | None) -> None:
+        await self.repo.delete_preference(db, user_id=user_id, org_id=org_id)
+        await db.commit()
+        await redis_del(preferences_key(str(user_id)))
+
+    async def _adjust_unread_counter(self, user_id: uuid.UUID, delta: int) -> None:
+        try:
+            if delta < 0:
+                await redis_decr_existing(unread_count_key(str(user_id)), -delta)
+            else:
+                await redis_incr_existing({unread_count_key(str(user_id)): delta})
+        except Exception:
+            logger.exception("Failed to adjust unread counter", extra={"user_id": str(user_id)})
+
+    async def _increment_unread_counters(self, rows: list[dict]) -> None:
+        """Bumps the cached unread count of every recipient; users without a cached count are skipped."""
+        amounts = Counter(unread_count_key(str(row["user_id"])) for row in rows)
+        try:
+            await redis_incr_existing(dict(amounts))
+        except Exception:
+            logger.exception("Failed to increment unread counters", extra={"recipients": len(amounts)})
+
+    async def reconcile_unread_counters_async(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> int:
+        """Rewrites every cached unread counter from the database to repair drift."""
+        repaired = 0
+        async with (session_factory or AsyncSessionLocal)() as db:
+            async for keys in redis_scan_keys(UNREAD_COUNT_KEY_PATTERN):
+                user_ids = [uuid.UUID(user_id_from_unread_key(key)) for key in keys]
+                counts = await self.repo.count_unread_for_users(db, user_ids)
+                await db.rollback()
+                await redis_set_existing_ints(
+                    {unread_count_key(str(user_id)): count for user_id, count in counts.items()},
+                    ttl_seconds=settings.notification_unread_cache_ttl_seconds,
+                )
+                repaired += len(counts)
+        return repaired
 
     async def enqueue_task_assigned(self, db: AsyncSession, event: dict) -> NotificationOutbox:
         return await self.repo.enqueue_outbox(
             db,
             event_type="TASK_ASSIGNED",
             payload=json.dumps(event),
+            shard=outbox_shard(str(event["assigned_to"])),
+            available_at=coalesce_window_end(datetime.now(timezone.utc)),
         )
 
-    async def _create_notification_from_event(
+    async def enqueue_task_event(
         self,
         db: AsyncSession,
         *,
         event_type: str,
         event: dict,
-    ) -> Notification:
-        if event_type != "TASK_ASSIGNED":
-            raise ValueError(f"Unsupported outbox event type: {event_type}")
+        recipients: list[uuid.UUID],
+    ) -> NotificationOutbox | None:
+        """One outbox row per change, however many watchers it fans out to."""
+        if not recipients:
+            return None
+        return await self.repo.enqueue_outbox(
+            db,
+            event_type=event_type,
+            payload=json.dumps({**event, "recipients": [str(user_id) for user_id in recipients]}),
+            shard=outbox_shard(str(event["task_id"])),
+        )
 
-        notif = Notification(
-            user_id=uuid.UUID(event["assigned_to"]),
-            type="TASK_ASSIGNED",
-            payload=json.dumps(event),
+    async def enqueue_email(self, db: AsyncSession, *, to: str, template: str, context: dict) -> NotificationOutbox:
+        if template not in TEMPLATES:
+            raise ValueError(f"Unknown email template: {template}")
+        return await self.repo.enqueue_outbox(
+            db,
+            event_type=EMAIL_EVENT_TYPE,
+            payload=json.dumps({"to": to, "template": template, "context": context}),
+            shard=outbox_shard(to),
+        )
+
+    async def enqueue_auth_email(
+        self,
+        db: AsyncSession,
+        *,
+        purpose: str,
+        user_id: uuid.UUID | None = None,
+        email: str | None = None,
+    ) -> NotificationOutbox:
+        """Queues a verification or reset email by reference; the token is minted at send time."""
+        if purpose not in TOKEN_PURPOSES:
+            raise ValueError(f"Unknown auth email purpose: {purpose}")
+        target = {"user_id": str(user_id)} if user_id is not None else {"email": email}
+        return await self.repo.enqueue_outbox(
+            db,
+            event_type=AUTH_EMAIL_EVENT_TYPE,
+            payload=json.dumps({"purpose": purpose, **target}),
+            shard=outbox_shard(str(user_id) if user_id is not None else str(email)),
         )
-        db.add(notif)
-        await db.flush()
-        return notif
 
-    async def _create_task_assigned_async(self, event: dict) -> None:
-        async with AsyncSessionLocal() as db:
+    async def trigger_outbox_dispatch(self, *, available_at: datetime | None = None, **log_extra: str) -> None:
+        """
+        Asks a Celery worker to dispatch the outbox, right away or once `available_at` has passed.
+        Call after committing the enqueue; a no-op when the standalone dispatcher is relied on instead.
+        """
+        if not settings.outbox_celery_trigger_enabled:
+            return
+        try:
+            # The publish runs in a thread with a copy of this context, so the span's traceparent
+            # is added to the message headers by the before_task_publish hook.
+            with start_span("celery.publish", task="taskflow.dispatch_notifications_outbox"):
+                await asyncio.to_thread(
+                    celery_app.send_task,
+                    "taskflow.dispatch_notifications_outbox",
+                    kwargs={"limit": settings.outbox_dispatch_batch_size},
+                    eta=available_at,
+                )
+        except Exception:
+            logger.exception("Failed to trigger notifications outbox dispatch", extra=log_extra)
+
+    async def next_outbox_retry_at(self, db: AsyncSession, *, shards: list[int] | None = None) -> datetime | None:
+        return await self.repo.next_outbox_retry_at(db, shards=shards)
+
+    async def _handle_events(
+        self,
+        db: AsyncSession,
+        events: list[OutboxEvent],
+    ) -> tuple[dict[uuid.UUID, list[dict]], dict[uuid.UUID, str]]:
+        """Groups events by type and hands each group to its registered handler in one call."""
+        by_type: dict[str, list[OutboxEvent]] = defaultdict(list)
+        for event in events:
+            by_type[event.event_type].append(event)
+
+        drafts: dict[uuid.UUID, list[dict]] = {}
+        errors: dict[uuid.UUID, str] = {}
+        for event_type, group in by_type.items():
+            handler = self.handlers.get(event_type)
+            if handler is None:
+                errors.update({event.id: f"Unsupported outbox event type: {event_type}" for event in group})
+                continue
+            try:
+                # A savepoint keeps a failing handler's SQL from aborting the whole claim transaction.
+                async with db.begin_nested():
+                    result = await handler(db, group)
+            except Exception as exc:
+                logger.exception("Outbox handler failed", extra={"event_type": event_type, "events": len(group)})
+                errors.update({event.id: str(exc) for event in group})
+                continue
+            drafts.update(result.notifications)
+            errors.update(result.errors)
+        return drafts, errors
+
+    async def _create_task_assigned_async(
+        self,
+        event: dict,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        async with (session_factory or AsyncSessionLocal)() as db:
             try:
-                await self._create_notification_from_event(db, event_type="TASK_ASSIGNED", event=event)
+                drafts, errors = await self._handle_events(
+                    db, [OutboxEvent(id=uuid.uuid4(), event_type="TASK_ASSIGNED", payload=event)]
+                )
+                if errors:
+                    raise ValueError(next(iter(errors.values())))
+                drafts = await self._apply_preferences(db, drafts)
+                rows = [notif for notifs in drafts.values() for notif in notifs]
+                await self.repo.bulk_insert_notifications(db, rows)
                 await db.commit()
+                await self._increment_unread_counters(rows)
+                await publish_notifications(rows)
             except Exception:
                 await db.rollback()
                 raise
 
-    async def _dispatch_outbox_async(self, *, limit: int) -> int:
-        async with AsyncSessionLocal() as db:
-            rows = await self.repo.claim_outbox_batch(db, limit=limit)
+    async def _load_preferences(self, db: AsyncSession, user_ids: set[uuid.UUID]) -> dict[uuid.UUID, UserPreferences]:
+        """Preferences of every recipient: one MGET, then one query for the cache misses."""
+        ordered = list(user_ids)
+        try:
+            cached = await redis_get_json_many([preferences_key(str(user_id)) for user_id in ordered])
+        except Exception:
+            logger.exception("Preference cache lookup failed; loading from database")
+            cached = [None] * len(ordered)
+
+        rows_by_user: dict[uuid.UUID, list[dict]] = {
+            user_id: entry["rows"] for user_id, entry in zip(ordered, cached) if entry is not None
+        }
+        missing = [user_id for user_id in ordered if user_id not in rows_by_user]
+        if missing:
+            loaded: dict[uuid.UUID, list[dict]] = {user_id: [] for user_id in missing}
+            for pref in await self.repo.list_preferences(db, missing):
+                loaded[pref.user_id].append(
+                    preference_row(
+                        org_id=pref.org_id,
+                        muted_project_ids=pref.muted_project_ids,
+                        disabled_types=pref.disabled_types,
+                        digest_only=pref.digest_only,
+                    )
+                )
+            rows_by_user.update(loaded)
+            try:
+                await redis_set_json_many(
+                    {preferences_key(str(user_id)): {"rows": rows} for user_id, rows in loaded.items()},
+                    ttl_seconds=settings.notification_preferences_cache_ttl_seconds,
+                )
+            except Exception:
+                logger.exception("Failed to cache notification preferences")
+
+        return {user_id: UserPreferences(rows) for user_id, rows in rows_by_user.items()}
+
+    async def _apply_preferences(
+        self,
+        db: AsyncSession,
+        drafts: dict[uuid.UUID, list[dict]],
+    ) -> dict[uuid.UUID, list[dict]]:
+        """
+        Drops notifications the recipient opted out of and defers those of digest-only recipients
+        into a NOTIFICATION_DIGEST outbox event due at the end of the digest interval. The outbox
+        rows themselves stay in `drafts` (possibly with no notifications) so they are marked sent.
+        """
+        user_ids = {notif["user_id"] for notifs in drafts.values() for notif in notifs}
+        if not user_ids:
+            return drafts
+        preferences = await self._load_preferences(db, user_ids)
+
+        kept: dict[uuid.UUID, list[dict]] = {}
+        deferred: dict[uuid.UUID, list[dict]] = defaultdict(list)
+        for row_id, notifs in drafts.items():
+            kept[row_id] = []
+            for notif in notifs:
+                delivery = preferences[notif["user_id"]].decide(notif["type"], notif["payload"])
+                if delivery is Delivery.DELIVER:
+                    kept[row_id].append(notif)
+                elif delivery is Delivery.DIGEST:
+                    deferred[notif["user_id"]].append({"type": notif["type"], "payload": notif["payload"]})
+
+        due_at = _window_end(datetime.now(timezone.utc), settings.notification_digest_interval_seconds)
+        for user_id, items in deferred.items():
+            await self.repo.enqueue_outbox(
+                db,
+                event_type="NOTIFICATION_DIGEST",
+                payload=json.dumps({"user_id": str(user_id), "items": items}, default=str),
+                shard=outbox_shard(str(user_id)),
+                available_at=due_at,
+            )
+        return kept
+
+    async def _insert_isolated(
+        self,
+        db: AsyncSession,
+        drafts: dict[uuid.UUID, list[dict]],
+        errors: dict[uuid.UUID, str],
+    ) -> list[uuid.UUID]:
+        """
+        Inserts the notifications for every outbox row in one statement.
+
+        If the combined insert fails (e.g. a recipient was deleted in the meantime), each row is
+        retried in its own savepoint so only the offending rows are marked failed.
+        """
+        try:
+            async with db.begin_nested():
+                await self.repo.bulk_insert_notifications(
+                    db, [notif for rows in drafts.values() for notif in rows]
+                )
+            return list(drafts.keys())
+        except Exception:
+            logger.warning(
+                "Bulk notification insert failed; retrying outbox rows one by one",
+                extra={"outbox_rows": len(drafts)},
+                exc_info=True,
+            )
+
+        sent: list[uuid.UUID] = []
+        for row_id, rows in drafts.items():
+            try:
+                async with db.begin_nested():
+                    await self.repo.bulk_insert_notifications(db, rows)
+                sent.append(row_id)
+            except Exception as exc:
+                errors[row_id] = str(exc)
+        return sent
+
+    async def _dispatch_outbox_async(
+        self,
+        *,
+        limit: int,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        shards: list[int] | None = None,
+    ) -> int:
+        """Dispatches one claimed batch. `shards` restricts the claim; None means every shard."""
+        async with (session_factory or AsyncSessionLocal)() as db:
+            rows = await self.repo.claim_outbox_batch(db, limit=limit, shards=shards)
             if not rows:
                 return 0
 
             now = datetime.now(timezone.utc)
-            processed = 0
+            events: list[OutboxEvent] = []
+            decode_errors: dict[uuid.UUID, str] = {}
             for row in rows:
                 try:
-                    event = json.loads(row.payload)
-                    if not isinstance(event, dict):
+                    payload = json.loads(row.payload)
+                    if not isinstance(payload, dict):
                         raise ValueError("Outbox payload must be a JSON object")
-
-                    await self._create_notification_from_event(
-                        db,
-                        event_type=row.event_type,
-                        event=event,
-                    )
-                    row.status = "SENT"
-                    row.sent_at = now
-                    row.last_error = None
-                    row.next_retry_at = None
+                    events.append(OutboxEvent(id=row.id, event_type=row.event_type, payload=payload))
                 except Exception as exc:
-                    row.attempts += 1
-                    row.status = "FAILED"
-                    row.last_error = str(exc)[:1000]
-                    delay_seconds = min(300, 2 ** min(row.attempts, 8))
-                    row.next_retry_at = now + timedelta(seconds=delay_seconds)
+                    decode_errors[row.id] = str(exc)
 
-                await self.repo.save_outbox_row(db, row)
-                processed += 1
+            drafts, errors = await self._handle_events(db, events)
+            errors.update(decode_errors)
+            drafts = await self._apply_preferences(db, drafts)
+            sent_ids = await self._insert_isolated(db, drafts, errors) if drafts else []
+            created = [notif for row_id in sent_ids for notif in drafts[row_id]]
 
+            await self.repo.mark_outbox_sent(db, ids=sent_ids, sent_at=now)
+            dead = await self.repo.mark_outbox_failed(
+                db,
+                errors=errors,
+                now=now,
+                max_attempts=settings.outbox_max_attempts,
+            )
             await db.commit()
-            return processed
+            await self._increment_unread_counters(created)
+            await publish_notifications(created)
+
+            for row_id, event_type in dead:
+                logger.warning(
+                    "Outbox row moved to dead-letter after max attempts",
+                    extra={"outbox_id": str(row_id), "event_type": event_type, "error": errors.get(row_id)},
+                )
+            return len(rows)
+
+    async def compact_outbox_async(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> dict[str, int]:
+        """
+        Moves delivered outbox rows past their retention into the compact log table, then purges
+        expired log rows. Work is done in bounded, separately committed batches so row locks and
+        WAL bursts stay small.
+        """
+        now = datetime.now(timezone.utc)
+        sent_cutoff = now - timedelta(hours=settings.outbox_sent_retention_hours)
+        log_cutoff = now - timedelta(days=settings.outbox_log_retention_days)
+        batch_size = settings.outbox_retention_batch_size
+
+        moved = 0
+        purged = 0
+        async with (session_factory or AsyncSessionLocal)() as db:
+            for _ in range(settings.outbox_retention_max_batches):
+                count = await self.repo.move_sent_outbox_to_log(db, cutoff=sent_cutoff, limit=batch_size)
+                await db.commit()
+                moved += count
+                if count < batch_size:
+                    break
+
+            for _ in range(settings.outbox_retention_max_batches):
+                count = await self.repo.purge_outbox_log(db, cutoff=log_cutoff, limit=batch_size)
+                await db.commit()
+                purged += count
+                if count < batch_size:
+                    break
+
+        return {"moved_to_log": moved, "purged_from_log": purged}
+
+    async def maintain_partitions_async(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        now: datetime | None = None,
+    ) -> dict[str, list[str]]:
+        """
+        Creates the monthly notification partitions for the next
+        `notification_partitions_ahead_months` and drops expired ones whole instead of deleting rows.
+
+        A partition past `notification_retention_months` is dropped once none of its rows count as
+        unread; past `notification_unread_retention_months` it is dropped regardless. Each
+        partition is handled in its own short transaction.
+        """
+        now = now or datetime.now(timezone.utc)
+        created: list[str] = []
+        dropped: list[str] = []
+        kept: list[str] = []
+        async with (session_factory or AsyncSessionLocal)() as db:
+            existing = set(await self.repo.list_notification_partitions(db))
+            await db.rollback()
+            for month in months_ahead(now, settings.notification_partitions_ahead_months):
+                name = partition_name(month)
+                if name in existing:
+                    continue
+                await self.repo.create_notification_partition(db, month)
+                await db.commit()
+                created.append(name)
+
+            names = sorted(name for name in existing if partition_month(name) is not None)
+            hard_expired = set(partitions_older_than(names, now, settings.notification_unread_retention_months))
+            for name in partitions_older_than(names, now, settings.notification_retention_months):
+                if name not in hard_expired and await self.repo.partition_has_unread(db, name):
+                    await db.rollback()
+                    kept.append(name)
+                    continue
+                await self.repo.drop_notification_partition(db, name)
+                await db.commit()
+                dropped.append(name)
+
+        if dropped:
+            # Cached unread counters may include dropped rows; the periodic reconcile repairs them.
+            logger.info("Dropped expired notification partitions", extra={"partitions": dropped})
+        return {"created": created, "dropped": dropped, "kept_unread": kept}
+
+    async def outbox_stats(self, db: AsyncSession) -> dict:
+        return {
+            "tables": await self.repo.outbox_table_stats(db),
+            "status_counts": await self.repo.outbox_status_counts(db),
+            "dead_by_event_type": await self.repo.dead_counts_by_event_type(db),
+            "shards": await self.outbox_shard_stats(db),
+        }
+
+    async def refresh_outbox_metrics(self, db: AsyncSession) -> None:
+        """Sets the outbox backlog gauges exposed on /metrics."""
+        counts = await self.repo.outbox_status_counts(db)
+        oldest = await self.repo.oldest_pending_outbox_at(db)
+        for status in OutboxStatus:
+            OUTBOX_ROWS.labels(status.value).set(counts.get(status.value, 0))
+        OUTBOX_OLDEST_PENDING_AGE.set((datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0)
+
+    async def outbox_shard_stats(self, db: AsyncSession) -> list[dict]:
+        """Backlog depth, oldest pending age, recent dispatch rate and current owner of every shard."""
+        now = datetime.now(timezone.utc)
+        window = settings.outbox_rate_window_seconds
+        rows = {
+            row.shard: row
+            for row in await self.repo.outbox_shard_stats(db, window_start=now - timedelta(seconds=window))
+        }
+        try:
+            owners = shard_owners(await live_dispatchers())
+        except Exception:
+            logger.exception("Failed to read outbox dispatcher heartbeats")
+            owners = {}
+
+        # Rows enqueued under a previous, larger shard count still show up under their own shard.
+        shard_ids = sorted(set(range(settings.outbox_shard_count)) | set(rows))
+        stats = []
+        for shard in shard_ids:
+            row = rows.get(shard)
+            oldest = row.oldest_pending_at if row else None
+            sent = int(row.sent) if row else 0
+            stats.append(
+                {
+                    "shard": shard,
+                    "backlog": int(row.backlog) if row else 0,
+                    "oldest_pending_age_seconds": (now - oldest).total_seconds() if oldest else None,
+                    "sent_in_window": sent,
+                    "dispatch_rate_per_second": round(sent / window, 3),
+                    "owner": owners.get(shard),
+                }
+            )
+        return stats
+
+    async def list_dead_outbox(
+        self,
+        db: AsyncSession,
+        *,
+        event_type: str | None,
+        limit: int,
+        offset: int,
+    ) -> tuple[list[NotificationOutbox], int]:
+        return await self.repo.list_dead(db, event_type=event_type, limit=limit, offset=offset)
+
+    def _require_dead_selector(self, ids: list[uuid.UUID] | None, event_type: str | None, all_rows: bool) -> None:
+        if not (ids or event_type or all_rows):
+            raise HTTPException(status_code=400, detail="Provide ids, event_type or all=true")
+
+    async def replay_dead_outbox(
+        self,
+        db: AsyncSession,
+        *,
+        ids: list[uuid.UUID] | None,
+        event_type: str | None,
+        all_rows: bool = False,
+    ) -> int:
+        self._require_dead_selector(ids, event_type, all_rows)
+        replayed = await self.repo.replay_dead(db, ids=ids, event_type=event_type)
+        await db.commit()
+        return replayed
+
+    async def purge_dead_outbox(
+        self,
+        db: AsyncSession,
+        *,
+        ids: list[uuid.UUID] | None,
+        event_type: str | None,
+        all_rows: bool = False,
+    ) -> int:
+        self._require_dead_selector(ids, event_type, all_rows)
+        purged = await self.repo.purge_dead(db, ids=ids, event_type=event_type)
+        await db.commit()
+        return purged
+
+    async def _compact_and_report_async(
+        self,
+        *,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> dict:
+        result = await self.compact_outbox_async(session_factory=session_factory)
+        async with (session_factory or AsyncSessionLocal)() as db:
+            result["stats"] = await self.outbox_stats(db)
+        return result
 
     def create_task_assigned(self, event: dict) -> None:
-        asyncio.run(self._create_task_assigned_async(event))
+        worker_runtime.start()
+        worker_runtime.run(
+            self._create_task_assigned_async(event, session_factory=worker_runtime.session_factory)
+        )
 
     def dispatch_outbox(self, limit: int = 100) -> int:
-        return asyncio.run(self._dispatch_outbox_async(limit=limit))
+        worker_runtime.start()
+        return worker_runtime.run(
+            self._dispatch_outbox_async(limit=limit, session_factory=worker_runtime.session_factory)
+        )
+
+    def compact_outbox(self) -> dict:
+        worker_runtime.start()
+        return worker_runtime.run(self._compact_and_report_async(session_factory=worker_runtime.session_factory))
+
+    def maintain_partitions(self) -> dict:
+        worker_runtime.start()
+        return worker_runtime.run(self.maintain_partitions_async(session_factory=worker_runtime.session_factory))
+
+    def reconcile_unread_counters(self) -> int:
+        worker_runtime.start()
+        return worker_runtime.run(
+            self.reconcile_unread_counters_async(session_factory=worker_runtime.session_factory)
+        )
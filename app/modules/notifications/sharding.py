@@ -0,0 +1,77 @@
+"""
+Logical sharding of the notification outbox.
+
+Each outbox row carries a shard number derived from a stable key (the recipient, so one user's
+events stay in order within a shard). Dispatchers announce themselves with Redis heartbeats and
+split the shards between the live members deterministically, so a joining or departing
+dispatcher causes every member to converge on the new assignment within one heartbeat.
+Ownership is advisory: claims still use `FOR UPDATE SKIP LOCKED`, so two dispatchers briefly
+owning the same shard during a rebalance is harmless.
+"""
+import logging
+import uuid
+import zlib
+
+from app.core.config import settings
+from app.infra.redis import redis_heartbeat, redis_heartbeat_leave, redis_live_members
+
+
+logger = logging.getLogger(__name__)
+
+DISPATCHERS_KEY = "outbox:dispatchers"
+
+
+def outbox_shard(key: str, shard_count: int | None = None) -> int:
+    count = shard_count or settings.outbox_shard_count
+    return zlib.crc32(key.encode()) % count
+
+
+def assign_shards(members: list[str], shard_count: int | None = None) -> dict[str, list[int]]:
+    """Deals shards round-robin over the sorted members; every member computes the same split."""
+    count = shard_count or settings.outbox_shard_count
+    ordered = sorted(members)
+    assignment: dict[str, list[int]] = {member: [] for member in ordered}
+    if not ordered:
+        return assignment
+    for shard in range(count):
+        assignment[ordered[shard % len(ordered)]].append(shard)
+    return assignment
+
+
+def shard_owners(members: list[str], shard_count: int | None = None) -> dict[int, str]:
+    return {
+        shard: member
+        for member, shards in assign_shards(members, shard_count).items()
+        for shard in shards
+    }
+
+
+async def live_dispatchers() -> list[str]:
+    return await redis_live_members(DISPATCHERS_KEY, settings.outbox_dispatcher_ttl_seconds)
+
+
+class ShardCoordinator:
+    def __init__(self, member_id: str | None = None, *, shard_count: int | None = None) -> None:
+        self.member_id = member_id or uuid.uuid4().hex
+        self.shard_count = shard_count or settings.outbox_shard_count
+        self.shards: list[int] = []
+
+    async def heartbeat(self) -> list[int]:
+        """Refreshes this member's heartbeat and returns the shards it now owns."""
+        members = await redis_heartbeat(
+            DISPATCHERS_KEY,
+            self.member_id,
+            settings.outbox_dispatcher_ttl_seconds,
+        )
+        shards = assign_shards(members, self.shard_count).get(self.member_id, [])
+        if shards != self.shards:
+            logger.info(
+                "Outbox shard assignment changed",
+                extra={"member": self.member_id, "members": len(members), "shards": shards},
+            )
+        self.shards = shards
+        return shards
+
+    async def leave(self) -> None:
+        await redis_heartbeat_leave(DISPATCHERS_KEY, self.member_id)
+        self.shards = []
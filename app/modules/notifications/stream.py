@@ -0,0 +1,192 @@
+"""
+Server-sent notification stream.
+
+The dispatcher appends every notification it creates to a short per-user Redis stream (the
+replay buffer) and publishes it on one shared pub/sub channel. Each API process keeps a single
+subscription to that channel (`NotificationStreamHub`) and routes messages to the connected
+clients of the addressed user. The stream entry id doubles as the SSE event id, so a client that
+reconnects with `Last-Event-ID` gets what it missed from the buffer instead of refetching.
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator
+
+from app.core.config import settings
+from app.infra.redis import redis_client, redis_stream_after, redis_stream_first_id, redis_stream_publish
+
+
+logger = logging.getLogger(__name__)
+
+
+def stream_key(user_id: str) -> str:
+    return f"notif_stream:{user_id}"
+
+
+def _id_tuple(entry_id: str) -> tuple[int, int]:
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _sse(data: str, *, event: str, event_id: str | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {data}\n\n"
+
+
+async def publish_notifications(rows: list[dict]) -> None:
+    """
+    Pushes freshly committed notification rows to their recipients' streams. Rows carry the
+    `created_at` stored by the insert, so streamed items sort and dedupe like listed ones.
+    """
+    if not rows:
+        return
+    entries = []
+    for row in rows:
+        user_id = str(row["user_id"])
+        data = json.dumps(
+            {
+                "id": str(row["id"]),
+                "type": row["type"],
+                "payload": row["payload"],
+                "is_read": row["is_read"],
+                "created_at": row["created_at"].isoformat(),
+            },
+            default=str,
+        )
+        entries.append((stream_key(user_id), user_id, data))
+    try:
+        await redis_stream_publish(
+            entries,
+            channel=settings.notification_stream_channel,
+            maxlen=settings.notification_stream_buffer_size,
+            ttl_seconds=settings.notification_stream_ttl_seconds,
+        )
+    except Exception:
+        logger.exception("Failed to publish notifications to streams", extra={"notifications": len(rows)})
+
+
+# Queued in place of pending messages when a client falls too far behind.
+_OVERFLOW = object()
+
+
+class NotificationStreamHub:
+    """One Redis subscription per API process, fanned out to local per-user queues."""
+
+    def __init__(self) -> None:
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.notification_stream_queue_size)
+        self._queues.setdefault(user_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._queues.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._queues[user_id]
+
+    def _route(self, raw: str) -> None:
+        message = json.loads(raw)
+        for queue in list(self._queues.get(message["key"], ())):
+            try:
+                queue.put_nowait((message["id"], message["data"]))
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_OVERFLOW)
+
+    async def _listen(self) -> None:
+        while self._queues:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(settings.notification_stream_channel)
+                while self._queues:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._route(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Notification stream subscription failed; resubscribing")
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.reset()
+
+    async def close(self) -> None:
+        self._queues.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("Notification stream subscription failed during shutdown")
+            self._task = None
+
+
+notification_stream_hub = NotificationStreamHub()
+
+
+async def event_stream(
+    user_id: str,
+    *,
+    last_event_id: str | None,
+    hub: NotificationStreamHub | None = None,
+) -> AsyncIterator[str]:
+    """
+    Yields SSE frames for `user_id`. A `reset` event tells the client its position is older than
+    the replay buffer and it should refetch the list once; `notification` events carry the same
+    JSON shape as items of `GET /notifications`.
+    """
+    hub = hub or notification_stream_hub
+    # Subscribe before replaying so nothing published in between is lost; duplicates are skipped by id.
+    queue = hub.subscribe(user_id)
+    try:
+        last_seen = (0, 0)
+        yield "retry: 3000\n\n"
+
+        if last_event_id:
+            try:
+                last_seen = _id_tuple(last_event_id)
+            except ValueError:
+                last_event_id = None
+        if last_event_id:
+            key = stream_key(user_id)
+            missed = await redis_stream_after(key, last_event_id, settings.notification_stream_buffer_size)
+            if missed:
+                # Each entry records the id of the one before it, so the client lost something
+                # only if the entry following its position is not the oldest one still buffered.
+                lost = missed[0][2] != last_event_id
+            else:
+                # Nothing newer is buffered; only an expired buffer may have dropped entries.
+                lost = await redis_stream_first_id(key) is None
+            if lost:
+                yield _sse("{}", event="reset")
+            for entry_id, data, _ in missed:
+                last_seen = _id_tuple(entry_id)
+                yield _sse(data, event="notification", event_id=entry_id)
+
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=settings.notification_stream_keepalive_seconds)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if item is _OVERFLOW:
+                # Ending the response makes the client reconnect with Last-Event-ID and catch up
+                # from the replay buffer.
+                return
+            entry_id, data = item
+            if _id_tuple(entry_id) <= last_seen:
+                continue
+            last_seen = _id_tuple(entry_id)
+            yield _sse(data, event="notification", event_id=entry_id)
+    finally:
+        hub.unsubscribe(user_id, queue)
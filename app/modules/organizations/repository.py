@@ -5,9 +5,11 @@ from sqlalchemy import delete, func, select, update
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import instrument_repository
 from app.modules.organizations.models import Organization, OrgMember
 
 
+@instrument_repository
 class OrganizationRepository:
     async def create_org(self, db: AsyncSession, org: Organization) -> Organization:
         db.add(org)
@@ -3,8 +3,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import APIRouter, Depends
 
-from app.db.session import get_db_session
-from app.modules.auth.deps import get_current_user
+from app.db.session import get_db_session, get_read_db_session
+from app.modules.auth.deps import get_current_reader, get_current_user
 from app.modules.organizations.schemas import (
     MemberAddRequest, MemberListResponse, MemberResponse, MemberRoleUpdateRequest,
     OrgCreateRequest, OrgListResponse, OrgResponse, OrgUpdateRequest,
@@ -57,14 +57,14 @@ async def delete_org(
 
 @router.get("", response_model=OrgListResponse)
 async def my_orgs(
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> OrgListResponse:
     orgs = await service.list_my_orgs(db, user.id)
     return OrgListResponse(items=[OrgResponse(id=o.id, name=o.name, created_by=o.created_by) for o in orgs])
 
 @router.get("/{org_id}/members", response_model=MemberListResponse)
-async def members(org_id: UUID, db: AsyncSession = Depends(get_db_session), user: User = Depends(get_current_user)):
+async def members(org_id: UUID, db: AsyncSession = Depends(get_read_db_session), user: User = Depends(get_current_reader)):
     ms = await service.list_members(db, org_id, user.id)
     return MemberListResponse(items=[MemberResponse(user_id=m.user_id, role=m.role) for m in ms])
 
@@ -103,8 +103,8 @@ async def create_invite(
 @router.get("/{org_id}/invites", response_model=InviteListResponse)
 async def list_invites(
     org_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> InviteListResponse:
     items = await service.list_invites(db, org_id, user.id)
     return InviteListResponse(items=items)
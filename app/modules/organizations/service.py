@@ -6,6 +6,7 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.tracing import trace_service
 from app.infra.redis import (
     redis_del,
     redis_get_json,
@@ -24,13 +25,21 @@ from app.modules.organizations.invites import (
     invite_key,
     invites_index_key,
 )
+from app.modules.tasks.repository import TaskRepository
+from app.modules.tasks.watchers import watchers_key
 
 
 ALLOWED_ROLES = {r.value for r in OrgRole}
 
+@trace_service
 class OrganizationService:
-    def __init__(self, repo: OrganizationRepository | None = None) -> None:
+    def __init__(
+        self,
+        repo: OrganizationRepository | None = None,
+        task_repo: TaskRepository | None = None,
+    ) -> None:
         self.repo = repo or OrganizationRepository()
+        self.task_repo = task_repo or TaskRepository()
 
     async def _count_owners(self, db: AsyncSession, org_id: uuid.UUID) -> int:
         return await self.repo.count_members_by_role(db, org_id, OrgRole.OWNER.value)
@@ -157,7 +166,11 @@ class OrganizationService:
         removed = await self.repo.remove_member(db, org_id, user_id)
         if not removed:
             raise HTTPException(status_code=404, detail="Member not found")
+        # A former member must not keep receiving updates about the org's tasks.
+        unwatched = await self.task_repo.remove_org_watcher(db, org_id, user_id)
         await db.commit()
+        for task_id in unwatched:
+            await redis_del(watchers_key(str(task_id)))
 
     async def create_invite(
         self,
@@ -5,9 +5,12 @@ from sqlalchemy import delete, select
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import instrument_repository
+from app.modules.organizations.models import OrgMember
 from app.modules.projects.models import Project
 
 
+@instrument_repository
 class ProjectRepository:
     async def create(self, db: AsyncSession, project: Project) -> Project:
         db.add(project)
@@ -24,6 +27,23 @@ class ProjectRepository:
         res = await db.execute(select(Project).where(Project.id == project_id))
         return res.scalar_one_or_none()
 
+    async def get_member_and_project(
+        self, db: AsyncSession, org_id: uuid.UUID, project_id: uuid.UUID, user_id: uuid.UUID
+    ) -> tuple[OrgMember | None, Project | None]:
+        """
+        The user's membership in the org and the project if it belongs to that org, in one
+        round trip. The project is None when it does not exist or belongs to another org.
+        """
+        res = await db.execute(
+            select(OrgMember, Project)
+            .outerjoin(Project, (Project.id == project_id) & (Project.org_id == OrgMember.org_id))
+            .where(OrgMember.org_id == org_id, OrgMember.user_id == user_id)
+        )
+        row = res.first()
+        if row is None:
+            return None, None
+        return row[0], row[1]
+
     async def update(self, db: AsyncSession, project: Project, data: dict) -> Project:
         for key, value in data.items():
             setattr(project, key, value)
@@ -2,8 +2,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db_session
-from app.modules.auth.deps import get_current_user
+from app.db.session import get_db_session, get_read_db_session
+from app.modules.auth.deps import get_current_reader, get_current_user
 from app.modules.projects.schemas import (
     ProjectCreateRequest,
     ProjectListResponse,
@@ -37,8 +37,8 @@ async def create_project(
 @router.get("/orgs/{org_id}/projects", response_model=ProjectListResponse)
 async def list_projects(
     org_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> ProjectListResponse:
     items = await service.list_projects(db, org_id=org_id, requester_id=user.id)
     return ProjectListResponse(
@@ -59,8 +59,8 @@ async def delete_project(
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> ProjectResponse:
     p = await service.get_project(db, project_id=project_id, requester_id=user.id)
     return ProjectResponse(id=p.id, org_id=p.org_id, name=p.name, description=p.description, created_by=p.created_by)
@@ -2,12 +2,14 @@ import uuid
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import trace_service
 from app.modules.organizations.enums import OrgRole
 from app.modules.organizations.service import OrganizationService
 from app.modules.projects.models import Project
 from app.modules.projects.repository import ProjectRepository
 
 
+@trace_service
 class ProjectService:
     def __init__(
         self,
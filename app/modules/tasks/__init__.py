@@ -1 +1,8 @@
-from app.modules.tasks.models import Task
\ No newline at end of file
+from app.modules.tasks.models import Task, TaskFieldDefinition, TaskLabel, TaskWatcher
+
+__all__ = [
+    "Task",
+    "TaskLabel",
+    "TaskFieldDefinition",
+    "TaskWatcher",
+]
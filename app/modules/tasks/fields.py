@@ -0,0 +1,101 @@
+from datetime import date
+from typing import Any
+
+FIELD_TYPES = {"text", "number", "boolean", "date", "select"}
+MAX_TEXT_FIELD_LENGTH = 500
+
+
+def definitions_key(org_id: str) -> str:
+    return f"task_defs:{org_id}"
+
+
+def _coerce_value(key: str, value: Any, definition: dict) -> Any:
+    field_type = definition["type"]
+
+    if field_type == "text":
+        if not isinstance(value, str) or len(value) > MAX_TEXT_FIELD_LENGTH:
+            raise ValueError(f"Field '{key}' must be a string of at most {MAX_TEXT_FIELD_LENGTH} characters")
+        return value
+
+    if field_type == "number":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Field '{key}' must be a number")
+        return value
+
+    if field_type == "boolean":
+        if not isinstance(value, bool):
+            raise ValueError(f"Field '{key}' must be a boolean")
+        return value
+
+    if field_type == "date":
+        try:
+            return date.fromisoformat(value).isoformat()
+        except (TypeError, ValueError):
+            raise ValueError(f"Field '{key}' must be an ISO date (YYYY-MM-DD)")
+
+    if field_type == "select":
+        if value not in definition["options"]:
+            raise ValueError(f"Field '{key}' must be one of: {', '.join(definition['options'])}")
+        return value
+
+    raise ValueError(f"Field '{key}' has unsupported type '{field_type}'")
+
+
+def validate_labels(labels: list[str], definitions: dict) -> list[str]:
+    known = set(definitions["labels"])
+    unknown = [label for label in labels if label not in known]
+    if unknown:
+        raise ValueError(f"Unknown labels: {', '.join(sorted(set(unknown)))}")
+    return list(dict.fromkeys(labels))
+
+
+def validate_custom_fields(values: dict[str, Any], definitions: dict) -> dict[str, Any]:
+    """
+    Validates and normalizes custom field values against the org's field definitions.
+
+    A value of None is kept as-is so callers can use it to remove a field on update.
+
+    Raises:
+        ValueError: If a key is not defined for the org or a value does not match its type.
+    """
+    field_defs = definitions["fields"]
+    cleaned: dict[str, Any] = {}
+    for key, value in values.items():
+        definition = field_defs.get(key)
+        if definition is None:
+            raise ValueError(f"Unknown custom field: {key}")
+        cleaned[key] = None if value is None else _coerce_value(key, value, definition)
+    return cleaned
+
+
+def parse_field_filters(raw_filters: list[str], definitions: dict) -> dict[str, Any]:
+    """
+    Parses `key:value` filter strings into a JSON object for a single `@>` containment predicate.
+
+    Values arrive as query-string text, so they are converted to the field's JSON type first;
+    otherwise `{"points": "3"}` would never match a stored `{"points": 3}`.
+    """
+    field_defs = definitions["fields"]
+    parsed: dict[str, Any] = {}
+    for raw in raw_filters:
+        key, sep, text_value = raw.partition(":")
+        if not sep:
+            raise ValueError(f"Invalid field filter '{raw}', expected key:value")
+
+        definition = field_defs.get(key)
+        if definition is None:
+            raise ValueError(f"Unknown custom field: {key}")
+
+        value: Any = text_value
+        if definition["type"] == "number":
+            try:
+                value = float(text_value) if "." in text_value else int(text_value)
+            except ValueError:
+                raise ValueError(f"Field '{key}' must be a number")
+        elif definition["type"] == "boolean":
+            if text_value not in {"true", "false"}:
+                raise ValueError(f"Field '{key}' must be true or false")
+            value = text_value == "true"
+
+        parsed[key] = _coerce_value(key, value, definition)
+    return parsed
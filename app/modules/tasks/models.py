@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -17,6 +17,13 @@ class Task(Base):
         Index("ix_tasks_status", "status"),
         Index("ix_tasks_created_by", "created_by"),
         Index("ix_tasks_assigned_to", "assigned_to"),
+        Index("ix_tasks_labels", "labels", postgresql_using="gin"),
+        Index(
+            "ix_tasks_custom_fields",
+            "custom_fields",
+            postgresql_using="gin",
+            postgresql_ops={"custom_fields": "jsonb_path_ops"},
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -38,6 +45,19 @@ class Task(Base):
 
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="TODO")
 
+    labels: Mapped[list[str]] = mapped_column(
+        ARRAY(String(50)),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'::varchar[]"),
+    )
+    custom_fields: Mapped[dict] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=dict,
+        server_default=text("'{}'::jsonb"),
+    )
+
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
@@ -58,3 +78,69 @@ class Task(Base):
         onupdate=func.now(),
         nullable=False,
     )
+
+
+class TaskLabel(Base):
+    __tablename__ = "task_labels"
+    __table_args__ = (
+        UniqueConstraint("org_id", "name", name="uq_task_labels_org_name"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    color: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TaskFieldDefinition(Base):
+    __tablename__ = "task_field_definitions"
+    __table_args__ = (
+        UniqueConstraint("org_id", "key", name="uq_task_field_definitions_org_key"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    org_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    key: Mapped[str] = mapped_column(String(50), nullable=False)
+    field_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    options: Mapped[list[str]] = mapped_column(
+        ARRAY(String(100)),
+        nullable=False,
+        default=list,
+        server_default=text("'{}'::varchar[]"),
+    )
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class TaskWatcher(Base):
+    __tablename__ = "task_watchers"
+    __table_args__ = (
+        Index("ix_task_watchers_user_id", "user_id"),
+    )
+
+    task_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,20 +1,23 @@
 import uuid
 from typing import Any, cast
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.tasks.models import Task
+from app.core.metrics import instrument_repository
+from app.modules.tasks.models import Task, TaskFieldDefinition, TaskLabel, TaskWatcher
 
 
+@instrument_repository
 class TaskRepository:
     async def create(self, db: AsyncSession, task: Task) -> Task:
         db.add(task)
         await db.flush()
         return task
 
-    async def list(
+    async def list_tasks(
         self,
         db: AsyncSession,
         *,
@@ -23,6 +26,8 @@ class TaskRepository:
         status: str | None,
         limit: int,
         offset: int,
+        labels: list[str] | None = None,
+        custom_fields: dict[str, Any] | None = None,
     ) -> tuple[list[Task], int]:
         stmt = select(Task).where(Task.org_id == org_id)
 
@@ -30,6 +35,11 @@ class TaskRepository:
             stmt = stmt.where(Task.project_id == project_id)
         if status:
             stmt = stmt.where(Task.status == status)
+        # Containment predicates (`@>`) so Postgres can use the GIN indexes.
+        if labels:
+            stmt = stmt.where(Task.labels.contains(labels))
+        if custom_fields:
+            stmt = stmt.where(Task.custom_fields.contains(custom_fields))
 
         total_stmt = select(func.count()).select_from(stmt.subquery())
         total = int((await db.execute(total_stmt)).scalar_one())
@@ -37,19 +47,13 @@ class TaskRepository:
         stmt = stmt.order_by(Task.created_at.desc()).limit(limit).offset(offset)
         rows = await db.execute(stmt)
         return list(rows.scalars().all()), total
-    
+
     async def get(self, db: AsyncSession, task_id: uuid.UUID) -> Task | None:
         stmt = select(Task).where(Task.id == task_id)
         rows = await db.execute(stmt)
         return rows.scalar_one_or_none()
-    
-    async def update_task(self, db: AsyncSession, task_id: uuid.UUID, data: dict) -> Task | None:
-        stmt = select(Task).where(Task.id == task_id)
-        rows = await db.execute(stmt)
-        task = rows.scalar_one_or_none()
-        if not task:
-            return None
 
+    async def update_task(self, db: AsyncSession, task: Task, data: dict) -> Task:
         for key, value in data.items():
             setattr(task, key, value)
 
@@ -63,3 +67,110 @@ class TaskRepository:
             await db.execute(delete(Task).where(Task.id == task_id)),
         )
         return res.rowcount or 0
+
+    async def list_watcher_ids(self, db: AsyncSession, task_id: uuid.UUID) -> list[uuid.UUID]:
+        res = await db.execute(
+            select(TaskWatcher.user_id).where(TaskWatcher.task_id == task_id).order_by(TaskWatcher.created_at)
+        )
+        return list(res.scalars().all())
+
+    async def add_watchers(self, db: AsyncSession, task_id: uuid.UUID, user_ids: list[uuid.UUID]) -> int:
+        if not user_ids:
+            return 0
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                pg_insert(TaskWatcher)
+                .values([{"task_id": task_id, "user_id": user_id} for user_id in dict.fromkeys(user_ids)])
+                .on_conflict_do_nothing(index_elements=[TaskWatcher.task_id, TaskWatcher.user_id])
+            ),
+        )
+        return res.rowcount or 0
+
+    async def remove_watcher(self, db: AsyncSession, task_id: uuid.UUID, user_id: uuid.UUID) -> int:
+        res = cast(
+            CursorResult[Any],
+            await db.execute(
+                delete(TaskWatcher).where(TaskWatcher.task_id == task_id, TaskWatcher.user_id == user_id)
+            ),
+        )
+        return res.rowcount or 0
+
+    async def remove_org_watcher(
+        self, db: AsyncSession, org_id: uuid.UUID, user_id: uuid.UUID
+    ) -> list[uuid.UUID]:
+        """Stops the user watching any task of the org. Returns the affected task ids."""
+        res = await db.execute(
+            delete(TaskWatcher)
+            .where(
+                TaskWatcher.user_id == user_id,
+                TaskWatcher.task_id.in_(select(Task.id).where(Task.org_id == org_id)),
+            )
+            .returning(TaskWatcher.task_id)
+        )
+        return list(res.scalars().all())
+
+    async def list_labels(self, db: AsyncSession, org_id: uuid.UUID) -> list[TaskLabel]:
+        res = await db.execute(select(TaskLabel).where(TaskLabel.org_id == org_id).order_by(TaskLabel.name))
+        return list(res.scalars().all())
+
+    async def get_label(self, db: AsyncSession, label_id: uuid.UUID) -> TaskLabel | None:
+        res = await db.execute(select(TaskLabel).where(TaskLabel.id == label_id))
+        return res.scalar_one_or_none()
+
+    async def get_label_by_name(self, db: AsyncSession, org_id: uuid.UUID, name: str) -> TaskLabel | None:
+        res = await db.execute(select(TaskLabel).where(TaskLabel.org_id == org_id, TaskLabel.name == name))
+        return res.scalar_one_or_none()
+
+    async def create_label(self, db: AsyncSession, label: TaskLabel) -> TaskLabel:
+        db.add(label)
+        await db.flush()
+        return label
+
+    async def delete_label(self, db: AsyncSession, label: TaskLabel) -> None:
+        await db.execute(
+            update(Task)
+            .where(Task.org_id == label.org_id, Task.labels.contains([label.name]))
+            .values(labels=func.array_remove(Task.labels, label.name))
+        )
+        await db.execute(delete(TaskLabel).where(TaskLabel.id == label.id))
+
+    async def list_field_definitions(self, db: AsyncSession, org_id: uuid.UUID) -> list[TaskFieldDefinition]:
+        res = await db.execute(
+            select(TaskFieldDefinition)
+            .where(TaskFieldDefinition.org_id == org_id)
+            .order_by(TaskFieldDefinition.key)
+        )
+        return list(res.scalars().all())
+
+    async def get_field_definition(self, db: AsyncSession, field_id: uuid.UUID) -> TaskFieldDefinition | None:
+        res = await db.execute(select(TaskFieldDefinition).where(TaskFieldDefinition.id == field_id))
+        return res.scalar_one_or_none()
+
+    async def get_field_definition_by_key(
+        self,
+        db: AsyncSession,
+        org_id: uuid.UUID,
+        key: str,
+    ) -> TaskFieldDefinition | None:
+        res = await db.execute(
+            select(TaskFieldDefinition).where(TaskFieldDefinition.org_id == org_id, TaskFieldDefinition.key == key)
+        )
+        return res.scalar_one_or_none()
+
+    async def create_field_definition(
+        self,
+        db: AsyncSession,
+        definition: TaskFieldDefinition,
+    ) -> TaskFieldDefinition:
+        db.add(definition)
+        await db.flush()
+        return definition
+
+    async def delete_field_definition(self, db: AsyncSession, definition: TaskFieldDefinition) -> None:
+        await db.execute(
+            update(Task)
+            .where(Task.org_id == definition.org_id, Task.custom_fields.has_key(definition.key))
+            .values(custom_fields=Task.custom_fields.op("-")(definition.key))
+        )
+        await db.execute(delete(TaskFieldDefinition).where(TaskFieldDefinition.id == definition.id))
@@ -2,9 +2,23 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db_session
-from app.modules.auth.deps import get_current_user
-from app.modules.tasks.schemas import TaskCreateRequest, TaskListResponse, TaskResponse, TaskUpdateRequest
+from app.db.session import get_db_session, get_read_db_session
+from app.modules.auth.deps import get_current_reader, get_current_user
+from app.modules.tasks.models import Task, TaskFieldDefinition, TaskLabel
+from app.modules.tasks.schemas import (
+    TaskCreateRequest,
+    TaskFieldCreateRequest,
+    TaskFieldListResponse,
+    TaskFieldResponse,
+    TaskLabelCreateRequest,
+    TaskLabelListResponse,
+    TaskLabelResponse,
+    TaskListResponse,
+    TaskResponse,
+    TaskUpdateRequest,
+    TaskWatcherAddRequest,
+    TaskWatcherListResponse,
+)
 from app.modules.tasks.service import TaskService
 from app.modules.users.models import User
 
@@ -12,6 +26,26 @@ router = APIRouter(tags=["tasks"])
 service = TaskService()
 
 
+def _to_response(t: Task) -> TaskResponse:
+    return TaskResponse(
+        id=t.id, org_id=t.org_id, project_id=t.project_id,
+        title=t.title, description=t.description, status=t.status,
+        created_by=t.created_by, assigned_to=t.assigned_to,
+        labels=list(t.labels or []), custom_fields=dict(t.custom_fields or {}),
+    )
+
+
+def _label_response(label: TaskLabel) -> TaskLabelResponse:
+    return TaskLabelResponse(id=label.id, org_id=label.org_id, name=label.name, color=label.color)
+
+
+def _field_response(field: TaskFieldDefinition) -> TaskFieldResponse:
+    return TaskFieldResponse(
+        id=field.id, org_id=field.org_id, key=field.key,
+        field_type=field.field_type, options=list(field.options or []),
+    )
+
+
 @router.post("/orgs/{org_id}/projects/{project_id}/tasks", response_model=TaskResponse)
 async def create_task(
     org_id: UUID,
@@ -28,12 +62,10 @@ async def create_task(
         title=payload.title,
         description=payload.description,
         status=payload.status,
+        labels=payload.labels,
+        custom_fields=payload.custom_fields,
     )
-    return TaskResponse(
-        id=t.id, org_id=t.org_id, project_id=t.project_id,
-        title=t.title, description=t.description, status=t.status,
-        created_by=t.created_by, assigned_to=t.assigned_to
-    )
+    return _to_response(t)
 
 
 @router.get("/orgs/{org_id}/tasks", response_model=TaskListResponse)
@@ -41,10 +73,12 @@ async def list_tasks(
     org_id: UUID,
     project_id: UUID | None = Query(default=None),
     status: str | None = Query(default=None),
+    labels: list[str] = Query(default=[], description="Tasks must carry all of these labels"),
+    field: list[str] = Query(default=[], description="Custom field equality filter as key:value"),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> TaskListResponse:
     items, total = await service.list_tasks(
         db,
@@ -54,13 +88,11 @@ async def list_tasks(
         status=status,
         limit=limit,
         offset=offset,
+        labels=labels,
+        field_filters=field,
     )
     return TaskListResponse(
-        items=[TaskResponse(
-            id=t.id, org_id=t.org_id, project_id=t.project_id,
-            title=t.title, description=t.description, status=t.status,
-            created_by=t.created_by, assigned_to=t.assigned_to
-        ) for t in items],
+        items=[_to_response(t) for t in items],
         limit=limit,
         offset=offset,
         total=total,
@@ -69,15 +101,11 @@ async def list_tasks(
 @router.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
 ) -> TaskResponse:
     t = await service.get_task(db, task_id=task_id, requester_id=user.id)  # add in service
-    return TaskResponse(
-        id=t.id, org_id=t.org_id, project_id=t.project_id,
-        title=t.title, description=t.description, status=t.status,
-        created_by=t.created_by, assigned_to=t.assigned_to
-    )
+    return _to_response(t)
 
 @router.patch("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
@@ -89,11 +117,7 @@ async def update_task(
     data = payload.model_dump(exclude_unset=True)
 
     t = await service.update_task(db, task_id=task_id, requester_id=user.id, data=data)
-    return TaskResponse(
-        id=t.id, org_id=t.org_id, project_id=t.project_id,
-        title=t.title, description=t.description, status=t.status,
-        created_by=t.created_by, assigned_to=t.assigned_to
-    )
+    return _to_response(t)
 
 
 @router.delete("/tasks/{task_id}")
@@ -104,3 +128,117 @@ async def delete_task(
 ) -> dict:
     await service.delete_task(db, task_id=task_id, requester_id=user.id)
     return {"status": "ok"}
+
+
+@router.get("/tasks/{task_id}/watchers", response_model=TaskWatcherListResponse)
+async def list_task_watchers(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
+) -> TaskWatcherListResponse:
+    user_ids = await service.list_watchers(db, task_id=task_id, requester_id=user.id)
+    return TaskWatcherListResponse(task_id=task_id, user_ids=user_ids)
+
+
+@router.post("/tasks/{task_id}/watchers", response_model=TaskWatcherListResponse)
+async def add_task_watcher(
+    task_id: UUID,
+    payload: TaskWatcherAddRequest,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> TaskWatcherListResponse:
+    user_ids = await service.add_watcher(
+        db,
+        task_id=task_id,
+        requester_id=user.id,
+        user_id=payload.user_id or user.id,
+    )
+    return TaskWatcherListResponse(task_id=task_id, user_ids=user_ids)
+
+
+@router.delete("/tasks/{task_id}/watchers/{user_id}", response_model=TaskWatcherListResponse)
+async def remove_task_watcher(
+    task_id: UUID,
+    user_id: UUID,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> TaskWatcherListResponse:
+    user_ids = await service.remove_watcher(db, task_id=task_id, requester_id=user.id, user_id=user_id)
+    return TaskWatcherListResponse(task_id=task_id, user_ids=user_ids)
+
+
+@router.get("/orgs/{org_id}/task-labels", response_model=TaskLabelListResponse)
+async def list_task_labels(
+    org_id: UUID,
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
+) -> TaskLabelListResponse:
+    labels = await service.list_labels(db, org_id=org_id, requester_id=user.id)
+    return TaskLabelListResponse(items=[_label_response(label) for label in labels])
+
+
+@router.post("/orgs/{org_id}/task-labels", response_model=TaskLabelResponse)
+async def create_task_label(
+    org_id: UUID,
+    payload: TaskLabelCreateRequest,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> TaskLabelResponse:
+    label = await service.create_label(
+        db,
+        org_id=org_id,
+        requester_id=user.id,
+        name=payload.name,
+        color=payload.color,
+    )
+    return _label_response(label)
+
+
+@router.delete("/orgs/{org_id}/task-labels/{label_id}")
+async def delete_task_label(
+    org_id: UUID,
+    label_id: UUID,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> dict:
+    await service.delete_label(db, org_id=org_id, label_id=label_id, requester_id=user.id)
+    return {"status": "ok"}
+
+
+@router.get("/orgs/{org_id}/task-fields", response_model=TaskFieldListResponse)
+async def list_task_fields(
+    org_id: UUID,
+    db: AsyncSession = Depends(get_read_db_session),
+    user: User = Depends(get_current_reader),
+) -> TaskFieldListResponse:
+    fields = await service.list_field_definitions(db, org_id=org_id, requester_id=user.id)
+    return TaskFieldListResponse(items=[_field_response(f) for f in fields])
+
+
+@router.post("/orgs/{org_id}/task-fields", response_model=TaskFieldResponse)
+async def create_task_field(
+    org_id: UUID,
+    payload: TaskFieldCreateRequest,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> TaskFieldResponse:
+    field = await service.create_field_definition(
+        db,
+        org_id=org_id,
+        requester_id=user.id,
+        key=payload.key,
+        field_type=payload.field_type,
+        options=payload.options,
+    )
+    return _field_response(field)
+
+
+@router.delete("/orgs/{org_id}/task-fields/{field_id}")
+async def delete_task_field(
+    org_id: UUID,
+    field_id: UUID,
+    db: AsyncSession = Depends(get_db_session),
+    user: User = Depends(get_current_user),
+) -> dict:
+    await service.delete_field_definition(db, org_id=org_id, field_id=field_id, requester_id=user.id)
+    return {"status": "ok"}
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field
 from uuid import UUID
 
@@ -7,6 +9,8 @@ class TaskCreateRequest(BaseModel):
     title: str = Field(min_length=2, max_length=200)
     description: str | None = Field(default=None, max_length=5000)
     status: str = Field(default="TODO")
+    labels: list[str] = Field(default_factory=list, max_length=20)
+    custom_fields: dict[str, Any] = Field(default_factory=dict)
 
 class TaskResponse(BaseModel):
     id: UUID
@@ -17,6 +21,8 @@ class TaskResponse(BaseModel):
     status: str
     created_by: UUID | None
     assigned_to: UUID | None = None
+    labels: list[str] = Field(default_factory=list)
+    custom_fields: dict[str, Any] = Field(default_factory=dict)
 
 class TaskListResponse(BaseModel):
     items: list[TaskResponse]
@@ -29,3 +35,41 @@ class TaskUpdateRequest(BaseModel):
     description: str | None = Field(default=None, max_length=5000)
     status: str | None = None
     assigned_to: UUID | None = None
+    labels: list[str] | None = Field(default=None, max_length=20)
+    custom_fields: dict[str, Any] | None = None
+
+
+class TaskLabelCreateRequest(BaseModel):
+    name: str = Field(min_length=1, max_length=50)
+    color: str | None = Field(default=None, max_length=20)
+
+class TaskLabelResponse(BaseModel):
+    id: UUID
+    org_id: UUID
+    name: str
+    color: str | None
+
+class TaskLabelListResponse(BaseModel):
+    items: list[TaskLabelResponse]
+
+class TaskFieldCreateRequest(BaseModel):
+    key: str = Field(min_length=1, max_length=50, pattern=r"^[a-z][a-z0-9_]*$")
+    field_type: str
+    options: list[str] = Field(default_factory=list, max_length=50)
+
+class TaskFieldResponse(BaseModel):
+    id: UUID
+    org_id: UUID
+    key: str
+    field_type: str
+    options: list[str]
+
+class TaskFieldListResponse(BaseModel):
+    items: list[TaskFieldResponse]
+
+class TaskWatcherAddRequest(BaseModel):
+    user_id: UUID | None = Field(default=None, description="Defaults to the current user")
+
+class TaskWatcherListResponse(BaseModel):
+    task_id: UUID
+    user_ids: list[UUID]
@@ -1,25 +1,40 @@
-import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infra.celery_app import celery_app
+from app.core.config import settings
+from app.core.tracing import trace_service
+from app.db.session import is_replica_session
+from app.infra.redis import redis_del, redis_get_json, redis_set_json
 from app.modules.notifications.service import NotificationService
 from app.modules.organizations.enums import OrgRole
 from app.modules.organizations.repository import OrganizationRepository
 from app.modules.organizations.service import OrganizationService
+from app.modules.projects.models import Project
 from app.modules.projects.repository import ProjectRepository
-from app.modules.tasks.models import Task
+from app.modules.tasks.fields import (
+    FIELD_TYPES,
+    definitions_key,
+    parse_field_filters,
+    validate_custom_fields,
+    validate_labels,
+)
+from app.modules.tasks.models import Task, TaskFieldDefinition, TaskLabel
 from app.modules.tasks.repository import TaskRepository
 from app.modules.tasks.schemas import ALLOWED_STATUSES
+from app.modules.tasks.watchers import watchers_key
 
 
 logger = logging.getLogger(__name__)
 
+_MEMBER_ROLES = {OrgRole.OWNER.value, OrgRole.ADMIN.value, OrgRole.MEMBER.value}
 
+
+@trace_service
 class TaskService:
     def __init__(
         self,
@@ -34,6 +49,68 @@ class TaskService:
         self.org_repo = OrganizationRepository()
         self.notification_service = notification_service or NotificationService()
 
+    async def _get_definitions(self, db: AsyncSession, org_id: uuid.UUID) -> dict:
+        key = definitions_key(str(org_id))
+        cached = await redis_get_json(key)
+        if cached is not None:
+            return cached
+
+        labels = await self.repo.list_labels(db, org_id)
+        fields = await self.repo.list_field_definitions(db, org_id)
+        definitions = {
+            "labels": [label.name for label in labels],
+            "fields": {f.key: {"type": f.field_type, "options": list(f.options)} for f in fields},
+        }
+        if not is_replica_session(db):
+            await redis_set_json(key, definitions, ttl_seconds=settings.task_definitions_cache_ttl_seconds)
+        return definitions
+
+    async def _invalidate_definitions(self, org_id: uuid.UUID) -> None:
+        await redis_del(definitions_key(str(org_id)))
+
+    async def _get_watcher_ids(self, db: AsyncSession, task_id: uuid.UUID) -> list[uuid.UUID]:
+        key = watchers_key(str(task_id))
+        cached = await redis_get_json(key)
+        if cached is not None:
+            return [uuid.UUID(user_id) for user_id in cached["user_ids"]]
+
+        user_ids = await self.repo.list_watcher_ids(db, task_id)
+        if not is_replica_session(db):
+            await redis_set_json(
+                key,
+                {"user_ids": [str(user_id) for user_id in user_ids]},
+                ttl_seconds=settings.task_watchers_cache_ttl_seconds,
+            )
+        return user_ids
+
+    async def _invalidate_watchers(self, task_id: uuid.UUID) -> None:
+        await redis_del(watchers_key(str(task_id)))
+
+    def _task_event(self, task: Task, requester_id: uuid.UUID, **changes: Any) -> dict:
+        return {
+            "org_id": str(task.org_id),
+            "project_id": str(task.project_id),
+            "task_id": str(task.id),
+            "title": task.title,
+            "actor_id": str(requester_id),
+            "ts": datetime.now(timezone.utc).isoformat(),
+            **changes,
+        }
+
+    async def _require_member_project(
+        self, db: AsyncSession, org_id: uuid.UUID, project_id: uuid.UUID, requester_id: uuid.UUID
+    ) -> Project | None:
+        """
+        Same checks as `require_role` for an org member, with the project loaded in the same
+        query. Returns None when the project is not in the org; callers decide when to raise.
+        """
+        member, project = await self.project_repo.get_member_and_project(db, org_id, project_id, requester_id)
+        if not member:
+            raise HTTPException(status_code=403, detail="Not a member of this organization")
+        if member.role not in _MEMBER_ROLES:
+            raise HTTPException(status_code=403, detail="Insufficient permissions")
+        return project
+
     async def create_task(
         self,
         db: AsyncSession,
@@ -44,28 +121,39 @@ class TaskService:
         title: str,
         description: str | None,
         status: str,
+        labels: list[str] | None = None,
+        custom_fields: dict[str, Any] | None = None,
     ) -> Task:
-        await self.org_service.require_role(
-            db, org_id, requester_id,
-            allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value, OrgRole.MEMBER.value},
-        )
+        project = await self._require_member_project(db, org_id, project_id, requester_id)
 
         if status not in ALLOWED_STATUSES:
             raise HTTPException(status_code=400, detail="Invalid status")
 
-        project = await self.project_repo.get(db, project_id)
-        if not project or project.org_id != org_id:
+        if project is None:
             raise HTTPException(status_code=404, detail="Project not found in this organization")
 
+        clean_labels: list[str] = []
+        clean_fields: dict[str, Any] = {}
+        if labels or custom_fields:
+            definitions = await self._get_definitions(db, org_id)
+            try:
+                clean_labels = validate_labels(labels or [], definitions)
+                clean_fields = validate_custom_fields(custom_fields or {}, definitions)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
         task = Task(
             org_id=org_id,
             project_id=project_id,
             title=title,
             description=description,
             status=status,
+            labels=clean_labels,
+            custom_fields={k: v for k, v in clean_fields.items() if v is not None},
             created_by=requester_id,
         )
         await self.repo.create(db, task)
+        await self.repo.add_watchers(db, task.id, [requester_id])
         await db.commit()
         return task
 
@@ -79,21 +167,39 @@ class TaskService:
         status: str | None,
         limit: int,
         offset: int,
+        labels: list[str] | None = None,
+        field_filters: list[str] | None = None,
     ) -> tuple[list[Task], int]:
-        await self.org_service.require_role(
-            db, org_id, requester_id,
-            allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value, OrgRole.MEMBER.value},
-        )
+        project: Project | None = None
+        if project_id:
+            project = await self._require_member_project(db, org_id, project_id, requester_id)
+        else:
+            await self.org_service.require_role(db, org_id, requester_id, allowed=_MEMBER_ROLES)
 
         if status and status not in ALLOWED_STATUSES:
             raise HTTPException(status_code=400, detail="Invalid status")
 
-        if project_id:
-            project = await self.project_repo.get(db, project_id)
-            if not project or project.org_id != org_id:
-                raise HTTPException(status_code=404, detail="Project not found in this organization")
+        if project_id and project is None:
+            raise HTTPException(status_code=404, detail="Project not found in this organization")
 
-        return await self.repo.list(db, org_id=org_id, project_id=project_id, status=status, limit=limit, offset=offset)
+        custom_fields: dict[str, Any] = {}
+        if field_filters:
+            definitions = await self._get_definitions(db, org_id)
+            try:
+                custom_fields = parse_field_filters(field_filters, definitions)
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
+        return await self.repo.list_tasks(
+            db,
+            org_id=org_id,
+            project_id=project_id,
+            status=status,
+            limit=limit,
+            offset=offset,
+            labels=labels,
+            custom_fields=custom_fields,
+        )
     
     async def update_task(
         self,
@@ -130,13 +236,31 @@ class TaskService:
                 if not await self.org_repo.get_member(db, task.org_id, assignee):
                     raise HTTPException(status_code=400, detail="Assignee is not a member of this organization")
 
+        if "labels" in data or "custom_fields" in data:
+            definitions = await self._get_definitions(db, task.org_id)
+            try:
+                if "labels" in data:
+                    data["labels"] = validate_labels(data["labels"] or [], definitions)
+                if "custom_fields" in data:
+                    changes = validate_custom_fields(data["custom_fields"] or {}, definitions)
+                    merged = dict(task.custom_fields)
+                    for key, value in changes.items():
+                        if value is None:
+                            merged.pop(key, None)
+                        else:
+                            merged[key] = value
+                    data["custom_fields"] = merged
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
         old_assignee = task.assigned_to
+        old_status = task.status
+        old_title = task.title
 
-        updated = await self.repo.update_task(db, task_id, data)
-        if not updated:
-            raise HTTPException(status_code=404, detail="Task not found")
+        updated = await self.repo.update_task(db, task, data)
 
         assignment_event: dict | None = None
+        dispatch_at: datetime | None = None
         if "assigned_to" in data:
             new_assignee = updated.assigned_to
             if new_assignee and new_assignee != old_assignee:
@@ -150,22 +274,45 @@ class TaskService:
                     "ts": datetime.now(timezone.utc).isoformat(),
                 }
 
-                await self.notification_service.enqueue_task_assigned(db, assignment_event)
+                outbox_row = await self.notification_service.enqueue_task_assigned(db, assignment_event)
+                dispatch_at = outbox_row.next_retry_at
+                # Assignees follow the task from then on.
+                await self.repo.add_watchers(db, updated.id, [new_assignee])
+
+        watch_changes: list[tuple[str, dict]] = []
+        if updated.status != old_status:
+            watch_changes.append(("TASK_STATUS_CHANGED", {"old_status": old_status, "new_status": updated.status}))
+        if updated.title != old_title:
+            watch_changes.append(("TASK_TITLE_CHANGED", {"old_title": old_title, "new_title": updated.title}))
+        recipients: list[uuid.UUID] = []
+        if watch_changes:
+            if assignment_event:
+                # The cached list predates the assignee added above.
+                await self._invalidate_watchers(updated.id)
+            recipients = [
+                user_id for user_id in await self._get_watcher_ids(db, updated.id) if user_id != requester_id
+            ]
+        if recipients:
+            for event_type, changes in watch_changes:
+                await self.notification_service.enqueue_task_event(
+                    db,
+                    event_type=event_type,
+                    event=self._task_event(updated, requester_id, **changes),
+                    recipients=recipients,
+                )
 
         await db.commit()
 
         if assignment_event:
-            try:
-                await asyncio.to_thread(
-                    celery_app.send_task,
-                    "taskflow.dispatch_notifications_outbox",
-                    kwargs={"limit": 100},
-                )
-            except Exception:
-                logger.exception(
-                    "Failed to trigger notifications outbox dispatch",
-                    extra={"task_id": str(updated.id), "assigned_to": assignment_event["assigned_to"]},
-                )
+            await self._invalidate_watchers(updated.id)
+        if recipients:
+            await self.notification_service.trigger_outbox_dispatch(task_id=str(updated.id))
+        if assignment_event:
+            await self.notification_service.trigger_outbox_dispatch(
+                available_at=dispatch_at,
+                task_id=str(updated.id),
+                assigned_to=assignment_event["assigned_to"],
+            )
         return updated
 
     async def get_task(self, db: AsyncSession, task_id: uuid.UUID, requester_id: uuid.UUID) -> Task:
@@ -193,7 +340,173 @@ class TaskService:
         if not (is_admin or is_creator):
             raise HTTPException(status_code=403, detail="Only task creator or admin can delete tasks")
 
+        # Watchers are removed with the task, so resolve them first.
+        recipients = [user_id for user_id in await self._get_watcher_ids(db, task_id) if user_id != requester_id]
+        event = self._task_event(task, requester_id)
+
         deleted = await self.repo.delete(db, task_id)
         if not deleted:
             raise HTTPException(status_code=404, detail="Task not found")
+        await self.notification_service.enqueue_task_event(
+            db, event_type="TASK_DELETED", event=event, recipients=recipients
+        )
+        await db.commit()
+        await self._invalidate_watchers(task_id)
+        if recipients:
+            await self.notification_service.trigger_outbox_dispatch(task_id=str(task_id))
+
+    async def list_watchers(
+        self,
+        db: AsyncSession,
+        *,
+        task_id: uuid.UUID,
+        requester_id: uuid.UUID,
+    ) -> list[uuid.UUID]:
+        await self.get_task(db, task_id, requester_id)
+        return await self._get_watcher_ids(db, task_id)
+
+    async def add_watcher(
+        self,
+        db: AsyncSession,
+        *,
+        task_id: uuid.UUID,
+        requester_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> list[uuid.UUID]:
+        task = await self.get_task(db, task_id, requester_id)
+        if user_id != requester_id:
+            await self.org_service.require_role(
+                db, task.org_id, requester_id,
+                allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value},
+            )
+            if not await self.org_repo.get_member(db, task.org_id, user_id):
+                raise HTTPException(status_code=400, detail="Watcher is not a member of this organization")
+
+        await self.repo.add_watchers(db, task_id, [user_id])
+        await db.commit()
+        await self._invalidate_watchers(task_id)
+        return await self._get_watcher_ids(db, task_id)
+
+    async def remove_watcher(
+        self,
+        db: AsyncSession,
+        *,
+        task_id: uuid.UUID,
+        requester_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> list[uuid.UUID]:
+        task = await self.get_task(db, task_id, requester_id)
+        if user_id != requester_id:
+            await self.org_service.require_role(
+                db, task.org_id, requester_id,
+                allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value},
+            )
+
+        await self.repo.remove_watcher(db, task_id, user_id)
+        await db.commit()
+        await self._invalidate_watchers(task_id)
+        return await self._get_watcher_ids(db, task_id)
+
+    async def list_labels(self, db: AsyncSession, *, org_id: uuid.UUID, requester_id: uuid.UUID) -> list[TaskLabel]:
+        await self.org_service.require_role(
+            db, org_id, requester_id,
+            allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value, OrgRole.MEMBER.value},
+        )
+        return await self.repo.list_labels(db, org_id)
+
+    async def create_label(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: uuid.UUID,
+        requester_id: uuid.UUID,
+        name: str,
+        color: str | None,
+    ) -> TaskLabel:
+        await self.org_service.require_role(db, org_id, requester_id, allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value})
+
+        if await self.repo.get_label_by_name(db, org_id, name):
+            raise HTTPException(status_code=409, detail="Label already exists")
+
+        label = TaskLabel(org_id=org_id, name=name, color=color)
+        await self.repo.create_label(db, label)
+        await db.commit()
+        await self._invalidate_definitions(org_id)
+        return label
+
+    async def delete_label(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: uuid.UUID,
+        label_id: uuid.UUID,
+        requester_id: uuid.UUID,
+    ) -> None:
+        await self.org_service.require_role(db, org_id, requester_id, allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value})
+
+        label = await self.repo.get_label(db, label_id)
+        if not label or label.org_id != org_id:
+            raise HTTPException(status_code=404, detail="Label not found")
+
+        await self.repo.delete_label(db, label)
+        await db.commit()
+        await self._invalidate_definitions(org_id)
+
+    async def list_field_definitions(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: uuid.UUID,
+        requester_id: uuid.UUID,
+    ) -> list[TaskFieldDefinition]:
+        await self.org_service.require_role(
+            db, org_id, requester_id,
+            allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value, OrgRole.MEMBER.value},
+        )
+        return await self.repo.list_field_definitions(db, org_id)
+
+    async def create_field_definition(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: uuid.UUID,
+        requester_id: uuid.UUID,
+        key: str,
+        field_type: str,
+        options: list[str],
+    ) -> TaskFieldDefinition:
+        await self.org_service.require_role(db, org_id, requester_id, allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value})
+
+        if field_type not in FIELD_TYPES:
+            raise HTTPException(status_code=400, detail="Invalid field type")
+        if field_type == "select" and not options:
+            raise HTTPException(status_code=400, detail="Select fields require options")
+        if field_type != "select" and options:
+            raise HTTPException(status_code=400, detail="Only select fields accept options")
+
+        if await self.repo.get_field_definition_by_key(db, org_id, key):
+            raise HTTPException(status_code=409, detail="Field already exists")
+
+        definition = TaskFieldDefinition(org_id=org_id, key=key, field_type=field_type, options=options)
+        await self.repo.create_field_definition(db, definition)
+        await db.commit()
+        await self._invalidate_definitions(org_id)
+        return definition
+
+    async def delete_field_definition(
+        self,
+        db: AsyncSession,
+        *,
+        org_id: uuid.UUID,
+        field_id: uuid.UUID,
+        requester_id: uuid.UUID,
+    ) -> None:
+        await self.org_service.require_role(db, org_id, requester_id, allowed={OrgRole.OWNER.value, OrgRole.ADMIN.value})
+
+        definition = await self.repo.get_field_definition(db, field_id)
+        if not definition or definition.org_id != org_id:
+            raise HTTPException(status_code=404, detail="Field not found")
+
+        await self.repo.delete_field_definition(db, definition)
         await db.commit()
+        await self._invalidate_definitions(org_id)
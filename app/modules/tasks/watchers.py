@@ -0,0 +1,2 @@
+def watchers_key(task_id: str) -> str:
+    return f"task_watchers:{task_id}"
@@ -3,9 +3,11 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import instrument_repository
 from app.modules.users.models import User
 
 
+@instrument_repository
 class UserRepository:
     """
     Repository for managing User entities in the database.
@@ -0,0 +1,299 @@
+"""
+Endpoint load test: concurrent virtual users over the real workflows.
+
+Setup registers `--users` accounts (reused across runs), has the first create an org and a
+project and adds the others as admins so every user may assign tasks. Each virtual user then
+logs in and loops until `--duration` runs out, sleeping `--think-ms` between requests and
+picking one action at a time by weight: list tasks, create a task, update a task (rename,
+status change or reassignment, which goes through the outbox), poll the unread count and list
+notifications, and now and then log in again. Meanwhile a dispatcher coroutine drains the
+outbox batch by batch the way the Celery task does.
+
+Requests go to the ASGI app in-process over httpx by default, or to a running server with
+`--base-url` (e.g. `uvicorn app.main:app --workers 4`). Either way the target uses the Postgres
+and Redis from docker-compose, and the dispatcher talks to that Postgres directly. Per endpoint
+the output has request and error counts, throughput and p50/p95/p99 latency in milliseconds:
+
+    python -m benchmarks.load_test --users 50 --duration 60
+    python -m benchmarks.load_test --users 200 --duration 120 --base-url http://127.0.0.1:8000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from app.modules.notifications.service import NotificationService
+
+PASSWORD = "benchmark-pass"
+STATUSES = ("TODO", "IN_PROGRESS", "DONE")
+
+# Action -> weight. Reads dominate, as they do in production.
+ACTIONS = {
+    "list_tasks": 35,
+    "create_task": 10,
+    "update_task": 15,
+    "poll_unread": 25,
+    "list_notifications": 13,
+    "login": 2,
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not samples:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        samples = sorted(self.latencies_ms)
+        return {
+            "requests": len(samples),
+            "errors": self.errors,
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+            "throughput_rps": round(len(samples) / seconds, 2) if seconds else None,
+            "p50_ms": round(percentile(samples, 50), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "p99_ms": round(percentile(samples, 99), 3),
+            "max_ms": round(samples[-1], 3) if samples else 0.0,
+        }
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    async def call(self, name: str, request: Any) -> httpx.Response | None:
+        stats = self.endpoints.setdefault(name, EndpointStats())
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            stats.errors += 1
+            return None
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.statuses[response.status_code] = stats.statuses.get(response.status_code, 0) + 1
+        if response.status_code >= 400:
+            stats.errors += 1
+            return None
+        return response
+
+
+@dataclass(slots=True)
+class Workspace:
+    org_id: str
+    project_id: str
+    user_ids: list[str]
+    task_ids: list[str]
+
+
+def _email(run_id: str, index: int) -> str:
+    return f"bench-load-{run_id}-{index}@example.com"
+
+
+async def _token(client: httpx.AsyncClient, email: str) -> str:
+    res = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    if res.status_code == 401:
+        res = await client.post(
+            "/auth/register",
+            json={"email": email, "username": email.split("@")[0], "password": PASSWORD},
+        )
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+async def setup(client: httpx.AsyncClient, run_id: str, users: int, tasks: int) -> Workspace:
+    tokens = []
+    for index in range(users):
+        tokens.append(await _token(client, _email(run_id, index)))
+    headers = [{"Authorization": f"Bearer {token}"} for token in tokens]
+    user_ids = [(await client.get("/auth/me", headers=h)).json()["id"] for h in headers]
+
+    owner = headers[0]
+    org = (await client.post("/orgs", json={"name": f"Load test {run_id}"}, headers=owner)).json()
+    project = (await client.post(f"/orgs/{org['id']}/projects", json={"name": "Load"}, headers=owner)).json()
+    for user_id in user_ids[1:]:
+        res = await client.post(
+            f"/orgs/{org['id']}/members", json={"user_id": user_id, "role": "ADMIN"}, headers=owner
+        )
+        res.raise_for_status()
+
+    task_ids = []
+    for index in range(tasks):
+        res = await client.post(
+            f"/orgs/{org['id']}/projects/{project['id']}/tasks",
+            json={"title": f"Seed task {index}"},
+            headers=owner,
+        )
+        res.raise_for_status()
+        task_ids.append(res.json()["id"])
+    return Workspace(org_id=org["id"], project_id=project["id"], user_ids=user_ids, task_ids=task_ids)
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    workspace: Workspace,
+    email: str,
+    *,
+    deadline: float,
+    think: float,
+    rng: random.Random,
+) -> None:
+    login = {"email": email, "password": PASSWORD}
+    response = await recorder.call("POST /auth/login", client.post("/auth/login", json=login))
+    if response is None:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    names, weights = list(ACTIONS), list(ACTIONS.values())
+    org_id, project_id = workspace.org_id, workspace.project_id
+
+    while time.perf_counter() < deadline:
+        action = rng.choices(names, weights)[0]
+        if action == "list_tasks":
+            params = {"limit": 20, **({"status": rng.choice(STATUSES)} if rng.random() < 0.3 else {})}
+            await recorder.call(
+                "GET /orgs/{org_id}/tasks", client.get(f"/orgs/{org_id}/tasks", params=params, headers=headers)
+            )
+        elif action == "create_task":
+            response = await recorder.call(
+                "POST /orgs/{org_id}/projects/{project_id}/tasks",
+                client.post(
+                    f"/orgs/{org_id}/projects/{project_id}/tasks",
+                    json={"title": f"Load task {rng.getrandbits(32):08x}"},
+                    headers=headers,
+                ),
+            )
+            if response is not None:
+                workspace.task_ids.append(response.json()["id"])
+        elif action == "update_task":
+            roll = rng.random()
+            if roll < 0.4:
+                body: dict[str, Any] = {"assigned_to": rng.choice(workspace.user_ids)}
+            elif roll < 0.7:
+                body = {"status": rng.choice(STATUSES)}
+            else:
+                body = {"title": f"Renamed {rng.getrandbits(32):08x}"}
+            await recorder.call(
+                "PATCH /tasks/{task_id}",
+                client.patch(f"/tasks/{rng.choice(workspace.task_ids)}", json=body, headers=headers),
+            )
+        elif action == "poll_unread":
+            await recorder.call(
+                "GET /notifications/unread-count", client.get("/notifications/unread-count", headers=headers)
+            )
+        elif action == "list_notifications":
+            await recorder.call(
+                "GET /notifications", client.get("/notifications", params={"limit": 20}, headers=headers)
+            )
+        else:
+            response = await recorder.call("POST /auth/login", client.post("/auth/login", json=login))
+            if response is not None:
+                headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        if think:
+            await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+
+
+async def dispatcher(recorder: Recorder, *, deadline: float, batch_size: int, idle: float) -> int:
+    service = NotificationService()
+    stats = recorder.endpoints.setdefault("outbox.dispatch_batch", EndpointStats())
+    dispatched = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            processed = await service._dispatch_outbox_async(limit=batch_size)
+        except Exception:
+            stats.errors += 1
+            await asyncio.sleep(idle)
+            continue
+        if not processed:
+            await asyncio.sleep(idle)
+            continue
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        dispatched += processed
+    return dispatched
+
+
+def _client(base_url: str | None, users: int) -> httpx.AsyncClient:
+    timeout = httpx.Timeout(30.0)
+    if base_url:
+        limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout)
+
+    from app.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=timeout)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    run_id = args.run_id or f"{args.seed}"
+    async with _client(args.base_url, args.users) as client:
+        workspace = await setup(client, run_id, args.users, args.tasks)
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        think = args.think_ms / 1000
+        users = [
+            virtual_user(
+                client,
+                recorder,
+                workspace,
+                _email(run_id, index),
+                deadline=deadline,
+                think=think,
+                rng=random.Random(f"{args.seed}:{index}"),
+            )
+            for index in range(args.users)
+        ]
+        drain = dispatcher(recorder, deadline=deadline, batch_size=args.dispatch_batch_size, idle=0.05)
+        *_, dispatched = await asyncio.gather(*users, drain)
+        elapsed = time.perf_counter() - started
+
+    endpoints = {name: stats.summary(elapsed) for name, stats in sorted(recorder.endpoints.items())}
+    endpoints["outbox.dispatch_batch"]["events"] = dispatched
+    endpoints["outbox.dispatch_batch"]["events_per_second"] = round(dispatched / elapsed, 1) if elapsed else None
+    http = [summary for name, summary in endpoints.items() if name != "outbox.dispatch_batch"]
+    return {
+        "benchmark": "load_test",
+        "target": args.base_url or "in-process",
+        "users": args.users,
+        "duration_seconds": round(elapsed, 3),
+        "think_ms": args.think_ms,
+        "seed": args.seed,
+        "total_requests": sum(summary["requests"] for summary in http),
+        "total_errors": sum(summary["errors"] for summary in http),
+        "throughput_rps": round(sum(summary["requests"] for summary in http) / elapsed, 2),
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of load after setup")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a user's requests")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks created during setup")
+    parser.add_argument("--dispatch-batch-size", type=int, default=100)
+    parser.add_argument("--base-url", help="target a running server instead of the in-process app")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--run-id", help="reuse accounts across runs (defaults to the seed)")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Request latency with and without the Prometheus instrumentation.
+
+Each round starts one child process with `METRICS_ENABLED=true` and one with `false` (the
+instrumentation is attached at import time, so the setting cannot be flipped in-process). A
+child drives the ASGI app in-process over httpx against the docker-compose Postgres/Redis: it
+registers a throwaway user, creates an org, a project and some tasks, then times the hot
+endpoints sequentially. Per endpoint the best mean over all rounds is compared; the target is
+an overhead below 2%.
+
+    python -m benchmarks.metrics_overhead --requests 500 --rounds 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+TARGET_OVERHEAD_PCT = 2.0
+
+
+async def _child(requests: int, warmup: int) -> dict[str, float]:
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        email = f"bench-metrics-{uuid.uuid4().hex[:12]}@example.com"
+        res = await client.post(
+            "/auth/register",
+            json={"email": email, "username": email.split("@")[0], "password": "benchmark-pass"},
+        )
+        res.raise_for_status()
+        headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+        org = (await client.post("/orgs", json={"name": "Metrics bench"}, headers=headers)).json()
+        project = (
+            await client.post(f"/orgs/{org['id']}/projects", json={"name": "Bench"}, headers=headers)
+        ).json()
+        task_ids = []
+        for i in range(20):
+            task = await client.post(
+                f"/orgs/{org['id']}/projects/{project['id']}/tasks",
+                json={"title": f"Bench task {i}"},
+                headers=headers,
+            )
+            task_ids.append(task.json()["id"])
+
+        endpoints = {
+            "GET /orgs/{org_id}/tasks": lambda i: client.get(f"/orgs/{org['id']}/tasks", headers=headers),
+            "GET /tasks/{task_id}": lambda i: client.get(f"/tasks/{task_ids[i % len(task_ids)]}", headers=headers),
+            "PATCH /tasks/{task_id}": lambda i: client.patch(
+                f"/tasks/{task_ids[i % len(task_ids)]}", json={"title": f"Renamed {i}"}, headers=headers
+            ),
+            "GET /notifications/unread-count": lambda i: client.get("/notifications/unread-count", headers=headers),
+        }
+        means = {}
+        for name, call in endpoints.items():
+            for i in range(warmup):
+                (await call(i)).raise_for_status()
+            started = time.perf_counter()
+            for i in range(requests):
+                (await call(i)).raise_for_status()
+            means[name] = (time.perf_counter() - started) / requests * 1000
+        return means
+
+
+def _run_child(enabled: bool, requests: int, warmup: int) -> dict[str, float]:
+    env = {**os.environ, "METRICS_ENABLED": "true" if enabled else "false"}
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.metrics_overhead", "--child", "--requests", str(requests), "--warmup", str(warmup)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_child(args.requests, args.warmup))))
+        return
+
+    runs: dict[bool, list[dict[str, float]]] = {True: [], False: []}
+    for _ in range(args.rounds):
+        # Alternate so drift (caches warming, autovacuum) affects both modes alike.
+        for enabled in (False, True):
+            runs[enabled].append(_run_child(enabled, args.requests, args.warmup))
+
+    results = []
+    for endpoint in runs[True][0]:
+        baseline = min(run[endpoint] for run in runs[False])
+        instrumented = min(run[endpoint] for run in runs[True])
+        overhead = (instrumented - baseline) / baseline * 100
+        results.append(
+            {
+                "endpoint": endpoint,
+                "baseline_ms": round(baseline, 3),
+                "instrumented_ms": round(instrumented, 3),
+                "overhead_pct": round(overhead, 2),
+                "spread_ms": round(statistics.pstdev(run[endpoint] for run in runs[False]), 3),
+            }
+        )
+
+    print(
+        json.dumps(
+            {
+                "benchmark": "metrics_overhead",
+                "requests": args.requests,
+                "rounds": args.rounds,
+                "target_overhead_pct": TARGET_OVERHEAD_PCT,
+                "within_target": all(r["overhead_pct"] <= TARGET_OVERHEAD_PCT for r in results),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Outbox dispatch throughput: per-task `asyncio.run` versus the persistent worker runtime.
+
+Each simulated Celery task dispatches one outbox batch, the way `dispatch_notifications_outbox`
+does when it is triggered after an assignment. The "asyncio_run" scenario reproduces the old
+behaviour: a fresh event loop per task, so no pooled connection survives between tasks (a
+NullPool engine stands in for the module-level engine, whose connections die with each loop).
+Every seeded TASK_ASSIGNED event belongs to a real task assigned to its own bench user, so each
+one is inserted as a notification, counted in Redis and published, not just claimed.
+
+Usage (needs the Postgres from docker-compose and a migrated schema; the benchmark clears
+`notification_outbox` and the tasks of its benchmark project, so point it at a disposable
+database):
+
+    python -m benchmarks.outbox_runtime --events 2000 --batch-size 1
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.db.session import AsyncSessionLocal, engine
+from app.infra.worker_runtime import WorkerRuntime
+from app.modules.notifications.service import NotificationService
+from app.modules.users.models import User
+from app.modules.users.repository import UserRepository
+
+BENCH_EMAIL = "bench-outbox@example.com"
+# Fixed ids so repeated runs reuse the same workspace.
+BENCH_ORG_ID = uuid.UUID("6f1c0d9e-5b1a-4c39-8d0e-0a6b5e2f7c11")
+BENCH_PROJECT_ID = uuid.UUID("6f1c0d9e-5b1a-4c39-8d0e-0a6b5e2f7c12")
+
+_RESET_SQL = (
+    "DELETE FROM notification_outbox",
+    "DELETE FROM notifications WHERE user_id IN (SELECT id FROM users WHERE email LIKE 'bench-outbox-%')",
+    "DELETE FROM tasks WHERE project_id = :project_id",
+)
+
+# One assignee per event: the handler coalesces a recipient's events within a batch, so
+# distinct recipients keep one notification per event at any batch size.
+_SEED_ASSIGNEES_SQL = """
+    INSERT INTO users (id, email, username, hashed_password)
+    SELECT gen_random_uuid(), 'bench-outbox-' || i || '@example.com', 'bench_outbox_' || i, :hashed_password
+    FROM generate_series(1, :n) AS i
+    ON CONFLICT DO NOTHING
+"""
+
+_SEED_EVENTS_SQL = """
+    WITH assignees AS (
+        SELECT id FROM users WHERE email LIKE 'bench-outbox-%' ORDER BY email LIMIT :n
+    ), assigned AS (
+        INSERT INTO tasks (id, org_id, project_id, title, status, created_by, assigned_to)
+        SELECT gen_random_uuid(), :org_id, :project_id, 'bench', 'TODO', :owner_id, id FROM assignees
+        RETURNING id, assigned_to, title
+    )
+    INSERT INTO notification_outbox (id, event_type, payload, status, attempts)
+    SELECT gen_random_uuid(), 'TASK_ASSIGNED',
+           json_build_object('task_id', id, 'assigned_to', assigned_to, 'title', title)::text, 'PENDING', 0
+    FROM assigned
+"""
+
+
+async def _ensure_user() -> uuid.UUID:
+    repo = UserRepository()
+    async with AsyncSessionLocal() as db:
+        user = await repo.get_by_email(db, BENCH_EMAIL)
+        if not user:
+            user = User(email=BENCH_EMAIL, username="bench_outbox", hashed_password=hash_password("benchmark"))
+            await repo.create(db, user)
+        await db.execute(
+            text(
+                "INSERT INTO organizations (id, name, created_by) VALUES (:org_id, 'Outbox benchmark', :owner_id) "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"org_id": BENCH_ORG_ID, "owner_id": user.id},
+        )
+        await db.execute(
+            text(
+                "INSERT INTO projects (id, org_id, name, created_by) "
+                "VALUES (:project_id, :org_id, 'Outbox benchmark', :owner_id) ON CONFLICT DO NOTHING"
+            ),
+            {"project_id": BENCH_PROJECT_ID, "org_id": BENCH_ORG_ID, "owner_id": user.id},
+        )
+        await db.commit()
+    # Setup runs under its own asyncio.run; drop pooled connections before that loop closes.
+    await engine.dispose()
+    return user.id
+
+
+async def _seed(owner_id: uuid.UUID, events: int) -> None:
+    """Real tasks assigned to bench users, so every event goes through the full notification path."""
+    async with AsyncSessionLocal() as db:
+        for statement in _RESET_SQL:
+            await db.execute(text(statement), {"project_id": BENCH_PROJECT_ID})
+        await db.execute(text(_SEED_ASSIGNEES_SQL), {"hashed_password": hash_password("benchmark"), "n": events})
+        await db.execute(
+            text(_SEED_EVENTS_SQL),
+            {"org_id": BENCH_ORG_ID, "project_id": BENCH_PROJECT_ID, "owner_id": owner_id, "n": events},
+        )
+        await db.commit()
+    await engine.dispose()
+
+
+async def _dispatch_fresh_loop(service: NotificationService, batch_size: int) -> int:
+    engine = create_async_engine(settings.database_url, poolclass=NullPool)
+    try:
+        factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        return await service._dispatch_outbox_async(limit=batch_size, session_factory=factory)
+    finally:
+        await engine.dispose()
+
+
+def run_asyncio_run(service: NotificationService, batch_size: int) -> int:
+    total = 0
+    while processed := asyncio.run(_dispatch_fresh_loop(service, batch_size)):
+        total += processed
+    return total
+
+
+def run_runtime(service: NotificationService, batch_size: int) -> int:
+    runtime = WorkerRuntime()
+    runtime.start()
+    try:
+        total = 0
+        while processed := runtime.run(
+            service._dispatch_outbox_async(limit=batch_size, session_factory=runtime.session_factory)
+        ):
+            total += processed
+        return total
+    finally:
+        runtime.stop()
+
+
+SCENARIOS = {
+    "asyncio_run": run_asyncio_run,
+    "runtime": run_runtime,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    args = parser.parse_args()
+
+    service = NotificationService()
+    user_id = asyncio.run(_ensure_user())
+
+    results = []
+    for name in args.scenario or list(SCENARIOS):
+        asyncio.run(_seed(user_id, args.events))
+        started = time.perf_counter()
+        processed = SCENARIOS[name](service, args.batch_size)
+        elapsed = time.perf_counter() - started
+        results.append(
+            {
+                "scenario": name,
+                "events": processed,
+                "batch_size": args.batch_size,
+                "seconds": round(elapsed, 3),
+                "events_per_second": round(processed / elapsed, 1) if elapsed else None,
+            }
+        )
+
+    print(json.dumps({"benchmark": "outbox_runtime", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Synthetic large-tenant data for benchmarks and query-plan regression runs.
+
+Generates users, organizations, memberships, projects, labels, tasks, watchers and
+notifications with skewed, production-like distributions and writes them with COPY over a
+direct asyncpg connection (`settings.database_dsn`), all in one transaction:
+
+- organization sizes follow a Zipf rank-size law: the first org has `--largest-org-members`
+  members, the k-th about 1/k^s of that (s = `--skew`); users may belong to several orgs
+- projects and tasks are spread over orgs with the same skew, and tasks over an org's projects
+  with a milder one, so a few projects are huge and most are small
+- assignees are drawn with Zipf weights over an org's members (a few people own most work);
+  timestamps lean towards the recent end of `--months`
+- notifications go to task assignees (or creators) and are mostly read once they are a week old
+
+Every id is derived from the seed, the prefix and the row's index, so a second run with another
+`--prefix` adds a separate tenant. Every random choice comes from a generator seeded per table,
+so the same arguments always produce the same rows. `--as-of` fixes the reference date for
+timestamps (default: today). Production-like scale:
+
+    python -m benchmarks.seed_tenant --users 150000 --largest-org-members 100000 \\
+        --orgs 200 --projects 10000 --tasks 5000000 --notifications 20000000
+
+Run against a disposable, migrated database: the script refuses to run if users with its
+email prefix already exist. Redis caches and unread counters are not touched; flush Redis
+afterwards so they are rebuilt from the new rows.
+"""
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+import sys
+import time
+import uuid
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator
+
+import asyncpg
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.modules.notifications.partitions import (
+    PARENT_TABLE,
+    add_months,
+    month_start,
+    partition_bounds,
+    partition_name,
+)
+from app.modules.organizations.enums import OrgRole
+
+PASSWORD = "seed-password"
+
+LABELS = {
+    "bug": "#d73a4a",
+    "feature": "#a2eeef",
+    "chore": "#cfd3d7",
+    "urgent": "#b60205",
+    "backend": "#5319e7",
+    "frontend": "#1d76db",
+    "design": "#f9d0c4",
+    "docs": "#0075ca",
+}
+# Label popularity, in LABELS order.
+LABEL_WEIGHTS = (30, 25, 15, 5, 10, 10, 3, 2)
+STATUS_WEIGHTS = {"DONE": 55, "TODO": 25, "IN_PROGRESS": 20}
+NOTIFICATION_WEIGHTS = {
+    "TASK_ASSIGNED": 45,
+    "TASK_STATUS_CHANGED": 35,
+    "TASK_TITLE_CHANGED": 15,
+    "TASK_DELETED": 5,
+}
+ASSIGNED_SHARE = 0.7
+ADMIN_SHARE = 0.02
+
+
+def seeded_uuid(seed: int, prefix: str, kind: str, index: int) -> uuid.UUID:
+    """Deterministic version-4 style UUID for row `index` of `kind`."""
+    digest = hashlib.blake2b(f"{seed}:{prefix}:{kind}:{index}".encode(), digest_size=16).digest()
+    return uuid.UUID(bytes=digest, version=4)
+
+
+def zipf_weights(n: int, exponent: float) -> list[float]:
+    return [1 / (rank + 1) ** exponent for rank in range(n)]
+
+
+def zipf_counts(total: int, buckets: int, exponent: float, *, minimum: int = 0) -> list[int]:
+    """
+    Splits `total` over `buckets` in proportion to 1/rank^exponent (largest first), giving
+    every bucket at least `minimum` and handing out the rounding remainder largest-fraction
+    first, so the counts always add up to `total` (or to `minimum * buckets` if that is more).
+    """
+    if buckets <= 0:
+        return []
+    spare = max(total - minimum * buckets, 0)
+    weights = zipf_weights(buckets, exponent)
+    scale = spare / sum(weights)
+    shares = [weight * scale for weight in weights]
+    counts = [int(share) for share in shares]
+    by_fraction = sorted(range(buckets), key=lambda i: shares[i] - counts[i], reverse=True)
+    for i in by_fraction[: spare - sum(counts)]:
+        counts[i] += 1
+    return [count + minimum for count in counts]
+
+
+def recent_biased(rng: random.Random, as_of: datetime, span: timedelta) -> datetime:
+    """A timestamp within `span` before `as_of`, exponentially denser towards `as_of`."""
+    seconds = span.total_seconds()
+    age = min(rng.expovariate(4 / seconds), seconds - 1)
+    return as_of - timedelta(seconds=age)
+
+
+def _chunks(records: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    iterator = iter(records)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+class TenantGenerator:
+    """Produces the rows of each table; tables must be generated in declaration order."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.seed: int = args.seed
+        self.prefix: str = args.prefix
+        self.users = args.users
+        self.orgs = args.orgs
+        self.skew: float = args.skew
+        self.as_of = datetime.combine(args.as_of, datetime.min.time(), tzinfo=timezone.utc)
+        self.span = timedelta(days=30 * args.months)
+        self.org_sizes = [
+            max(2, min(self.users, int(args.largest_org_members / (rank + 1) ** self.skew)))
+            for rank in range(self.orgs)
+        ]
+        self.project_counts = zipf_counts(args.projects, self.orgs, self.skew, minimum=1)
+        self.task_counts = zipf_counts(args.tasks, self.orgs, self.skew)
+        self.notifications = args.notifications
+
+        # Filled while generating and reused by later tables. Indexes, not UUIDs, keep the
+        # per-task arrays at four bytes a row even for millions of tasks.
+        self.org_members: list[list[int]] = []
+        self.org_projects: list[range] = []
+        self.task_org = array("I")
+        self.task_project = array("I")
+        self.task_creator = array("I")
+        self.task_assignee = array("i")  # -1 when unassigned
+        self.task_title = array("I")
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def _id(self, kind: str, index: int) -> uuid.UUID:
+        return seeded_uuid(self.seed, self.prefix, kind, index)
+
+    def months(self) -> list[date]:
+        first = month_start(self.as_of - self.span)
+        last = month_start(self.as_of)
+        months = [first]
+        while months[-1] < last:
+            months.append(add_months(months[-1], 1))
+        return months
+
+    def user_rows(self) -> Iterator[tuple]:
+        rng = self._rng("users")
+        hashed = hash_password(PASSWORD)
+        for index in range(self.users):
+            created = recent_biased(rng, self.as_of, self.span)
+            yield (
+                self._id("user", index),
+                f"{self.prefix}-{index}@seed.example.com",
+                f"{self.prefix}_{index}",
+                hashed,
+                True,
+                rng.random() < 0.9,
+                created,
+                created,
+            )
+
+    def organization_rows(self) -> Iterator[tuple]:
+        rng = self._rng("organizations")
+        for org in range(self.orgs):
+            members = rng.sample(range(self.users), self.org_sizes[org])
+            self.org_members.append(members)
+            yield (
+                self._id("org", org),
+                f"{self.prefix} org {org}",
+                self._id("user", members[0]),
+                self.as_of - self.span,
+            )
+
+    def member_rows(self) -> Iterator[tuple]:
+        rng = self._rng("org_members")
+        index = 0
+        for org, members in enumerate(self.org_members):
+            for position, user in enumerate(members):
+                if position == 0:
+                    role = OrgRole.OWNER.value
+                elif rng.random() < ADMIN_SHARE:
+                    role = OrgRole.ADMIN.value
+                else:
+                    role = OrgRole.MEMBER.value
+                yield (
+                    self._id("member", index),
+                    self._id("org", org),
+                    self._id("user", user),
+                    role,
+                    recent_biased(rng, self.as_of, self.span),
+                )
+                index += 1
+
+    def project_rows(self) -> Iterator[tuple]:
+        rng = self._rng("projects")
+        start = 0
+        for org, count in enumerate(self.project_counts):
+            self.org_projects.append(range(start, start + count))
+            members = self.org_members[org]
+            for project in range(start, start + count):
+                yield (
+                    self._id("project", project),
+                    self._id("org", org),
+                    f"Project {project}",
+                    None,
+                    self._id("user", rng.choice(members)),
+                    recent_biased(rng, self.as_of, self.span),
+                )
+            start += count
+
+    def label_rows(self) -> Iterator[tuple]:
+        index = 0
+        for org in range(self.orgs):
+            for name, color in LABELS.items():
+                yield self._id("label", index), self._id("org", org), name, color, self.as_of - self.span
+                index += 1
+
+    def task_rows(self) -> Iterator[tuple]:
+        rng = self._rng("tasks")
+        statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+        label_names = list(LABELS)
+        task = 0
+        for org, org_tasks in enumerate(self.task_counts):
+            members = self.org_members[org]
+            member_weights = list(itertools.accumulate(zipf_weights(len(members), 1.0)))
+            projects = list(self.org_projects[org])
+            rng.shuffle(projects)
+            for project, count in zip(projects, zipf_counts(org_tasks, len(projects), 0.8)):
+                project_id = self._id("project", project)
+                for _ in range(count):
+                    creator = rng.choice(members)
+                    assignee = -1
+                    if rng.random() < ASSIGNED_SHARE:
+                        assignee = rng.choices(members, cum_weights=member_weights)[0]
+                    title = rng.getrandbits(24)
+                    label_count = rng.choice((0, 0, 1, 1, 2, 3))
+                    labels = sorted(set(rng.choices(label_names, LABEL_WEIGHTS, k=label_count)))
+                    created = recent_biased(rng, self.as_of, self.span)
+                    updated = min(created + timedelta(hours=rng.expovariate(1 / 48)), self.as_of)
+                    self.task_org.append(org)
+                    self.task_project.append(project)
+                    self.task_creator.append(creator)
+                    self.task_assignee.append(assignee)
+                    self.task_title.append(title)
+                    yield (
+                        self._id("task", task),
+                        self._id("org", org),
+                        project_id,
+                        f"Task {title:06x}",
+                        None,
+                        rng.choices(statuses, status_weights)[0],
+                        labels,
+                        "{}",
+                        self._id("user", creator),
+                        created,
+                        self._id("user", assignee) if assignee >= 0 else None,
+                        updated,
+                    )
+                    task += 1
+
+    def watcher_rows(self) -> Iterator[tuple]:
+        # Creators watch their tasks and assignees follow them once assigned, as the API does.
+        for task in range(len(self.task_creator)):
+            task_id = self._id("task", task)
+            creator, assignee = self.task_creator[task], self.task_assignee[task]
+            yield task_id, self._id("user", creator), self.as_of - self.span
+            if assignee >= 0 and assignee != creator:
+                yield task_id, self._id("user", assignee), self.as_of - self.span
+
+    def notification_rows(self) -> Iterator[tuple]:
+        rng = self._rng("notifications")
+        types, type_weights = list(NOTIFICATION_WEIGHTS), list(NOTIFICATION_WEIGHTS.values())
+        tasks = len(self.task_creator)
+        if not tasks:
+            return
+        week_ago = self.as_of - timedelta(days=7)
+        for index in range(self.notifications):
+            # Recent tasks generate most of the traffic.
+            task = tasks - 1 - min(int(rng.expovariate(8 / tasks)), tasks - 1)
+            assignee = self.task_assignee[task]
+            user = assignee if assignee >= 0 else self.task_creator[task]
+            created = recent_biased(rng, self.as_of, self.span)
+            payload = {
+                "org_id": str(self._id("org", self.task_org[task])),
+                "project_id": str(self._id("project", self.task_project[task])),
+                "task_id": str(self._id("task", task)),
+                "title": f"Task {self.task_title[task]:06x}",
+                "ts": created.isoformat(),
+            }
+            yield (
+                self._id("notification", index),
+                self._id("user", user),
+                rng.choices(types, type_weights)[0],
+                json.dumps(payload),
+                rng.random() < (0.95 if created < week_ago else 0.4),
+                created,
+            )
+
+
+# Table -> (columns, generator method), in foreign-key order.
+TABLES: dict[str, tuple[tuple[str, ...], str]] = {
+    "users": (
+        (
+            "id", "email", "username", "hashed_password", "is_active", "is_verified",
+            "created_at", "updated_at",
+        ),
+        "user_rows",
+    ),
+    "organizations": (("id", "name", "created_by", "created_at"), "organization_rows"),
+    "org_members": (("id", "org_id", "user_id", "role", "created_at"), "member_rows"),
+    "projects": (("id", "org_id", "name", "description", "created_by", "created_at"), "project_rows"),
+    "task_labels": (("id", "org_id", "name", "color", "created_at"), "label_rows"),
+    "tasks": (
+        (
+            "id", "org_id", "project_id", "title", "description", "status", "labels", "custom_fields",
+            "created_by", "created_at", "assigned_to", "updated_at",
+        ),
+        "task_rows",
+    ),
+    "task_watchers": (("task_id", "user_id", "created_at"), "watcher_rows"),
+    PARENT_TABLE: (("id", "user_id", "type", "payload", "is_read", "created_at"), "notification_rows"),
+}
+
+
+async def _copy(
+    conn: asyncpg.Connection, table: str, columns: tuple[str, ...], rows: Iterable[tuple], batch: int
+) -> int:
+    total = 0
+    for chunk in _chunks(rows, batch):
+        await conn.copy_records_to_table(table, records=chunk, columns=columns)
+        total += len(chunk)
+        print(f"{table}: {total} rows", file=sys.stderr, flush=True)
+    return total
+
+
+async def seed(args: argparse.Namespace) -> dict[str, Any]:
+    generator = TenantGenerator(args)
+    conn = await asyncpg.connect(args.dsn or settings.database_dsn)
+    try:
+        first_email = f"{args.prefix}-0@seed.example.com"
+        if await conn.fetchval("SELECT 1 FROM users WHERE email = $1", first_email):
+            raise SystemExit(f"Users with prefix {args.prefix!r} already exist; use another --prefix")
+
+        for month in generator.months():
+            start, end = partition_bounds(month)
+            await conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+
+        tables: dict[str, dict[str, Any]] = {}
+        started = time.perf_counter()
+        async with conn.transaction():
+            for table, (columns, method) in TABLES.items():
+                table_started = time.perf_counter()
+                rows = await _copy(conn, table, columns, getattr(generator, method)(), args.batch_size)
+                seconds = time.perf_counter() - table_started
+                tables[table] = {
+                    "rows": rows,
+                    "seconds": round(seconds, 3),
+                    "rows_per_second": round(rows / seconds, 1) if seconds else None,
+                }
+        for table in TABLES:
+            await conn.execute(f"ANALYZE {table}")
+        elapsed = time.perf_counter() - started
+    finally:
+        await conn.close()
+
+    return {
+        "seed": args.seed,
+        "prefix": args.prefix,
+        "as_of": args.as_of.isoformat(),
+        "largest_org": {
+            "id": str(seeded_uuid(args.seed, args.prefix, "org", 0)),
+            "members": generator.org_sizes[0],
+            "projects": generator.project_counts[0],
+            "tasks": generator.task_counts[0],
+        },
+        "seconds": round(elapsed, 3),
+        "tables": tables,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--prefix", default="seed", help="email/username prefix of generated users")
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--orgs", type=int, default=50)
+    parser.add_argument("--largest-org-members", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=1_000)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--notifications", type=int, default=500_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for orgs, projects and tasks")
+    parser.add_argument("--months", type=int, default=6, help="history covered by timestamps")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=datetime.now(timezone.utc).date())
+    parser.add_argument("--batch-size", type=int, default=50_000, help="rows per COPY")
+    parser.add_argument("--dsn", help="defaults to the configured Postgres")
+    args = parser.parse_args()
+    if args.largest_org_members > args.users:
+        parser.error("--largest-org-members cannot exceed --users")
+
+    print(json.dumps(asyncio.run(seed(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Query budgets for endpoint tests.
+
+    with query_budget(4):
+        response = await client.post("/tasks", json=payload, headers=auth)
+
+fails if the block executes more than four statements, or if any statement shape runs more
+than once with different parameters (an N+1 lookup). The request must run in the test's
+context, as it does with `httpx.ASGITransport`.
+"""
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from app.db.instrumentation import QueryLog, record_queries
+
+
+def check_query_budget(log: QueryLog, max_queries: int, *, allow_repeated: Iterable[str] = ()) -> None:
+    """
+    Raises AssertionError listing the statements when `log` is over budget or has a repeated
+    shape. `allow_repeated` holds substrings of normalized statements that may repeat.
+    """
+    allowed = tuple(allow_repeated)
+    problems: list[str] = []
+    if log.count > max_queries:
+        problems.append(f"{log.count} queries, budget is {max_queries}")
+    for queries in log.repeated_shapes().values():
+        statement = queries[0].statement
+        if not any(fragment in statement for fragment in allowed):
+            problems.append(f"shape repeated {len(queries)} times with different parameters: {statement}")
+    if problems:
+        executed = "\n".join(f"  {index}. {query.statement}" for index, query in enumerate(log.queries, 1))
+        raise AssertionError("; ".join(problems) + "\nExecuted:\n" + executed)
+
+
+@contextmanager
+def query_budget(max_queries: int, *, allow_repeated: Iterable[str] = ()) -> Iterator[QueryLog]:
+    with record_queries() as log:
+        yield log
+    check_query_budget(log, max_queries, allow_repeated=allow_repeated)
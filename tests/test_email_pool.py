@@ -0,0 +1,61 @@
+import smtplib
+
+from app.infra.email import OutgoingEmail, SMTPPool
+
+
+class FakeSMTP:
+    def __init__(self, outbox, *, fail_after=None):
+        self.outbox = outbox
+        self.fail_after = fail_after
+        self.sent = 0
+        self.closed = False
+
+    def send_message(self, msg):
+        if self.fail_after is not None and self.sent >= self.fail_after:
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        if msg["To"] == "refused@example.com":
+            raise smtplib.SMTPRecipientsRefused({msg["To"]: (550, b"no such user")})
+        self.sent += 1
+        self.outbox.append(msg)
+
+    def quit(self):
+        self.closed = True
+
+
+def _emails(n):
+    return [OutgoingEmail(to=f"user{i}@example.com", subject="Hi", text="Body") for i in range(n)]
+
+
+async def test_batch_reuses_pooled_connections():
+    outbox, connections = [], []
+
+    def factory():
+        connections.append(FakeSMTP(outbox))
+        return connections[-1]
+
+    pool = SMTPPool(factory=factory, size=2, rate_per_second=0, sender="noreply@example.com")
+    assert await pool.send_many(_emails(10)) == {}
+    assert await pool.send_many(_emails(4)) == {}
+
+    assert len(outbox) == 14
+    assert len(connections) == 2
+
+    await pool.close()
+    assert all(conn.closed for conn in connections)
+
+
+async def test_dropped_connection_is_replaced_and_refusals_are_reported():
+    outbox, connections = [], []
+
+    def factory():
+        # The first connection drops after one message; replacements are healthy.
+        connections.append(FakeSMTP(outbox, fail_after=1 if not connections else None))
+        return connections[-1]
+
+    pool = SMTPPool(factory=factory, size=1, rate_per_second=0, sender="noreply@example.com")
+    emails = _emails(3) + [OutgoingEmail(to="refused@example.com", subject="Hi", text="Body")]
+    errors = await pool.send_many(emails)
+
+    assert list(errors) == [3]
+    assert len(outbox) == 3
+    assert len(connections) == 2
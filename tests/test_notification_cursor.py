@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.modules.notifications.cursor import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    notification_id = uuid.uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, notification_id)) == (created_at, notification_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "MjAyNi0wMy0wMQ"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
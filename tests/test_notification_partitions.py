@@ -0,0 +1,31 @@
+from datetime import date, datetime, timezone
+
+from app.modules.notifications.partitions import (
+    add_months,
+    months_ahead,
+    partition_bounds,
+    partition_month,
+    partition_name,
+    partitions_older_than,
+)
+
+
+def test_names_and_bounds_roll_over_the_year():
+    month = date(2026, 12, 1)
+    assert partition_name(month) == "notifications_p202612"
+    assert partition_month("notifications_p202612") == month
+    assert partition_month("notifications_unpartitioned") is None
+    assert add_months(month, 1) == date(2027, 1, 1)
+    assert partition_bounds(month) == (
+        datetime(2026, 12, 1, tzinfo=timezone.utc),
+        datetime(2027, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_months_ahead_and_expiry():
+    now = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+    assert months_ahead(now, 2) == [date(2026, 10, 1), date(2026, 11, 1), date(2026, 12, 1)]
+
+    names = ["notifications_p202603", "notifications_p202604", "notifications_p202605", "other"]
+    # Six months back from October is April: only partitions ending by April 1st have expired.
+    assert partitions_older_than(names, now, 6) == ["notifications_p202603"]
@@ -0,0 +1,40 @@
+import uuid
+
+from app.modules.notifications.preferences import Delivery, UserPreferences, preference_row
+
+
+ORG = uuid.uuid4()
+OTHER_ORG = uuid.uuid4()
+PROJECT = uuid.uuid4()
+
+
+def test_without_preferences_everything_is_delivered():
+    prefs = UserPreferences([])
+    assert prefs.decide("TASK_ASSIGNED", {"org_id": str(ORG)}) is Delivery.DELIVER
+
+
+def test_org_row_adds_to_global_and_overrides_digest_mode():
+    prefs = UserPreferences(
+        [
+            preference_row(org_id=None, muted_project_ids=[], disabled_types=["TASK_TITLE_CHANGED"], digest_only=True),
+            preference_row(org_id=ORG, muted_project_ids=[PROJECT], disabled_types=[], digest_only=False),
+        ]
+    )
+
+    assert prefs.decide("TASK_TITLE_CHANGED", {"org_id": str(ORG)}) is Delivery.DROP
+    assert prefs.decide("TASK_ASSIGNED", {"org_id": str(ORG), "project_id": str(PROJECT)}) is Delivery.DROP
+    assert prefs.decide("TASK_ASSIGNED", {"org_id": str(ORG)}) is Delivery.DELIVER
+    assert prefs.decide("TASK_ASSIGNED", {"org_id": str(OTHER_ORG)}) is Delivery.DIGEST
+    assert prefs.decide("NOTIFICATION_DIGEST", {}) is Delivery.DELIVER
+
+
+def test_org_row_without_digest_mode_inherits_the_global_one():
+    prefs = UserPreferences(
+        [
+            preference_row(org_id=None, muted_project_ids=[], disabled_types=[], digest_only=True),
+            preference_row(org_id=ORG, muted_project_ids=[PROJECT], disabled_types=[], digest_only=None),
+        ]
+    )
+
+    assert prefs.decide("TASK_ASSIGNED", {"org_id": str(ORG)}) is Delivery.DIGEST
+    assert prefs.decide("TASK_ASSIGNED", {"org_id": str(ORG), "project_id": str(PROJECT)}) is Delivery.DROP
@@ -0,0 +1,66 @@
+import json
+import uuid
+
+import pytest
+
+from app.modules.notifications.emails import send_auth_email_events
+from app.modules.notifications.handlers import (
+    HandlerResult,
+    OutboxEvent,
+    OutboxHandlerRegistry,
+    handle_task_watch_event,
+    outbox_handlers,
+)
+from app.modules.notifications.service import redact_outbox_payload
+
+
+def test_registry_maps_each_event_type_to_one_handler():
+    registry = OutboxHandlerRegistry()
+
+    @registry.register("A", "B")
+    async def handler(db, events):
+        return HandlerResult()
+
+    assert registry.get("A") is handler
+    assert registry.get("B") is handler
+    assert registry.get("C") is None
+    assert registry.event_types == ["A", "B"]
+
+    with pytest.raises(ValueError):
+        registry.register("B")(handler)
+
+
+def test_task_assigned_handler_is_registered():
+    assert "TASK_ASSIGNED" in outbox_handlers.event_types
+
+
+def test_auth_emails_are_handled_by_reference():
+    assert {"EMAIL", "AUTH_EMAIL"} <= set(outbox_handlers.event_types)
+
+
+async def test_auth_email_events_without_a_target_fail_before_any_lookup():
+    events = [
+        OutboxEvent(id=uuid.uuid4(), event_type="AUTH_EMAIL", payload={"purpose": "password_reset"}),
+        OutboxEvent(id=uuid.uuid4(), event_type="AUTH_EMAIL", payload={"purpose": "nope", "email": "a@example.com"}),
+    ]
+    result = await send_auth_email_events(None, events, pool=None)
+    assert set(result.errors) == {event.id for event in events}
+    assert result.notifications == {}
+
+
+async def test_task_watch_events_without_an_org_fail_before_any_lookup():
+    event = OutboxEvent(
+        id=uuid.uuid4(), event_type="TASK_STATUS_CHANGED", payload={"recipients": [str(uuid.uuid4())]}
+    )
+    result = await handle_task_watch_event(None, [event])
+    assert set(result.errors) == {event.id}
+    assert result.notifications == {}
+
+
+def test_redact_outbox_payload_masks_email_context():
+    payload = json.dumps({"user_id": "u1", "template": "password_reset", "context": {"link": "https://x/?token=t"}})
+
+    redacted = json.loads(redact_outbox_payload(payload))
+
+    assert redacted == {"user_id": "u1", "template": "password_reset", "context": "REDACTED"}
+    assert redact_outbox_payload("not json") == "REDACTED"
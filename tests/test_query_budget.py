@@ -0,0 +1,43 @@
+import pytest
+
+from app.db.instrumentation import record_queries
+from tests.query_budget import check_query_budget, query_budget
+
+
+SELECT_USER = "SELECT users.id FROM users WHERE users.id = $1::UUID"
+SELECT_TASKS = "SELECT tasks.id FROM tasks WHERE tasks.org_id = $1::UUID LIMIT $2"
+
+
+def test_repeated_shape_with_different_parameters_is_flagged():
+    with record_queries() as log:
+        log.record(SELECT_TASKS, ("org", 20))
+        log.record(SELECT_USER, ("a",))
+        log.record(SELECT_USER, ("b",))
+
+    repeated = log.repeated_shapes()
+    assert log.count == 3
+    assert len(repeated) == 1
+    assert [query.parameters for query in next(iter(repeated.values()))] == ["('a',)", "('b',)"]
+
+
+def test_identical_repeats_only_count_against_the_budget():
+    with record_queries() as log:
+        log.record(SELECT_USER, ("a",))
+        log.record(SELECT_USER, ("a",))
+
+    assert log.repeated_shapes() == {}
+    check_query_budget(log, 2)
+    with pytest.raises(AssertionError, match="2 queries, budget is 1"):
+        check_query_budget(log, 1)
+
+
+def test_query_budget_reports_n_plus_one():
+    with pytest.raises(AssertionError, match="repeated 2 times"):
+        with query_budget(5) as log:
+            log.record(SELECT_USER, ("a",))
+            log.record(SELECT_USER, ("b",))
+
+    with query_budget(5, allow_repeated=["FROM users"]) as log:
+        log.record(SELECT_USER, ("a",))
+        log.record(SELECT_USER, ("b",))
+
@@ -0,0 +1,13 @@
+from app.db.instrumentation import normalize_statement, statement_fingerprint
+
+
+def test_literals_and_parameters_do_not_change_the_fingerprint():
+    first = "SELECT * FROM tasks\n WHERE org_id = $1 AND status = 'TODO' LIMIT 20"
+    second = "SELECT *  FROM tasks WHERE org_id = $7 AND status = 'DONE' LIMIT 50"
+    assert normalize_statement(first) == "SELECT * FROM tasks WHERE org_id = ? AND status = ? LIMIT ?"
+    assert statement_fingerprint(first) == statement_fingerprint(second)
+
+
+def test_in_lists_collapse_and_casts_survive():
+    statement = "SELECT id FROM users WHERE id IN ($1, $2, $3) AND created_at > $4::timestamptz"
+    assert normalize_statement(statement) == "SELECT id FROM users WHERE id IN (?, ...) AND created_at > ?::timestamptz"
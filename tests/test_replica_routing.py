@@ -0,0 +1,66 @@
+import uuid
+from contextlib import asynccontextmanager
+
+from starlette.requests import Request
+
+from app.db import replica, session
+from app.modules.auth.service import AuthService
+
+
+class _Users:
+    async def get_by_email(self, db, email):
+        return None
+
+    async def get_by_username(self, db, username):
+        return None
+
+    async def create(self, db, user):
+        user.id = uuid.uuid4()
+        return user
+
+
+class _Db:
+    async def commit(self):
+        pass
+
+
+class _Monitor:
+    async def usable(self):
+        return True
+
+
+def _factory(name):
+    @asynccontextmanager
+    async def open_session():
+        yield name
+
+    return open_session
+
+
+def _get(token: str) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    return Request({"type": "http", "method": "GET", "path": "/orgs", "headers": headers})
+
+
+async def test_register_keeps_first_reads_on_the_primary(monkeypatch):
+    store: dict[str, int] = {}
+
+    async def set_int(key, value, *, ttl_seconds):
+        store[key] = value
+
+    async def get_int(key):
+        return store.get(key)
+
+    monkeypatch.setattr(replica, "redis_set_int", set_int)
+    monkeypatch.setattr(replica, "redis_get_int", get_int)
+    monkeypatch.setattr(session, "replica_engine", object())
+    monkeypatch.setattr(session, "replica_monitor", _Monitor())
+    monkeypatch.setattr(session, "AsyncSessionLocal", _factory("primary"))
+    monkeypatch.setattr(session, "ReplicaSessionLocal", _factory("replica"))
+
+    token = await AuthService(user_repo=_Users()).register(_Db(), "new@example.com", "new", "supersecret1")
+
+    assert [db async for db in session.get_read_db_session(_get(token))] == ["primary"]
+
+    store.clear()
+    assert [db async for db in session.get_read_db_session(_get(token))] == ["replica"]
@@ -0,0 +1,44 @@
+import pytest
+
+from app.modules.tasks.fields import parse_field_filters, validate_custom_fields, validate_labels
+
+
+DEFINITIONS = {
+    "labels": ["bug", "backend"],
+    "fields": {
+        "points": {"type": "number", "options": []},
+        "severity": {"type": "select", "options": ["low", "high"]},
+        "blocked": {"type": "boolean", "options": []},
+        "due": {"type": "date", "options": []},
+    },
+}
+
+
+def test_validate_labels_dedupes_and_rejects_unknown():
+    assert validate_labels(["bug", "bug", "backend"], DEFINITIONS) == ["bug", "backend"]
+    with pytest.raises(ValueError):
+        validate_labels(["frontend"], DEFINITIONS)
+
+
+def test_validate_custom_fields_checks_types():
+    assert validate_custom_fields({"points": 3, "due": "2026-03-01", "severity": None}, DEFINITIONS) == {
+        "points": 3,
+        "due": "2026-03-01",
+        "severity": None,
+    }
+    with pytest.raises(ValueError):
+        validate_custom_fields({"points": True}, DEFINITIONS)
+    with pytest.raises(ValueError):
+        validate_custom_fields({"severity": "medium"}, DEFINITIONS)
+    with pytest.raises(ValueError):
+        validate_custom_fields({"unknown": 1}, DEFINITIONS)
+
+
+def test_parse_field_filters_converts_query_text():
+    assert parse_field_filters(["points:5", "blocked:true", "severity:high"], DEFINITIONS) == {
+        "points": 5,
+        "blocked": True,
+        "severity": "high",
+    }
+    with pytest.raises(ValueError):
+        parse_field_filters(["points"], DEFINITIONS)
@@ -0,0 +1,43 @@
+import pytest
+
+from app.core import tracing
+from app.core.config import settings
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_sample_rate", 1.0)
+    memory = tracing.InMemoryExporter()
+    previous = tracing.set_exporter(memory)
+    yield memory
+    tracing.set_exporter(previous)
+
+
+async def test_spans_nest_across_awaits(exporter):
+    async def query():
+        with tracing.start_span("db.query"):
+            pass
+
+    with tracing.start_span("HTTP GET /tasks/{task_id}") as root:
+        await tracing.traced(query, "service.get_task")()
+
+    query_span, service_span, root_span = exporter.spans
+    assert root_span is root and root_span.parent_id is None
+    assert service_span.parent_id == root_span.span_id
+    assert query_span.parent_id == service_span.span_id
+    assert {span.trace_id for span in exporter.spans} == {root.trace_id}
+
+
+def test_traceparent_continues_remote_trace_and_records_errors(exporter):
+    with tracing.start_span("publish") as publish:
+        header = publish.traceparent
+
+    with pytest.raises(RuntimeError):
+        with tracing.start_span("celery.task", traceparent=header):
+            raise RuntimeError("boom")
+
+    task = exporter.spans[-1]
+    assert (task.trace_id, task.parent_id) == (publish.trace_id, publish.span_id)
+    assert task.status == "error" and "boom" in task.attributes["error"]
+    assert tracing.parse_traceparent("not-a-traceparent") is None